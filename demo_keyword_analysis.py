@@ -164,7 +164,9 @@ def main():
                 else:
                     keywords_dict[kw] = {'frequency': 1, 'importance': 0.5}
     
-    trends = temporal.analyze_keyword_trends(publications_list, keywords_dict)
+    # Trends, patterns, lifecycle, publication trends and period comparison run concurrently
+    temporal_results = temporal.run_all(publications_list, keywords_dict)
+    trends = temporal_results['temporal_analysis']
     print(f"   ✅ Analyzed trends for {len(trends.get('individual_trends', {}))} keywords")
     
     # Show trend information
@@ -173,7 +175,7 @@ def main():
         print(f"   📈 Top growing keywords: {growing}")
     
     print("2. Performing keyword lifecycle analysis...")
-    lifecycle = temporal.analyze_keyword_lifecycle(publications_list, keywords_dict)
+    lifecycle = temporal_results['lifecycle_analysis']
     print(f"   ✅ Lifecycle analysis completed: {len(lifecycle)} stages")
     
     # Demonstrate visualization
@@ -608,7 +608,7 @@ class SemanticScholarAPIClient(BaseAPIClient):
         if item.get("openAccessPdf"):
             open_access_pdf = item["openAccessPdf"].get("url")
         
-        return {
+        publication = {
             "doi": doi,
             "title": item.get("title", ""),
             "abstract": item.get("abstract", ""),
@@ -623,14 +623,27 @@ class SemanticScholarAPIClient(BaseAPIClient):
             "paper_id": item.get("paperId"),
             "source": "Semantic Scholar"
         }
+        
+        # Keep citation links (as paper IDs) when they were requested
+        for field in ("references", "citations"):
+            if field in item:
+                publication[field] = [
+                    linked["paperId"]
+                    for linked in item[field] or []
+                    if isinstance(linked, dict) and linked.get("paperId")
+                ]
+        
+        return publication
 
-    def fetch_bulk_publications(self, paper_ids: List[str], fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    def fetch_bulk_publications(self, paper_ids: List[str], fields: Optional[List[str]] = None,
+                                batch_size: int = 500) -> List[Dict[str, Any]]:
         """
         Fetch multiple papers by their IDs using bulk search.
         
         Args:
             paper_ids: List of paper IDs to retrieve
             fields: Optional list of fields to retrieve (uses basic set if None)
+            batch_size: Paper IDs per request (API limit is 500)
         
         Returns:
             List of standardized publication dictionaries
@@ -643,8 +656,8 @@ class SemanticScholarAPIClient(BaseAPIClient):
         
         print(f"[SemanticScholarAPIClient] Bulk fetching {len(paper_ids)} papers")
         
-        # Split into batches of 500 (API limit)
-        batch_size = 500
+        # Split into batches of at most 500 (API limit)
+        batch_size = min(batch_size, 500)
         all_results = []
         
         try:
@@ -686,6 +699,28 @@ class SemanticScholarAPIClient(BaseAPIClient):
             print(f"Error in bulk fetch: {e}")
             return []
 
+    def fetch_citation_links(self, paper_ids: List[str], directions: tuple = ("references", "citations"),
+                             batch_size: int = 100) -> List[Dict[str, Any]]:
+        """
+        Fetch references and/or citations of many papers through the batch endpoint.
+        
+        Only the linked paper IDs are requested, which keeps responses small;
+        the API returns at most 9999 citations per paper.
+        
+        Args:
+            paper_ids: List of paper IDs to retrieve
+            directions: "references" and/or "citations"
+            batch_size: Paper IDs per request (smaller batches keep responses of
+                highly cited papers under the API's response size limit)
+        
+        Returns:
+            List of standardized publication dictionaries with "references" and/or
+            "citations" lists of paper IDs (see slr_core.citation_graph)
+        """
+        fields = ['title', 'year', 'citationCount', 'referenceCount', 'externalIds']
+        fields += [f"{direction}.paperId" for direction in directions]
+        return self.fetch_bulk_publications(paper_ids, fields=fields, batch_size=batch_size)
+
 if __name__ == '__main__':
     # Ensure slr_core is in PYTHONPATH or adjust path for testing
     # For this example, assume ConfigManager can be imported directly if this script is run
@@ -0,0 +1,311 @@
+"""
+Citation Graph
+
+Citation links (Semantic Scholar references/citations) stored as a compact
+directed graph: paper IDs are mapped to integer node IDs once, and edges live
+in a binary CSR adjacency matrix A with A[i, j] = 1 when paper i cites paper j.
+Graph metrics are sparse linear algebra on A:
+
+- PageRank: power iteration on the row-normalized adjacency, with the rank of
+  papers without (known) references spread uniformly
+- Co-citation: A^T A, the number of papers citing both i and j
+- Bibliographic coupling: A A^T, the number of references shared by i and j
+- Snowball expansion: breadth-first, N hops from seed papers over references
+  and/or citations, fetching each paper at most once through batch requests
+"""
+
+import logging
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+logger = logging.getLogger(__name__)
+
+DIRECTIONS = ('references', 'citations', 'both')
+
+
+class CitationGraph:
+    """
+    Directed citation graph over integer node IDs.
+
+    Features:
+    - CSR adjacency (citing x cited) with a paper ID <-> node ID mapping
+    - In/out degrees, PageRank, co-citation and bibliographic coupling
+    - Edge lists and pair rankings as DataFrames keyed by paper ID
+    """
+
+    def __init__(self, paper_ids: Sequence[str], adjacency: sparse.spmatrix):
+        """
+        Args:
+            paper_ids: Paper ID of every node, aligned with the adjacency rows/columns
+            adjacency: (n, n) matrix with non-zero [i, j] when paper i cites paper j
+        """
+        self.paper_ids = np.asarray(paper_ids, dtype=object)
+        self.node_ids = {paper_id: node for node, paper_id in enumerate(self.paper_ids.tolist())}
+
+        adjacency = sparse.csr_matrix(adjacency, dtype=np.float32)
+        adjacency.sum_duplicates()
+        adjacency.data[:] = 1  # A citation is counted once
+        adjacency.setdiag(0)
+        adjacency.eliminate_zeros()
+        self.adjacency = adjacency
+
+    @classmethod
+    def from_edges(cls, citing: Iterable[str], cited: Iterable[str],
+                   paper_ids: Optional[Sequence[str]] = None) -> 'CitationGraph':
+        """
+        Build a graph from (citing, cited) paper ID pairs.
+
+        Args:
+            citing, cited: Aligned paper IDs of citing and cited papers
+            paper_ids: Optional node order; papers only seen in edges are appended
+        """
+        citing = pd.Series(list(citing), dtype=object)
+        cited = pd.Series(list(cited), dtype=object)
+        known = [] if paper_ids is None else list(paper_ids)
+        codes, uniques = pd.factorize(pd.concat([pd.Series(known, dtype=object), citing, cited], ignore_index=True))
+
+        n_known, n_edges = len(known), len(citing)
+        rows, cols = codes[n_known:n_known + n_edges], codes[n_known + n_edges:]
+        adjacency = sparse.csr_matrix((np.ones(n_edges, dtype=np.float32), (rows, cols)),
+                                      shape=(len(uniques), len(uniques)))
+        return cls(uniques, adjacency)
+
+    @classmethod
+    def from_publications(cls, publications: Iterable[Dict[str, Any]],
+                          id_field: str = 'paper_id') -> 'CitationGraph':
+        """
+        Build a graph from publication dictionaries with 'references' and/or
+        'citations' lists of paper IDs (as returned by
+        SemanticScholarAPIClient.fetch_citation_links).
+        """
+        paper_ids, citing, cited = [], [], []
+        for publication in publications:
+            paper_id = publication.get(id_field)
+            if not paper_id:
+                continue
+            paper_ids.append(paper_id)
+            references = publication.get('references') or []
+            citing.extend([paper_id] * len(references))
+            cited.extend(references)
+            citations = publication.get('citations') or []
+            citing.extend(citations)
+            cited.extend([paper_id] * len(citations))
+        return cls.from_edges(citing, cited, paper_ids=paper_ids)
+
+    @property
+    def n_nodes(self) -> int:
+        return self.adjacency.shape[0]
+
+    @property
+    def n_edges(self) -> int:
+        return self.adjacency.nnz
+
+    def nodes(self, paper_ids: Iterable[str]) -> np.ndarray:
+        """Node IDs of the given paper IDs (-1 for papers not in the graph)."""
+        return np.array([self.node_ids.get(paper_id, -1) for paper_id in paper_ids], dtype=np.int64)
+
+    def in_degree(self) -> np.ndarray:
+        """Citations received within the graph, per node."""
+        return self.adjacency.getnnz(axis=0)
+
+    def out_degree(self) -> np.ndarray:
+        """References made within the graph, per node."""
+        return self.adjacency.getnnz(axis=1)
+
+    def edges(self) -> pd.DataFrame:
+        """Edge list with 'citing' and 'cited' paper IDs."""
+        edges = self.adjacency.tocoo()
+        return pd.DataFrame({'citing': self.paper_ids[edges.row], 'cited': self.paper_ids[edges.col]})
+
+    def pagerank(self, damping: float = 0.85, max_iter: int = 100, tol: float = 1e-10,
+                 personalization: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """
+        PageRank of every node by power iteration (rank flows from citing to cited papers).
+
+        Args:
+            damping: Probability of following a citation rather than teleporting
+            max_iter: Maximum number of iterations
+            tol: Convergence threshold on the L1 change of the rank vector
+            personalization: Optional paper ID -> teleport weight (e.g. the seed
+                papers of a review); uniform when not given
+
+        Returns:
+            Rank per node (sums to 1), aligned with `paper_ids`
+        """
+        n = self.n_nodes
+        if n == 0:
+            return np.zeros(0)
+
+        teleport = np.full(n, 1.0 / n)
+        if personalization:
+            teleport = np.zeros(n)
+            for paper_id, weight in personalization.items():
+                if paper_id in self.node_ids:
+                    teleport[self.node_ids[paper_id]] = weight
+            if teleport.sum() <= 0:
+                raise ValueError("Personalization does not weight any paper in the graph")
+            teleport /= teleport.sum()
+
+        out_degree = self.out_degree().astype(np.float64)
+        dangling = out_degree == 0
+        inverse_degree = np.divide(1.0, out_degree, out=np.zeros(n), where=~dangling)
+        transition = (sparse.diags(inverse_degree) @ self.adjacency).T.tocsr()
+
+        rank = teleport.copy()
+        for iteration in range(max_iter):
+            previous = rank
+            rank = damping * (transition @ rank + rank[dangling].sum() * teleport) + (1 - damping) * teleport
+            if np.abs(rank - previous).sum() < n * tol:
+                logger.debug(f"PageRank converged after {iteration + 1} iterations")
+                break
+        else:
+            logger.warning(f"PageRank did not converge in {max_iter} iterations")
+
+        return rank
+
+    @staticmethod
+    def _pair_counts(matrix: sparse.spmatrix, min_count: int) -> sparse.csr_matrix:
+        matrix = sparse.csr_matrix(matrix)
+        matrix.setdiag(0)
+        if min_count > 1:
+            matrix.data[matrix.data < min_count] = 0
+        matrix.eliminate_zeros()
+        return matrix
+
+    def co_citation(self, nodes: Optional[Sequence[int]] = None, min_count: int = 1) -> sparse.csr_matrix:
+        """
+        Co-citation counts: [i, j] is the number of papers citing both i and j.
+
+        Args:
+            nodes: Optional node IDs to restrict the result to (e.g. the corpus);
+                citing papers outside them still count
+            min_count: Minimum co-citation count to keep
+
+        Returns:
+            Symmetric (k, k) sparse matrix over `nodes` (all nodes by default),
+            without the diagonal
+        """
+        cited = self.adjacency if nodes is None else self.adjacency[:, np.asarray(nodes)]
+        return self._pair_counts(cited.T @ cited, min_count)
+
+    def bibliographic_coupling(self, nodes: Optional[Sequence[int]] = None, min_count: int = 1) -> sparse.csr_matrix:
+        """
+        Bibliographic coupling counts: [i, j] is the number of references shared by i and j.
+
+        Args:
+            nodes: Optional node IDs to restrict the result to
+            min_count: Minimum number of shared references to keep
+
+        Returns:
+            Symmetric (k, k) sparse matrix over `nodes` (all nodes by default),
+            without the diagonal
+        """
+        citing = self.adjacency if nodes is None else self.adjacency[np.asarray(nodes)]
+        return self._pair_counts(citing @ citing.T, min_count)
+
+    def top_pairs(self, matrix: sparse.spmatrix, nodes: Optional[Sequence[int]] = None,
+                  n_pairs: Optional[int] = 100) -> pd.DataFrame:
+        """
+        Strongest pairs of a symmetric pair matrix (co-citation or coupling).
+
+        Returns:
+            DataFrame with 'source', 'target' (paper IDs, each pair once) and
+            'count', strongest first
+        """
+        pairs = sparse.triu(matrix, k=1).tocoo()
+        paper_ids = self.paper_ids if nodes is None else self.paper_ids[np.asarray(nodes)]
+        order = np.lexsort((pairs.col, pairs.row, -pairs.data))[:n_pairs]
+        return pd.DataFrame({
+            'source': paper_ids[pairs.row[order]],
+            'target': paper_ids[pairs.col[order]],
+            'count': pairs.data[order].astype(np.int64)
+        })
+
+    def metrics(self, damping: float = 0.85) -> pd.DataFrame:
+        """Per-paper in-degree, out-degree and PageRank, by descending PageRank."""
+        return pd.DataFrame({
+            'paper_id': self.paper_ids,
+            'in_degree': self.in_degree(),
+            'out_degree': self.out_degree(),
+            'pagerank': self.pagerank(damping=damping)
+        }).sort_values('pagerank', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def snowball_expand(fetch_links: Callable[[List[str]], List[Dict[str, Any]]], seeds: Sequence[str],
+                    hops: int = 1, direction: str = 'both', max_papers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Expand a seed corpus N hops along citation links.
+
+    Each hop fetches the links of all papers of the current frontier in one
+    call (e.g. SemanticScholarAPIClient.fetch_citation_links, which batches the
+    requests), and papers already seen are never fetched or queued again.
+    Papers of the last hop are nodes of the graph, but their own links are not
+    fetched.
+
+    Args:
+        fetch_links: Callable returning publication dictionaries with 'paper_id'
+            and 'references'/'citations' lists for a list of paper IDs
+        seeds: Seed paper IDs (hop 0)
+        hops: Number of expansion hops
+        direction: 'references' (backward), 'citations' (forward) or 'both'
+        max_papers: Optional cap on the number of papers discovered; when a
+            hop would exceed it, the papers linked to most often are kept
+
+    Returns:
+        Dictionary with the 'graph' (CitationGraph), 'hops' (paper ID -> hop at
+        which it was first reached) and the fetched 'publications'
+    """
+    if direction not in DIRECTIONS:
+        raise ValueError(f"Unknown direction '{direction}', expected one of {DIRECTIONS}")
+    fields = ('references', 'citations') if direction == 'both' else (direction,)
+
+    hop_of: Dict[str, int] = {}
+    for seed in seeds:
+        hop_of.setdefault(seed, 0)
+    frontier = list(hop_of)
+    publications: List[Dict[str, Any]] = []
+
+    for hop in range(1, hops + 1):
+        if not frontier:
+            break
+        fetched = [publication for publication in fetch_links(frontier) if publication.get('paper_id')]
+        publications.extend(fetched)
+        for publication in fetched:
+            # Seeds requested by another identifier (e.g. DOI) are known by their paper ID from now on
+            hop_of.setdefault(publication['paper_id'], hop - 1)
+
+        linked = Counter(paper_id for publication in fetched for field in fields
+                         for paper_id in publication.get(field) or [] if paper_id not in hop_of)
+        new_papers = [paper_id for paper_id, _ in linked.most_common()]
+        if max_papers is not None:
+            new_papers = new_papers[:max(max_papers - len(hop_of), 0)]
+        for paper_id in new_papers:
+            hop_of[paper_id] = hop
+        frontier = new_papers
+        logger.info(f"Snowball hop {hop}: fetched {len(fetched)} papers, {len(new_papers)} new papers")
+
+    if publications:
+        # Seeds the fetcher could not resolve are dropped
+        fetched_ids = {publication['paper_id'] for publication in publications}
+        hop_of = {paper_id: hop for paper_id, hop in hop_of.items() if hop > 0 or paper_id in fetched_ids}
+
+    # Links of the requested directions between discovered papers, as (citing, cited) pairs
+    citing, cited = [], []
+    for publication in publications:
+        paper_id = publication['paper_id']
+        if 'references' in fields:
+            references = [reference for reference in publication.get('references') or [] if reference in hop_of]
+            citing.extend([paper_id] * len(references))
+            cited.extend(references)
+        if 'citations' in fields:
+            citations = [citation for citation in publication.get('citations') or [] if citation in hop_of]
+            citing.extend(citations)
+            cited.extend([paper_id] * len(citations))
+    graph = CitationGraph.from_edges(citing, cited, paper_ids=list(hop_of))
+
+    logger.info(f"Snowball expansion: {graph.n_nodes} papers, {graph.n_edges} citations")
+    return {'graph': graph, 'hops': hop_of, 'publications': publications}
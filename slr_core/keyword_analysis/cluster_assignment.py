@@ -0,0 +1,228 @@
+"""
+Incremental Cluster Assignment
+
+A persisted cluster model lets newly harvested publications be assigned to
+existing clusters without re-clustering the corpus. Only the new documents
+are embedded. Each one is assigned to the nearest centroid, or by a majority
+vote of its nearest indexed neighbours. It is flagged as an outlier when it
+lies farther from its centroid than the cluster's members usually do.
+
+Assignments accumulate drift statistics (outlier rate, shift of the mean
+distance to centroids, share of new documents), so a full recluster is
+triggered only when a drift threshold is crossed.
+
+Layout of `model_dir`:
+- model.json: method, parameters, per-cluster thresholds, baseline and drift counters
+- centroids.npy: (k, d) float32 centroids, rows aligned with `cluster_ids`
+- ids.npy, labels.npy: optional publication IDs and labels of the fitted corpus
+"""
+
+import json
+import logging
+import os
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .cluster_metrics import cluster_statistics
+
+logger = logging.getLogger(__name__)
+
+MODEL_FILE = 'model.json'
+
+DEFAULT_DRIFT_THRESHOLDS = {
+    'max_outlier_rate': 0.1,  # share of new documents flagged as outliers
+    'max_distance_shift': 0.2,  # relative increase of mean distance to the assigned centroid
+    'max_new_fraction': 0.5  # new documents relative to the fitted corpus size
+}
+
+
+def _atomic_save(path: Path, array: np.ndarray):
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+class ClusterModel:
+    """
+    Persisted centroids and drift state of a clustering run.
+
+    Features:
+    - Nearest-centroid or nearest-neighbour assignment of new embeddings
+    - Per-cluster outlier thresholds (mean + z * std of member distances)
+    - Accumulated drift statistics with a recluster recommendation
+    """
+
+    def __init__(self, model_dir: Union[str, Path]):
+        """
+        Open a saved cluster model.
+
+        Args:
+            model_dir: Directory written by `ClusterModel.create`
+        """
+        self.model_dir = Path(model_dir)
+        with open(self.model_dir / MODEL_FILE, 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+
+        self.cluster_ids = np.asarray(self.manifest['cluster_ids'], dtype=np.int64)
+        self.centroids = np.load(self.model_dir / 'centroids.npy')
+        self.thresholds = np.asarray(self.manifest['thresholds'])
+
+        self.id_labels: Dict[str, int] = {}
+        if (self.model_dir / 'ids.npy').exists():
+            ids = np.load(self.model_dir / 'ids.npy').tolist()
+            labels = np.load(self.model_dir / 'labels.npy').tolist()
+            self.id_labels = dict(zip(ids, labels))
+
+    @staticmethod
+    def exists(model_dir: Union[str, Path]) -> bool:
+        return (Path(model_dir) / MODEL_FILE).exists()
+
+    @classmethod
+    def create(cls, model_dir: Union[str, Path], embeddings: np.ndarray, labels: Sequence[int],
+               method: str = 'kmeans', parameters: Optional[Dict[str, Any]] = None,
+               row_ids: Optional[Sequence[Any]] = None, outlier_z: float = 2.5) -> 'ClusterModel':
+        """
+        Save a cluster model from clustered embeddings.
+
+        Args:
+            model_dir: Directory to write the model to (replaces an existing model)
+            embeddings: (n, d) embeddings that were clustered
+            labels: Cluster label per row (-1 = noise)
+            method: Clustering method, used when reclustering
+            parameters: Clustering parameters, used when reclustering
+            row_ids: Optional publication IDs, enables neighbour-based assignment
+            outlier_z: Outlier threshold in standard deviations above the mean
+                member distance of a cluster
+
+        Returns:
+            The saved ClusterModel
+            
+        Raises:
+            ValueError: If no row belongs to a cluster (e.g. all-noise DBSCAN/HDBSCAN results)
+        """
+        labels = np.asarray(labels)
+        if not np.any(labels >= 0):
+            raise ValueError("Clustering result has no clusters (all points are noise)")
+        model_dir = Path(model_dir)
+        model_dir.mkdir(parents=True, exist_ok=True)
+
+        stats = cluster_statistics(embeddings, labels)
+        sizes = stats['sizes']
+        thresholds = stats['mean_distance_to_centroid'] + outlier_z * stats['std_distance_to_centroid']
+
+        _atomic_save(model_dir / 'centroids.npy', stats['centroids'])
+        if row_ids is not None:
+            _atomic_save(model_dir / 'ids.npy', np.asarray([str(row_id) for row_id in row_ids]))
+            _atomic_save(model_dir / 'labels.npy', labels.astype(np.int64))
+        else:
+            # IDs and labels of a replaced model no longer match its clusters
+            for name in ('ids.npy', 'labels.npy'):
+                (model_dir / name).unlink(missing_ok=True)
+
+        manifest = {
+            'method': method,
+            'parameters': parameters or {},
+            'created_at': datetime.now().isoformat(),
+            'n_fitted': int(len(labels)),
+            'cluster_ids': stats['cluster_ids'].tolist(),
+            'sizes': sizes.tolist(),
+            'thresholds': thresholds.tolist(),
+            'outlier_z': outlier_z,
+            'baseline_mean_distance': float(np.sum(stats['mean_distance_to_centroid'] * sizes) / max(sizes.sum(), 1)),
+            'drift': {'n_assigned': 0, 'n_outliers': 0, 'distance_sum': 0.0}
+        }
+        with open(model_dir / MODEL_FILE, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+
+        logger.info(f"Saved cluster model with {len(stats['cluster_ids'])} clusters to {model_dir}")
+        return cls(model_dir)
+
+    def _save_manifest(self):
+        tmp_path = self.model_dir / (MODEL_FILE + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_path, self.model_dir / MODEL_FILE)
+
+    def _centroid_distances(self, embeddings: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        squared = (np.sum(vectors ** 2, axis=1)[:, None] - 2 * vectors @ self.centroids.T
+                   + np.sum(self.centroids ** 2, axis=1))
+        return np.sqrt(np.maximum(squared, 0))
+
+    def assign(self, embeddings: np.ndarray, neighbor_ids: Optional[List[List[str]]] = None,
+               record: bool = True) -> Dict[str, Any]:
+        """
+        Assign new embeddings to the persisted clusters.
+
+        Args:
+            embeddings: (m, d) embeddings of the new documents
+            neighbor_ids: Optional nearest indexed publication IDs per document; the
+                majority label among neighbours of the fitted corpus is used, with
+                nearest-centroid assignment as fallback
+            record: Add the assignments to the accumulated drift statistics
+
+        Returns:
+            Dictionary with 'labels', 'distances' (to the assigned centroid),
+            'outliers' (bool array), 'assigned_by' and the current 'drift' report
+        """
+        distances = self._centroid_distances(embeddings)
+        rows = distances.argmin(axis=1)
+        assigned_by = np.full(len(rows), 'centroid', dtype=object)
+
+        if neighbor_ids is not None and self.id_labels:
+            row_of_cluster = {cluster_id: row for row, cluster_id in enumerate(self.cluster_ids.tolist())}
+            for i, ids in enumerate(neighbor_ids):
+                votes = Counter(self.id_labels[str(n)] for n in ids if self.id_labels.get(str(n), -1) in row_of_cluster)
+                if votes:
+                    rows[i] = row_of_cluster[votes.most_common(1)[0][0]]
+                    assigned_by[i] = 'neighbors'
+
+        assigned_distances = distances[np.arange(len(rows)), rows]
+        outliers = assigned_distances > self.thresholds[rows]
+
+        if record and len(rows):
+            drift = self.manifest['drift']
+            drift['n_assigned'] += int(len(rows))
+            drift['n_outliers'] += int(outliers.sum())
+            drift['distance_sum'] += float(assigned_distances.sum())
+            self._save_manifest()
+
+        return {
+            'labels': self.cluster_ids[rows],
+            'distances': assigned_distances,
+            'outliers': outliers,
+            'assigned_by': assigned_by,
+            'drift': self.drift_report()
+        }
+
+    def drift_report(self, thresholds: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """
+        Summarize drift accumulated since the model was fitted.
+
+        Returns:
+            Dictionary with outlier rate, relative mean-distance shift, new-document
+            fraction, the thresholds that were crossed and 'recluster_recommended'
+        """
+        thresholds = {**DEFAULT_DRIFT_THRESHOLDS, **(thresholds or {})}
+        drift = self.manifest['drift']
+        n_assigned = drift['n_assigned']
+        baseline = self.manifest['baseline_mean_distance']
+
+        report = {
+            'n_assigned': n_assigned,
+            'outlier_rate': drift['n_outliers'] / n_assigned if n_assigned else 0.0,
+            'distance_shift': (drift['distance_sum'] / n_assigned / baseline - 1) if n_assigned and baseline > 0 else 0.0,
+            'new_fraction': n_assigned / max(self.manifest['n_fitted'], 1)
+        }
+        crossed = [name for name, key in (('outlier_rate', 'max_outlier_rate'),
+                                          ('distance_shift', 'max_distance_shift'),
+                                          ('new_fraction', 'max_new_fraction'))
+                   if report[name] > thresholds[key]]
+        report['thresholds_crossed'] = crossed
+        report['recluster_recommended'] = bool(crossed)
+        return report
@@ -0,0 +1,288 @@
+"""
+Cluster Quality Metrics
+
+Exact silhouette scores need all pairwise distances (O(n²) time and memory), so
+for large corpora the quality metric can cost more than the clustering itself.
+This module computes quality metrics at a configurable cost:
+
+- 'full': exact silhouette and Calinski-Harabasz on all non-noise points
+- 'sampled': silhouette on repeated stratified samples, with a confidence interval
+- 'simplified': centroid-based simplified silhouette, O(n x k)
+- 'none': skip quality metrics
+- 'auto': 'full' up to `sample_size` points, 'sampled' beyond
+
+Noise points (label -1) are excluded in all modes.
+
+Davies-Bouldin and Calinski-Harabasz are O(n x k); approximate modes compute
+them on all points up to 10 x `sample_size` rows and on a stratified sample
+beyond. Every result records the approximation used.
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+import numpy as np
+from scipy import sparse
+from sklearn.metrics import calinski_harabasz_score, davies_bouldin_score, silhouette_score
+
+logger = logging.getLogger(__name__)
+
+METRIC_MODES = ('auto', 'full', 'sampled', 'simplified', 'none')
+
+# z value of the two-sided 95% normal confidence interval
+CONFIDENCE_Z = 1.96
+
+
+def stratified_sample(labels: np.ndarray, sample_size: int,
+                      rng: np.random.Generator, min_per_cluster: int = 2) -> np.ndarray:
+    """
+    Draw a sample of row indices with clusters represented in proportion to their size.
+
+    Every cluster contributes at least `min_per_cluster` rows (or all its rows if
+    smaller), so small clusters are not lost from the silhouette estimate.
+
+    Returns:
+        Sorted row indices (sorted reads are sequential on memory-mapped arrays)
+    """
+    _, inverse, sizes = np.unique(labels, return_inverse=True, return_counts=True)
+    quotas = np.maximum(np.round(sizes * sample_size / len(labels)).astype(np.int64), min_per_cluster)
+    quotas = np.minimum(quotas, sizes)
+
+    # Random order within each cluster: sort by (cluster, random key) and take each cluster's prefix
+    order = np.lexsort((rng.random(len(labels)), inverse))
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    rank = np.arange(len(labels)) - np.repeat(starts, sizes)
+    return np.sort(order[rank < np.repeat(quotas, sizes)])
+
+
+def sampled_silhouette(embeddings: np.ndarray, labels: np.ndarray, sample_size: int = 10000,
+                       n_repeats: int = 5, metric: str = 'euclidean',
+                       random_state: Optional[int] = 42, rows: Optional[np.ndarray] = None) -> Dict[str, Any]:
+    """
+    Estimate the silhouette score from repeated stratified samples.
+
+    Args:
+        rows: Optional sorted row indices of `embeddings` that `labels` refer to
+            (e.g. the non-noise rows); only sampled rows are read
+
+    Returns:
+        Dictionary with the mean score, standard deviation across repeats and a
+        95% confidence interval of the mean
+    """
+    rng = np.random.default_rng(random_state)
+    scores = []
+    for _ in range(max(1, n_repeats)):
+        sample = stratified_sample(labels, sample_size, rng)
+        sample_rows = sample if rows is None else rows[sample]
+        scores.append(silhouette_score(np.asarray(embeddings[sample_rows], dtype=np.float32), labels[sample],
+                                       metric=metric))
+        if len(sample) == len(labels):
+            break  # The sample is the whole population; repeats would be identical
+
+    scores = np.asarray(scores)
+    half_width = CONFIDENCE_Z * scores.std(ddof=1) / np.sqrt(len(scores)) if len(scores) > 1 else 0.0
+    return {
+        'silhouette_score': float(scores.mean()),
+        'silhouette_std': float(scores.std(ddof=1)) if len(scores) > 1 else 0.0,
+        'silhouette_ci': [float(scores.mean() - half_width), float(scores.mean() + half_width)],
+        'sample_size': int(len(sample)),
+        'n_repeats': int(len(scores))
+    }
+
+
+def _label_indicator(labels: np.ndarray, n_clusters: int) -> sparse.csr_matrix:
+    """Sparse (n_clusters x n) one-hot matrix of labels; noise (-1) rows are left empty."""
+    keep = np.flatnonzero(labels >= 0)
+    return sparse.csr_matrix((np.ones(len(keep)), (labels[keep], keep)), shape=(n_clusters, len(labels)))
+
+
+def cluster_centroids(embeddings: np.ndarray, labels: np.ndarray, chunk_size: int = 65536) -> np.ndarray:
+    """Mean vector of each label 0..max(labels), accumulated over row chunks; noise (-1) is ignored."""
+    n_clusters = int(labels.max()) + 1
+    sums = np.zeros((n_clusters, embeddings.shape[1]), dtype=np.float64)
+    for start in range(0, len(embeddings), chunk_size):
+        # Per-label row sums as a one-hot sparse product (a bincount over rows)
+        indicator = _label_indicator(labels[start:start + chunk_size], n_clusters)
+        sums += indicator @ np.asarray(embeddings[start:start + chunk_size], dtype=np.float32)
+    counts = np.bincount(labels[labels >= 0], minlength=n_clusters)
+    return sums / np.maximum(counts, 1)[:, None]
+
+
+def cluster_statistics(embeddings: np.ndarray, labels: np.ndarray, chunk_size: int = 65536) -> Dict[str, np.ndarray]:
+    """
+    Size, centroid and distance-to-centroid statistics of every cluster.
+
+    All clusters are handled together, without per-cluster masks or copies:
+    centroids are accumulated as one-hot sparse products over row chunks, then
+    distance sums, squared sums, maxima and minima are reduced per label with
+    bincount / ufunc.at in a second chunked pass. Noise points (label -1) are
+    ignored.
+
+    Returns:
+        Dictionary of arrays aligned with 'cluster_ids': 'sizes', 'centroids'
+        (k x d), and 'mean_', 'std_', 'max_' and 'min_distance_to_centroid'
+    """
+    labels = np.asarray(labels)
+    clustered = labels >= 0
+    cluster_ids, inverse = np.unique(labels[clustered], return_inverse=True)
+    n_clusters = len(cluster_ids)
+
+    dense_labels = np.full(len(labels), -1, dtype=np.int64)
+    dense_labels[clustered] = inverse
+    sizes = np.bincount(inverse, minlength=n_clusters)
+    centroids = cluster_centroids(embeddings, dense_labels, chunk_size) if n_clusters else \
+        np.zeros((0, embeddings.shape[1]))
+
+    centroids32 = centroids.astype(np.float32)
+
+    distance_sums = np.zeros(n_clusters)
+    squared_sums = np.zeros(n_clusters)
+    maxima = np.full(n_clusters, -np.inf)
+    minima = np.full(n_clusters, np.inf)
+    for start in range(0, len(embeddings), chunk_size):
+        chunk_labels = dense_labels[start:start + chunk_size]
+        keep = chunk_labels >= 0
+        chunk_labels = chunk_labels[keep]
+        chunk = np.asarray(embeddings[start:start + chunk_size], dtype=np.float32)[keep]
+        offsets = centroids32[chunk_labels]
+        np.subtract(chunk, offsets, out=offsets)
+        distances = np.sqrt(np.einsum('ij,ij->i', offsets, offsets)).astype(np.float64)
+
+        distance_sums += np.bincount(chunk_labels, weights=distances, minlength=n_clusters)
+        squared_sums += np.bincount(chunk_labels, weights=distances ** 2, minlength=n_clusters)
+        np.maximum.at(maxima, chunk_labels, distances)
+        np.minimum.at(minima, chunk_labels, distances)
+
+    counts = np.maximum(sizes, 1)
+    means = distance_sums / counts
+    return {
+        'cluster_ids': cluster_ids.astype(np.int64),
+        'sizes': sizes.astype(np.int64),
+        'centroids': centroids32,
+        'mean_distance_to_centroid': means,
+        'std_distance_to_centroid': np.sqrt(np.maximum(squared_sums / counts - means ** 2, 0)),
+        'max_distance_to_centroid': maxima,
+        'min_distance_to_centroid': minima
+    }
+
+
+def simplified_silhouette(embeddings: np.ndarray, labels: np.ndarray,
+                          centroids: Optional[np.ndarray] = None, chunk_size: int = 65536) -> float:
+    """
+    Centroid-based (simplified) silhouette.
+
+    Uses the distance to the own centroid as a(i) and the distance to the nearest
+    other centroid as b(i), which costs O(n x k) instead of O(n²). Noise rows
+    (label -1) are skipped.
+    """
+    if centroids is None:
+        centroids = cluster_centroids(embeddings, labels, chunk_size)
+    centroids = np.asarray(centroids, dtype=np.float64)
+    centroid_norms = np.sum(centroids ** 2, axis=1)
+
+    total = 0.0
+    for start in range(0, len(embeddings), chunk_size):
+        chunk_labels = labels[start:start + chunk_size]
+        keep = chunk_labels >= 0
+        chunk = np.asarray(embeddings[start:start + chunk_size], dtype=np.float64)[keep]
+        chunk_labels = chunk_labels[keep]
+        squared = np.sum(chunk ** 2, axis=1)[:, None] - 2 * chunk @ centroids.T + centroid_norms
+        distances = np.sqrt(np.maximum(squared, 0))
+
+        rows = np.arange(len(chunk))
+        own = distances[rows, chunk_labels]
+        distances[rows, chunk_labels] = np.inf
+        nearest_other = distances.min(axis=1)
+        denominator = np.maximum(own, nearest_other)
+        total += np.sum(np.where(denominator > 0, (nearest_other - own) / np.where(denominator > 0, denominator, 1), 0))
+    return float(total / max(int(np.sum(labels >= 0)), 1))
+
+
+def compute_cluster_metrics(embeddings: np.ndarray, labels: np.ndarray, mode: str = 'auto',
+                            sample_size: int = 10000, n_repeats: int = 5, metric: str = 'euclidean',
+                            random_state: Optional[int] = 42,
+                            centroids: Optional[np.ndarray] = None) -> Dict[str, Any]:
+    """
+    Compute cluster quality metrics at the cost selected by `mode`.
+
+    Noise points (label -1) are excluded in every mode, so scores keep the
+    same meaning whichever mode 'auto' selects ('full' up to `sample_size`
+    non-noise points). With fewer than two clusters (or no more points than
+    clusters) no metric is computed and
+    the approximation is recorded as 'not_computed'.
+
+    Args:
+        embeddings: (n, d) array (may be memory-mapped)
+        labels: Cluster label per row
+        mode: One of METRIC_MODES
+        sample_size: Rows per silhouette sample ('sampled'; threshold for 'auto')
+        n_repeats: Number of stratified samples ('sampled')
+        metric: Distance metric for the silhouette
+        random_state: Seed for sampling
+        centroids: Optional precomputed centroids ('simplified')
+
+    Returns:
+        Dictionary with 'silhouette_score', 'calinski_harabasz_score' and
+        'davies_bouldin_score' (when computed) and a 'metrics' entry describing
+        the approximation used
+    """
+    if mode not in METRIC_MODES:
+        raise ValueError(f"Unknown metrics mode: {mode}. Expected one of {METRIC_MODES}")
+    if mode == 'none':
+        return {'metrics': {'mode': 'none'}}
+
+    # Noise points are excluded by row index, so rows of a memory-mapped matrix are
+    # only read when scored, sampled or streamed in chunks
+    labels = np.asarray(labels)
+    clustered = np.flatnonzero(labels >= 0)
+    if mode == 'auto':
+        mode = 'full' if len(clustered) <= sample_size else 'sampled'
+
+    info: Dict[str, Any] = {'mode': mode, 'n_samples': int(len(labels)),
+                            'excluded_noise_points': int(len(labels) - len(clustered))}
+
+    # Relabel to 0..k-1 (labels may have gaps, e.g. empty k-means clusters); noise stays -1
+    present, inverse = np.unique(labels[clustered], return_inverse=True)
+    labels = np.full(len(labels), -1, dtype=np.int64)
+    labels[clustered] = inverse
+    if centroids is not None:
+        centroids = np.asarray(centroids)[present]
+    if len(present) < 2 or len(clustered) <= len(present):
+        info['silhouette_approximation'] = 'not_computed'
+        return {'silhouette_score': -1.0, 'calinski_harabasz_score': 0.0, 'davies_bouldin_score': None,
+                'metrics': info}
+
+    if mode == 'full':
+        data = np.asarray(embeddings[clustered] if len(clustered) < len(labels) else embeddings, dtype=np.float32)
+        info['silhouette_approximation'] = 'exact'
+        return {
+            'silhouette_score': float(silhouette_score(data, inverse, metric=metric)),
+            'calinski_harabasz_score': float(calinski_harabasz_score(data, inverse)),
+            'davies_bouldin_score': float(davies_bouldin_score(data, inverse)),
+            'metrics': info
+        }
+
+    if mode == 'sampled':
+        sampled = sampled_silhouette(embeddings, inverse, sample_size=sample_size, n_repeats=n_repeats,
+                                     metric=metric, random_state=random_state, rows=clustered)
+        silhouette = sampled.pop('silhouette_score')
+        info.update(sampled)
+        info['silhouette_approximation'] = 'stratified_sample'
+    else:
+        silhouette = simplified_silhouette(embeddings, labels, centroids)
+        info['silhouette_approximation'] = 'centroid_simplified'
+
+    # Both are O(n x k) but need the data in memory; use a sample beyond 10 x sample_size rows
+    sample = np.arange(len(clustered))
+    if len(clustered) > 10 * sample_size:
+        sample = stratified_sample(inverse, 10 * sample_size, np.random.default_rng(random_state))
+        info['centroid_metrics_sample_size'] = int(len(sample))
+    data = np.asarray(embeddings[clustered[sample]], dtype=np.float32)
+    labels = inverse[sample]
+
+    return {
+        'silhouette_score': float(silhouette),
+        'calinski_harabasz_score': float(calinski_harabasz_score(data, labels)),
+        'davies_bouldin_score': float(davies_bouldin_score(data, labels)),
+        'metrics': info
+    }
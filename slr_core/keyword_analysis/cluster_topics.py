@@ -0,0 +1,169 @@
+"""
+Cluster Topic Labelling with Class-based TF-IDF
+
+All clusters are labelled in one pass over a sparse document-term matrix:
+documents are summed per cluster (a one-hot sparse product), and terms are
+weighted by their frequency in the cluster against their frequency across all
+clusters (c-TF-IDF, as used by BERTopic):
+
+    w(t, c) = tf(t, c) * log(1 + A / f(t))
+
+where tf(t, c) is the term frequency normalized per cluster, f(t) the total
+frequency of term t and A the average number of words per cluster.
+"""
+
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer
+
+from .cluster_metrics import cluster_centroids
+
+logger = logging.getLogger(__name__)
+
+# Alphabetic tokens of at least four characters
+TOKEN_PATTERN = r'(?u)\b[a-zA-Z]{4,}\b'
+
+
+def cluster_indicator(labels: np.ndarray) -> Tuple[np.ndarray, sparse.csr_matrix]:
+    """
+    One-hot (n_clusters x n_documents) matrix of cluster membership; noise (-1) is excluded.
+
+    Returns:
+        Tuple of (sorted cluster ids, sparse indicator matrix)
+    """
+    labels = np.asarray(labels)
+    clustered = np.flatnonzero(labels >= 0)
+    cluster_ids, rows = np.unique(labels[clustered], return_inverse=True)
+    indicator = sparse.csr_matrix(
+        (np.ones(len(clustered)), (rows, clustered)),
+        shape=(len(cluster_ids), len(labels))
+    )
+    return cluster_ids, indicator
+
+
+def class_tfidf(doc_term: sparse.spmatrix, labels: np.ndarray) -> Tuple[np.ndarray, sparse.csr_matrix, sparse.csr_matrix]:
+    """
+    Compute c-TF-IDF weights for every cluster.
+
+    Args:
+        doc_term: (n_documents x n_terms) sparse count matrix
+        labels: Cluster label per document (-1 = noise, ignored)
+
+    Returns:
+        Tuple of (cluster ids, cluster x term counts, cluster x term c-TF-IDF weights)
+    """
+    cluster_ids, indicator = cluster_indicator(labels)
+    counts = (indicator @ doc_term).tocsr()
+
+    words_per_cluster = np.asarray(counts.sum(axis=1)).ravel()
+    term_frequency = np.asarray(counts.sum(axis=0)).ravel()
+    average_words = words_per_cluster.mean() if len(words_per_cluster) else 0.0
+    idf = np.log1p(average_words / np.maximum(term_frequency, 1))
+
+    tf = sparse.diags(1 / np.maximum(words_per_cluster, 1)) @ counts
+    return cluster_ids, counts, (tf @ sparse.diags(idf)).tocsr()
+
+
+def top_terms(weights: sparse.csr_matrix, vocabulary: np.ndarray, n_terms: int = 10) -> List[Dict[str, float]]:
+    """Highest-weighted terms of every row, as {term: weight} dictionaries in descending order."""
+    results = []
+    for row in range(weights.shape[0]):
+        start, end = weights.indptr[row], weights.indptr[row + 1]
+        data, indices = weights.data[start:end], weights.indices[start:end]
+        if len(data) > n_terms:
+            keep = np.argpartition(-data, n_terms - 1)[:n_terms]
+            data, indices = data[keep], indices[keep]
+        order = np.lexsort((vocabulary[indices], -data))
+        results.append({str(vocabulary[indices[i]]): float(data[i]) for i in order if data[i] > 0})
+    return results
+
+
+def representative_documents(labels: np.ndarray, cluster_ids: np.ndarray, n_documents: int = 3,
+                             embeddings: Optional[np.ndarray] = None,
+                             doc_term: Optional[sparse.spmatrix] = None,
+                             weights: Optional[sparse.csr_matrix] = None) -> List[np.ndarray]:
+    """
+    Row indices of the most representative documents of every cluster.
+
+    With embeddings, these are the documents closest (cosine) to the cluster
+    centroid; otherwise the documents whose terms best match the cluster's
+    c-TF-IDF weights.
+    """
+    labels = np.asarray(labels)
+    cluster_rows = np.full(int(labels.max()) + 1 if len(labels) else 0, -1, dtype=np.int64)
+    cluster_rows[cluster_ids] = np.arange(len(cluster_ids))
+    clustered = np.flatnonzero(labels >= 0)
+    row_of_doc = cluster_rows[labels[clustered]]
+
+    if embeddings is not None:
+        vectors = np.asarray(embeddings[clustered], dtype=np.float32)
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        centroids = cluster_centroids(vectors, row_of_doc)
+        centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+        scores = np.einsum('ij,ij->i', vectors, centroids[row_of_doc].astype(np.float32))
+    else:
+        # Similarity of each document's term counts to its own cluster's weights
+        scores = np.asarray(doc_term[clustered].multiply(weights[row_of_doc]).sum(axis=1)).ravel()
+
+    # Sort by (cluster, -score) and take each cluster's first n_documents
+    order = np.lexsort((-scores, row_of_doc))
+    sorted_rows = row_of_doc[order]
+    boundaries = np.searchsorted(sorted_rows, np.arange(len(cluster_ids) + 1))
+    return [clustered[order[boundaries[i]:min(boundaries[i] + n_documents, boundaries[i + 1])]]
+            for i in range(len(cluster_ids))]
+
+
+def label_clusters(texts: Sequence[str], labels: np.ndarray, n_terms: int = 10, n_representative: int = 3,
+                   embeddings: Optional[np.ndarray] = None, ngram_range: Tuple[int, int] = (1, 1),
+                   min_df: int = 1, stop_words='english') -> Dict[str, object]:
+    """
+    Label every cluster with its top c-TF-IDF terms and representative documents.
+
+    Args:
+        texts: Document texts, aligned with labels
+        labels: Cluster label per document (-1 = noise)
+        n_terms: Top terms per cluster
+        n_representative: Representative documents per cluster
+        embeddings: Optional document embeddings for centroid-based representatives
+        ngram_range, min_df, stop_words: CountVectorizer settings
+
+    Returns:
+        Dictionary with 'cluster_ids', 'sizes', 'top_terms' (c-TF-IDF weights),
+        'top_words' (raw counts) and 'representative_rows', aligned by cluster
+    """
+    labels = np.asarray(labels)
+    cluster_ids, indicator = cluster_indicator(labels)
+    sizes = np.asarray(indicator.sum(axis=1)).ravel().astype(np.int64)
+
+    texts = ['' if text is None or (isinstance(text, float) and np.isnan(text)) else str(text) for text in texts]
+    vectorizer = CountVectorizer(ngram_range=tuple(ngram_range), min_df=min_df, stop_words=stop_words,
+                                 token_pattern=TOKEN_PATTERN, lowercase=True)
+    try:
+        doc_term = vectorizer.fit_transform(texts)
+    except ValueError:
+        # Empty vocabulary (no usable text)
+        logger.warning("No terms found for cluster topic labelling")
+        return {
+            'cluster_ids': cluster_ids,
+            'sizes': sizes,
+            'top_terms': [{} for _ in cluster_ids],
+            'top_words': [{} for _ in cluster_ids],
+            'representative_rows': representative_documents(labels, cluster_ids, n_representative, embeddings)
+            if embeddings is not None else [np.array([], dtype=np.int64) for _ in cluster_ids]
+        }
+
+    vocabulary = vectorizer.get_feature_names_out()
+    cluster_ids, counts, weights = class_tfidf(doc_term, labels)
+
+    return {
+        'cluster_ids': cluster_ids,
+        'sizes': sizes,
+        'top_terms': top_terms(weights, vocabulary, n_terms),
+        'top_words': [{term: int(count) for term, count in row.items()}
+                      for row in top_terms(counts.astype(float).tocsr(), vocabulary, n_terms)],
+        'representative_rows': representative_documents(labels, cluster_ids, n_representative,
+                                                        embeddings, doc_term, weights)
+    }
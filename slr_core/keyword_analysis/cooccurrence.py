@@ -0,0 +1,278 @@
+"""
+Keyword Co-occurrence Networks
+
+Co-occurrence networks are built from the binary publication x keyword matrix
+X with one sparse product, C = X^T X: C[i, j] counts the publications listing
+both keywords i and j, and the diagonal holds each keyword's occurrences.
+
+- Normalization of co-occurrence counts (association strength, Jaccard,
+  cosine) on the sparse entries only
+- Top-k pruning per keyword (an edge is kept if either endpoint keeps it)
+- Community detection: Louvain via networkx when installed, otherwise a
+  sparse label propagation
+- Per-period snapshots over one shared keyword vocabulary, so node indices
+  align across periods for temporal network evolution
+"""
+
+import importlib.util
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+logger = logging.getLogger(__name__)
+
+NETWORKX_AVAILABLE = importlib.util.find_spec('networkx') is not None
+
+NORMALIZATIONS = ('count', 'association', 'jaccard', 'cosine')
+
+
+def publication_keyword_matrix(keywords_df: pd.DataFrame, publication_col: str = 'publication_id',
+                               keyword_col: str = 'keyword',
+                               min_occurrences: int = 1) -> Tuple[sparse.csr_matrix, np.ndarray, np.ndarray]:
+    """
+    Binary publication x keyword matrix from a long-format keywords DataFrame.
+
+    Args:
+        keywords_df: One row per (publication, keyword); duplicates count once
+        publication_col, keyword_col: Column names
+        min_occurrences: Minimum number of publications per keyword
+
+    Returns:
+        Tuple of (csr matrix, publication ids, keywords), rows/columns aligned
+    """
+    pairs = keywords_df[[publication_col, keyword_col]].dropna()
+    publication_codes, publication_ids = pd.factorize(pairs[publication_col])
+    keyword_codes, keywords = pd.factorize(pairs[keyword_col])
+
+    matrix = sparse.csr_matrix(
+        (np.ones(len(pairs), dtype=np.float32), (publication_codes, keyword_codes)),
+        shape=(len(publication_ids), len(keywords))
+    )
+    matrix.data[:] = 1  # Repeated (publication, keyword) pairs were summed
+
+    if min_occurrences > 1:
+        keep = np.flatnonzero(matrix.getnnz(axis=0) >= min_occurrences)
+        matrix, keywords = matrix[:, keep], keywords[keep]
+    return matrix.tocsr(), np.asarray(publication_ids), np.asarray(keywords, dtype=object)
+
+
+def cooccurrence_matrix(matrix: sparse.spmatrix) -> sparse.csr_matrix:
+    """Keyword x keyword co-occurrence counts (X^T X); the diagonal holds occurrences."""
+    matrix = sparse.csr_matrix(matrix)
+    return (matrix.T @ matrix).tocsr()
+
+
+def normalize_cooccurrence(counts: sparse.csr_matrix, method: str = 'association',
+                           n_documents: Optional[int] = None) -> sparse.csr_matrix:
+    """
+    Normalize co-occurrence counts; the diagonal is removed.
+
+    Methods, for co-occurrences c_ij and occurrences o_i, o_j:
+    - 'count': c_ij
+    - 'association': c_ij * N / (o_i * o_j), observed over expected co-occurrences
+      among N publications (association strength)
+    - 'jaccard': c_ij / (o_i + o_j - c_ij)
+    - 'cosine': c_ij / sqrt(o_i * o_j)
+    """
+    if method not in NORMALIZATIONS:
+        raise ValueError(f"Unknown normalization '{method}', expected one of {NORMALIZATIONS}")
+
+    occurrences = counts.diagonal().astype(np.float64)
+    edges = sparse.coo_matrix(counts)
+    off_diagonal = edges.row != edges.col
+    rows, cols = edges.row[off_diagonal], edges.col[off_diagonal]
+    c = edges.data[off_diagonal].astype(np.float64)
+    o_i, o_j = occurrences[rows], occurrences[cols]
+
+    if method == 'count':
+        weights = c
+    elif method == 'association':
+        weights = c * (n_documents or 1) / (o_i * o_j)
+    elif method == 'jaccard':
+        weights = c / (o_i + o_j - c)
+    else:
+        weights = c / np.sqrt(o_i * o_j)
+
+    return sparse.csr_matrix((weights, (rows, cols)), shape=counts.shape)
+
+
+def prune_top_k(weights: sparse.csr_matrix, top_k: Optional[int] = 20, min_weight: float = 0.0) -> sparse.csr_matrix:
+    """
+    Keep each keyword's top_k strongest edges (and edges of at least min_weight).
+
+    The result is symmetric: an edge survives if either endpoint keeps it.
+    """
+    weights = sparse.csr_matrix(weights)
+    if min_weight > 0:
+        weights = weights.multiply(weights >= min_weight).tocsr()
+        weights.eliminate_zeros()
+    if not top_k or weights.nnz == 0:
+        return weights
+
+    # Rank entries within each row by descending weight
+    rows = np.repeat(np.arange(weights.shape[0]), np.diff(weights.indptr))
+    order = np.lexsort((-weights.data, rows))
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order)) - weights.indptr[rows[order]]
+    keep = rank < top_k
+
+    pruned = sparse.csr_matrix((weights.data[keep], (rows[keep], weights.indices[keep])), shape=weights.shape)
+    return pruned.maximum(pruned.T).tocsr()
+
+
+def _relabel_by_size(labels: np.ndarray) -> np.ndarray:
+    """Renumber communities 0..k-1 by descending size (ties by first member)."""
+    _, first, inverse, sizes = np.unique(labels, return_index=True, return_inverse=True, return_counts=True)
+    order = np.lexsort((first, -sizes))
+    new_ids = np.empty(len(order), dtype=np.int64)
+    new_ids[order] = np.arange(len(order))
+    return new_ids[inverse]
+
+
+def _label_propagation(weights: sparse.csr_matrix, max_iter: int = 50, random_state: Optional[int] = 42) -> np.ndarray:
+    """
+    Weighted label propagation with sparse products.
+
+    Each round, a random half of the nodes adopts the label with the largest
+    total edge weight among its neighbours (ties keep the current label).
+    """
+    n_nodes = weights.shape[0]
+    rng = np.random.default_rng(random_state)
+    labels = np.arange(n_nodes)
+    has_neighbors = np.diff(weights.indptr) > 0
+    node_index = np.arange(n_nodes)
+
+    for _ in range(max_iter):
+        membership = sparse.csr_matrix((np.ones(n_nodes), (node_index, labels)), shape=(n_nodes, n_nodes))
+        scores = (weights @ membership + membership * 1e-9).tocsr()
+        best = np.asarray(scores.argmax(axis=1)).ravel()
+        best = np.where(has_neighbors, best, labels)
+        if np.array_equal(best, labels):
+            break
+        update = rng.random(n_nodes) < 0.5
+        labels = np.where(update, best, labels)
+
+    return _relabel_by_size(labels)
+
+
+def _louvain(weights: sparse.csr_matrix, resolution: float = 1.0, random_state: Optional[int] = 42) -> np.ndarray:
+    import networkx as nx
+
+    graph = nx.from_scipy_sparse_array(weights, edge_attribute='weight')
+    communities = nx.community.louvain_communities(graph, weight='weight', resolution=resolution, seed=random_state)
+    labels = np.empty(weights.shape[0], dtype=np.int64)
+    for community_id, members in enumerate(communities):
+        labels[list(members)] = community_id
+    return _relabel_by_size(labels)
+
+
+def detect_communities(weights: sparse.csr_matrix, method: str = 'auto', resolution: float = 1.0,
+                       random_state: Optional[int] = 42) -> np.ndarray:
+    """
+    Community label per keyword, numbered by descending community size.
+
+    Args:
+        weights: Symmetric weighted adjacency matrix
+        method: 'louvain' (requires networkx), 'label_propagation' or 'auto'
+        resolution: Louvain resolution (higher = smaller communities)
+        random_state: Random seed
+    """
+    if weights.shape[0] == 0:
+        return np.zeros(0, dtype=np.int64)
+    if method == 'auto':
+        method = 'louvain' if NETWORKX_AVAILABLE else 'label_propagation'
+    if method == 'louvain':
+        if not NETWORKX_AVAILABLE:
+            logger.warning("networkx not available, using label propagation for community detection")
+            return _label_propagation(weights, random_state=random_state)
+        return _louvain(weights, resolution, random_state)
+    if method == 'label_propagation':
+        return _label_propagation(weights, random_state=random_state)
+    raise ValueError(f"Unknown community detection method '{method}'")
+
+
+def modularity(weights: sparse.csr_matrix, labels: np.ndarray) -> float:
+    """Newman modularity of a partition of a weighted, symmetric graph."""
+    total = weights.sum()
+    if total == 0:
+        return 0.0
+    membership = sparse.csr_matrix((np.ones(len(labels)), (np.arange(len(labels)), labels)))
+    within = (membership.T @ weights @ membership).diagonal()
+    strength = membership.T @ np.asarray(weights.sum(axis=1)).ravel()
+    return float(np.sum(within / total - (strength / total) ** 2))
+
+
+def build_network(matrix: sparse.csr_matrix, keywords: np.ndarray, normalization: str = 'association',
+                  top_k: Optional[int] = 20, min_cooccurrence: int = 1, min_weight: float = 0.0,
+                  communities: bool = True, community_method: str = 'auto', resolution: float = 1.0,
+                  random_state: Optional[int] = 42) -> Dict[str, Any]:
+    """
+    Build a pruned, normalized co-occurrence network from a publication x keyword matrix.
+
+    Returns:
+        Dictionary with 'nodes' (keyword, occurrences, degree, strength,
+        community; keywords with occurrences only), 'edges' (source, target,
+        cooccurrence, weight; each pair once, strongest first), the sparse
+        'adjacency' (pruned weights) and 'cooccurrence' (raw counts) matrices
+        aligned with `keywords`, and 'modularity'
+    """
+    counts = cooccurrence_matrix(matrix)
+    occurrences = counts.diagonal().astype(np.int64)
+
+    weights = normalize_cooccurrence(counts, normalization, n_documents=matrix.shape[0])
+    if min_cooccurrence > 1:
+        weights = weights.multiply(counts >= min_cooccurrence).tocsr()
+    adjacency = prune_top_k(weights, top_k, min_weight)
+
+    edges = sparse.triu(adjacency, k=1).tocoo()
+    edges_df = pd.DataFrame({
+        'source': keywords[edges.row],
+        'target': keywords[edges.col],
+        'cooccurrence': np.asarray(counts[edges.row, edges.col]).ravel().astype(np.int64),
+        'weight': edges.data
+    }).sort_values('weight', ascending=False, kind='stable').reset_index(drop=True)
+
+    nodes_df = pd.DataFrame({
+        'keyword': keywords,
+        'occurrences': occurrences,
+        'degree': adjacency.getnnz(axis=1),
+        'strength': np.asarray(adjacency.sum(axis=1)).ravel()
+    })
+
+    network = {'adjacency': adjacency, 'cooccurrence': counts, 'normalization': normalization}
+    if communities:
+        labels = detect_communities(adjacency, community_method, resolution, random_state)
+        nodes_df['community'] = labels
+        network['modularity'] = modularity(adjacency, labels) if len(labels) else 0.0
+
+    # Keywords without occurrences (e.g. outside a snapshot's period) are not listed
+    network['nodes'] = nodes_df[occurrences > 0].reset_index(drop=True)
+    network['edges'] = edges_df
+
+    logger.info(f"Built co-occurrence network: {len(network['nodes'])} keywords, {len(edges_df)} edges")
+    return network
+
+
+def network_snapshots(matrix: sparse.csr_matrix, keywords: np.ndarray, periods: np.ndarray,
+                      **network_kwargs) -> Dict[Any, Dict[str, Any]]:
+    """
+    One co-occurrence network per period over the shared keyword vocabulary.
+
+    Args:
+        matrix: Publication x keyword matrix
+        keywords: Keywords aligned with the matrix columns
+        periods: Period label per publication row (missing periods are skipped)
+        **network_kwargs: Passed to build_network
+
+    Returns:
+        Dictionary of period -> network (see build_network), in period order;
+        keywords absent in a period have zero occurrences there
+    """
+    periods = pd.Series(periods)
+    snapshots = {}
+    for period, rows in periods.groupby(periods, sort=True).indices.items():
+        snapshots[period] = build_network(matrix[rows], keywords, **network_kwargs)
+    return snapshots
@@ -0,0 +1,238 @@
+"""
+Date Normalization for Keyword Analysis
+
+Shared, memoized parsing of raw publication dates into integer year, month and
+quarter columns. Every distinct raw value is parsed only once per process, and
+DataFrames are normalized by parsing their unique values and broadcasting the
+result back to the rows.
+"""
+
+import re
+from datetime import date, datetime
+from functools import lru_cache
+from numbers import Integral, Real
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+MIN_YEAR = 1900
+MAX_YEAR = 2099
+
+# Columns written by `add_date_columns`
+DATE_COLUMNS = ('year', 'month', 'quarter')
+
+# Fields checked (in order) for a publication date in publication dictionaries
+PUBLICATION_DATE_FIELDS = ('publication_date', 'published_date', 'date', 'year')
+
+_ISO_DATE_PATTERN = re.compile(r'^\s*(\d{4})(?:[-/.](\d{1,2})(?:[-/.](\d{1,2}))?)?')
+_YEAR_PATTERN = re.compile(r'\b(?:19|20)\d{2}\b')
+_MONTH_PATTERN = re.compile(r'-(\d{1,2})-')
+
+DateParts = Tuple[Optional[int], Optional[int], Optional[int]]
+_EMPTY_PARTS: DateParts = (None, None, None)
+
+
+def _valid_parts(year: Optional[int], month: Optional[int] = None, day: Optional[int] = None) -> DateParts:
+    """Validate year/month/day ranges, dropping components that are out of range."""
+    if year is None or not MIN_YEAR <= year <= MAX_YEAR:
+        return _EMPTY_PARTS
+    if month is None or not 1 <= month <= 12:
+        return (year, None, None)
+    if day is None or not 1 <= day <= 31:
+        return (year, month, None)
+    return (year, month, day)
+
+
+@lru_cache(maxsize=65536)
+def _parse_date_string(value: str) -> DateParts:
+    """Parse a raw date string into (year, month, day). Memoized per distinct string."""
+    value = value.strip()
+    if not value:
+        return _EMPTY_PARTS
+
+    # Fast path: ISO-like 'YYYY', 'YYYY-MM', 'YYYY-MM-DD' (also with '/' or '.')
+    iso_match = _ISO_DATE_PATTERN.match(value)
+    if iso_match:
+        year, month, day = (int(part) if part else None for part in iso_match.groups())
+        parts = _valid_parts(year, month, day)
+        if parts[0] is not None:
+            return parts
+
+    # Free-form dates such as '15 Jan 2023' or 'March 2021'
+    year_match = _YEAR_PATTERN.search(value)
+    if not year_match:
+        return _EMPTY_PARTS
+
+    try:
+        parsed = pd.to_datetime(value, errors='coerce')
+    except (ValueError, TypeError, OverflowError):
+        parsed = pd.NaT
+    if not pd.isna(parsed) and parsed.year == int(year_match.group()):
+        return _valid_parts(parsed.year, parsed.month, parsed.day)
+
+    # Fall back to a '-MM-' fragment or the year alone
+    month_match = _MONTH_PATTERN.search(value)
+    month = int(month_match.group(1)) if month_match else None
+    return _valid_parts(int(year_match.group()), month)
+
+
+def parse_date(value: Any) -> DateParts:
+    """
+    Parse a raw date value into (year, month, day) integers.
+
+    Accepts strings, integer (or integral float) years, and date/datetime/Timestamp
+    objects. Components that cannot be determined are returned as None.
+
+    Args:
+        value: Raw date value
+
+    Returns:
+        Tuple of (year, month, day)
+    """
+    if value is None or isinstance(value, bool):
+        return _EMPTY_PARTS
+    if isinstance(value, (datetime, date)):  # Includes pd.Timestamp
+        if pd.isna(value):
+            return _EMPTY_PARTS
+        return _valid_parts(value.year, value.month, value.day)
+    if isinstance(value, Integral):
+        return _valid_parts(int(value))
+    if isinstance(value, Real):
+        if np.isnan(value) or not float(value).is_integer():
+            return _EMPTY_PARTS
+        return _valid_parts(int(value))
+    if isinstance(value, str):
+        return _parse_date_string(value)
+    return _parse_date_string(str(value))
+
+
+def parse_year(value: Any) -> Optional[int]:
+    """Return the year of a raw date value, or None."""
+    return parse_date(value)[0]
+
+
+def _factorize(values: pd.Series) -> Tuple[np.ndarray, List[Any]]:
+    """Factorize raw values, falling back to strings for unhashable entries."""
+    try:
+        codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    except TypeError:
+        codes, uniques = pd.factorize(values.astype(str), use_na_sentinel=True)
+    return codes, list(uniques)
+
+
+def normalize_dates(values: Iterable[Any]) -> pd.DataFrame:
+    """
+    Normalize raw date values into integer year, month and quarter columns.
+
+    Each distinct value is parsed once; the parsed components are broadcast back
+    to all rows. Unknown components are missing (nullable Int64).
+
+    Args:
+        values: Series or iterable of raw date values
+
+    Returns:
+        DataFrame with 'year', 'month', 'quarter' columns aligned with the input
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+    codes, uniques = _factorize(series)
+
+    # One extra slot at the end for missing values (code -1)
+    parsed = np.full((len(uniques) + 1, 2), np.nan)
+    for i, value in enumerate(uniques):
+        year, month, _ = parse_date(value)
+        if year is not None:
+            parsed[i, 0] = year
+            parsed[i, 1] = month if month is not None else np.nan
+
+    rows = parsed[codes]
+    year = pd.array(rows[:, 0], dtype='Float64').astype('Int64')
+    month = pd.array(rows[:, 1], dtype='Float64').astype('Int64')
+    quarter = (month - 1) // 3 + 1
+
+    return pd.DataFrame({'year': year, 'month': month, 'quarter': quarter}, index=series.index)
+
+
+def add_date_columns(df: pd.DataFrame, date_column: str = 'publication_date',
+                     overwrite: bool = False) -> pd.DataFrame:
+    """
+    Add integer 'year', 'month' and 'quarter' columns parsed from a date column.
+
+    Args:
+        df: DataFrame containing the raw date column
+        date_column: Name of the raw date column
+        overwrite: Re-parse even if all date columns are already present
+
+    Returns:
+        The same DataFrame with date columns added (modified in place)
+    """
+    if not overwrite and all(column in df.columns for column in DATE_COLUMNS):
+        return df
+
+    if date_column in df.columns:
+        normalized = normalize_dates(df[date_column])
+    elif 'year' in df.columns:
+        normalized = normalize_dates(df['year'])
+    else:
+        normalized = pd.DataFrame({column: pd.array([pd.NA] * len(df), dtype='Int64') for column in DATE_COLUMNS},
+                                  index=df.index)
+
+    for column in DATE_COLUMNS:
+        df[column] = normalized[column]
+    return df
+
+
+def format_period_labels(dates: pd.DataFrame, granularity: str = 'year') -> pd.Series:
+    """
+    Build period labels from normalized date columns.
+
+    Quarter labels look like '2023Q2' and month labels like '2023-06'; a missing
+    month defaults to the first quarter/month of the year.
+
+    Args:
+        dates: DataFrame with normalized 'year' and 'month' columns
+        granularity: 'year', 'quarter' or 'month'
+
+    Returns:
+        Series of period labels (missing where the year is unknown)
+    """
+    year = dates['year']
+    if granularity == 'year':
+        return year
+
+    month = dates['month'].fillna(1)
+    known = year.notna()
+    labels = pd.Series(pd.NA, index=dates.index, dtype=object)
+    year_str = year[known].astype(int).astype(str)
+
+    if granularity == 'quarter':
+        quarter = ((month[known] - 1) // 3 + 1).astype(int).astype(str)
+        labels[known] = year_str + 'Q' + quarter
+    elif granularity == 'month':
+        labels[known] = year_str + '-' + month[known].astype(int).astype(str).str.zfill(2)
+    else:
+        raise ValueError(f"Unknown time granularity: {granularity}")
+    return labels
+
+
+def extract_publication_date_parts(publication: Dict[str, Any]) -> DateParts:
+    """
+    Get (year, month, day) for a publication dictionary.
+
+    Uses normalized integer 'year'/'month' fields when present (e.g. records from
+    a DataFrame passed through `add_date_columns`), otherwise parses the first
+    available raw date field.
+    """
+    year = publication.get('year')
+    month = publication.get('month')
+    if isinstance(year, Integral) and isinstance(month, Integral) and 'quarter' in publication:
+        return _valid_parts(int(year), int(month))
+
+    for field in PUBLICATION_DATE_FIELDS:
+        value = publication.get(field)
+        if value is None or (isinstance(value, float) and np.isnan(value)):
+            continue
+        parts = parse_date(value)
+        if parts[0] is not None:
+            return parts
+    return _EMPTY_PARTS
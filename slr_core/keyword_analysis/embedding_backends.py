@@ -0,0 +1,245 @@
+"""
+Embedding Inference Backends
+
+Loads SentenceTransformer models with a selectable CPU inference backend:
+
+- 'torch': full-precision PyTorch (default)
+- 'onnx': ONNX Runtime export of the model
+- 'onnx-int8': ONNX export with dynamic int8 quantization
+
+ONNX exports are created once and cached under `<cache_dir>/models/onnx`.
+`check_backend_parity` compares a backend against the PyTorch model so the
+accuracy cost of a faster backend can be measured before it is used.
+
+`get_embedding_model` keeps a process-wide registry so each model configuration
+is loaded once and shared by every SemanticAnalyzer. sentence-transformers is
+only imported when a model is actually loaded.
+"""
+
+import importlib.util
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ('torch', 'onnx', 'onnx-int8')
+
+PARITY_FILE = 'parity.json'
+
+SENTENCE_TRANSFORMERS_AVAILABLE = importlib.util.find_spec('sentence_transformers') is not None
+
+# ONNX backends need sentence-transformers 3.2+ (backend=, model_kwargs, quantized export)
+ONNX_MIN_SENTENCE_TRANSFORMERS = (3, 2)
+
+# Process-wide model registry: (model_name, device, max_length, backend, quantization_config) -> model
+_MODEL_REGISTRY: Dict[Tuple, Any] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+# Short, varied texts used when no parity sample is supplied
+DEFAULT_PARITY_TEXTS = [
+    "Agentic AI systems for autonomous supply chain planning and replenishment.",
+    "Reinforcement learning improves inventory control under stochastic demand.",
+    "Large language models support procurement negotiation and supplier selection.",
+    "Multi-agent simulation of logistics networks with disruption recovery.",
+    "Demand forecasting with transformer architectures for retail distribution.",
+    "Blockchain-enabled traceability in food supply chains.",
+    "Digital twins for warehouse operations and order picking optimization.",
+    "Vehicle routing with time windows solved by graph neural networks.",
+]
+
+
+def _model_slug(model_name: str) -> str:
+    return model_name.strip('/').replace('/', '__')
+
+
+def _onnx_export_dir(model_name: str, cache_folder: Union[str, Path]) -> Path:
+    return Path(cache_folder) / 'onnx' / _model_slug(model_name)
+
+
+def _quantized_file_name(quantization_config: str) -> str:
+    return f"onnx/model_qint8_{quantization_config}.onnx"
+
+
+def _check_onnx_support():
+    """Raise ImportError with install instructions if the ONNX backends cannot be used."""
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        installed = version('sentence-transformers')
+    except PackageNotFoundError:
+        installed = None
+    parts = tuple(int(part) for part in (installed or '0').split('.')[:2] if part.isdigit())
+    if parts < ONNX_MIN_SENTENCE_TRANSFORMERS:
+        minimum = '.'.join(map(str, ONNX_MIN_SENTENCE_TRANSFORMERS))
+        raise ImportError(
+            f"ONNX embedding backends require sentence-transformers>={minimum} "
+            f"(installed: {installed or 'none'}). Install with: pip install 'sentence-transformers[onnx]>={minimum}'"
+        )
+
+    missing = [name for name in ('onnxruntime', 'optimum') if importlib.util.find_spec(name) is None]
+    if missing:
+        raise ImportError(
+            f"ONNX embedding backends require {', '.join(missing)}. "
+            f"Install with: pip install {' '.join(missing)}"
+        )
+
+
+def load_sentence_transformer(model_name: str, device: str = 'cpu', backend: str = 'torch',
+                              cache_folder: Optional[Union[str, Path]] = None,
+                              quantization_config: str = 'avx512_vnni') -> Any:
+    """
+    Load a SentenceTransformer with the requested inference backend.
+
+    ONNX models are exported (and optionally quantized) on first use and saved to
+    `<cache_folder>/onnx/<model>`, so later loads read the exported files directly.
+
+    Args:
+        model_name: Model name or path
+        device: Torch device for the 'torch' backend ('cpu' for ONNX backends)
+        backend: 'torch', 'onnx' or 'onnx-int8'
+        cache_folder: Model cache folder (e.g. <cache_dir>/models)
+        quantization_config: Dynamic quantization target for 'onnx-int8'
+            ('arm64', 'avx2', 'avx512' or 'avx512_vnni')
+
+    Returns:
+        Loaded SentenceTransformer
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown embedding backend: {backend}. Expected one of {BACKENDS}")
+
+    if backend != 'torch':
+        _check_onnx_support()
+
+    from sentence_transformers import SentenceTransformer
+
+    cache_folder = str(cache_folder) if cache_folder else None
+    if backend == 'torch':
+        return SentenceTransformer(model_name, device=device, cache_folder=cache_folder)
+
+    export_dir = _onnx_export_dir(model_name, cache_folder or '.')
+    if not (export_dir / 'onnx' / 'model.onnx').exists():
+        logger.info(f"Exporting {model_name} to ONNX in {export_dir}")
+        model = SentenceTransformer(model_name, backend='onnx', device='cpu', cache_folder=cache_folder)
+        model.save(str(export_dir))
+
+    if backend == 'onnx':
+        return SentenceTransformer(str(export_dir), backend='onnx', device='cpu')
+
+    file_name = _quantized_file_name(quantization_config)
+    if not (export_dir / file_name).exists():
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+
+        logger.info(f"Quantizing ONNX export of {model_name} to int8 ({quantization_config})")
+        onnx_model = SentenceTransformer(str(export_dir), backend='onnx', device='cpu')
+        export_dynamic_quantized_onnx_model(onnx_model, quantization_config, str(export_dir))
+
+    return SentenceTransformer(str(export_dir), backend='onnx', device='cpu',
+                               model_kwargs={'file_name': file_name})
+
+
+def get_embedding_model(model_name: str, device: str = 'cpu', max_length: int = 512,
+                        backend: str = 'torch', cache_folder: Optional[Union[str, Path]] = None,
+                        quantization_config: str = 'avx512_vnni') -> Any:
+    """
+    Get a shared model instance, loading it on first request.
+
+    Models are keyed by (model_name, device, max_length, backend, quantization_config),
+    so analyzers with the same settings share one instance per process.
+    """
+    key = (model_name, device, max_length, backend, quantization_config if backend == 'onnx-int8' else None)
+
+    with _REGISTRY_LOCK:
+        model = _MODEL_REGISTRY.get(key)
+        if model is None:
+            model = load_sentence_transformer(model_name, device=device, backend=backend,
+                                              cache_folder=cache_folder,
+                                              quantization_config=quantization_config)
+            if hasattr(model, 'max_seq_length'):
+                model.max_seq_length = max_length
+            _MODEL_REGISTRY[key] = model
+        else:
+            logger.info(f"Reusing loaded embedding model: {model_name} ({backend}, {device})")
+    return model
+
+
+def clear_model_registry():
+    """Drop all shared model instances (e.g. to free memory)."""
+    with _REGISTRY_LOCK:
+        _MODEL_REGISTRY.clear()
+
+
+def check_backend_parity(reference_model: Any, candidate_model: Any,
+                         texts: Optional[Sequence[str]] = None,
+                         batch_size: int = 8) -> Dict[str, Any]:
+    """
+    Compare embeddings of a candidate backend against a reference (PyTorch) model.
+
+    Args:
+        reference_model: Full-precision model
+        candidate_model: Model loaded with the backend under test
+        texts: Sample texts, defaults to a small built-in sample
+        batch_size: Encoding batch size
+
+    Returns:
+        Dictionary with per-text cosine similarity statistics, nearest-neighbour
+        agreement and encoding throughput of both models
+    """
+    texts = list(texts or DEFAULT_PARITY_TEXTS)
+
+    def encode(model: Any) -> Tuple[np.ndarray, float]:
+        start_time = time.perf_counter()
+        embeddings = model.encode(texts, batch_size=batch_size, convert_to_numpy=True,
+                                  normalize_embeddings=True, show_progress_bar=False)
+        return np.asarray(embeddings, dtype=np.float32), time.perf_counter() - start_time
+
+    reference, reference_seconds = encode(reference_model)
+    candidate, candidate_seconds = encode(candidate_model)
+
+    cosine = np.sum(reference * candidate, axis=1)
+
+    # Does each text keep the same nearest neighbour among the sample?
+    reference_similarity = reference @ reference.T
+    candidate_similarity = candidate @ candidate.T
+    np.fill_diagonal(reference_similarity, -np.inf)
+    np.fill_diagonal(candidate_similarity, -np.inf)
+    neighbour_agreement = np.mean(reference_similarity.argmax(axis=1) == candidate_similarity.argmax(axis=1))
+
+    return {
+        'n_texts': len(texts),
+        'mean_cosine': float(cosine.mean()),
+        'min_cosine': float(cosine.min()),
+        'max_abs_diff': float(np.abs(reference - candidate).max()),
+        'nearest_neighbour_agreement': float(neighbour_agreement),
+        'reference_texts_per_second': len(texts) / reference_seconds if reference_seconds > 0 else None,
+        'candidate_texts_per_second': len(texts) / candidate_seconds if candidate_seconds > 0 else None,
+        'speedup': reference_seconds / candidate_seconds if candidate_seconds > 0 else None
+    }
+
+
+def load_parity_report(model_name: str, backend: str, cache_folder: Union[str, Path]) -> Optional[Dict[str, Any]]:
+    """Load a stored parity report for an exported backend, if any."""
+    report_path = _onnx_export_dir(model_name, cache_folder) / PARITY_FILE
+    if not report_path.exists():
+        return None
+    with open(report_path, 'r', encoding='utf-8') as f:
+        return json.load(f).get(backend)
+
+
+def save_parity_report(model_name: str, backend: str, cache_folder: Union[str, Path],
+                       report: Dict[str, Any]):
+    """Store a parity report next to the exported backend files."""
+    report_path = _onnx_export_dir(model_name, cache_folder) / PARITY_FILE
+    reports = {}
+    if report_path.exists():
+        with open(report_path, 'r', encoding='utf-8') as f:
+            reports = json.load(f)
+    reports[backend] = report
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(reports, f, indent=2)
@@ -0,0 +1,194 @@
+"""
+Embedding Engine
+
+Throughput-oriented text encoding on top of a SentenceTransformer-like model.
+Texts are bucketed by token length so each batch pads to a similar length,
+batch sizes follow a token budget (short texts get large batches, long texts
+small ones), and large jobs can be spread over a multi-process pool of CPU
+workers. The pool is started on first use and kept for later calls (each
+worker loads its own copy of the model), until `close` is called. Results are
+always returned in the original input order.
+"""
+
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MIN_BUCKET_LENGTH = 16  # tokens
+
+
+class EmbeddingEngine:
+    """
+    Length-bucketed, token-budget batched encoder.
+
+    Features:
+    - Token length estimation with the model tokenizer (character heuristic fallback)
+    - Power-of-two length buckets with per-bucket batch sizes from a token budget
+    - Optional sentence-transformers multi-process pool across CPU cores, reused across calls
+    - Throughput statistics (texts/sec) for every call
+    """
+
+    def __init__(self, model: Any, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the EmbeddingEngine.
+
+        Args:
+            model: Loaded SentenceTransformer (or any object with a compatible `encode`)
+            config: Embedding configuration (semantic_analysis.embedding)
+        """
+        config = config or {}
+        self.model = model
+        self.max_length = config.get('max_length', 512)
+        self.max_batch_size = config.get('batch_size', 32)
+        self.token_budget = config.get('token_budget', 16384)  # padded tokens per batch
+        self.num_processes = config.get('num_processes', 1)  # None = os.cpu_count()
+        self.multiprocess_min_texts = config.get('multiprocess_min_texts', 2000)
+        self.device = config.get('device', 'cpu')
+
+        self.last_stats: Dict[str, Any] = {}
+        self._pool = None
+        self._pool_processes = 0
+
+    def token_lengths(self, texts: Sequence[str]) -> np.ndarray:
+        """Estimate the token length of each text (including special tokens, truncated to max_length)."""
+        tokenizer = getattr(self.model, 'tokenizer', None)
+        if tokenizer is not None:
+            try:
+                input_ids = tokenizer(
+                    list(texts),
+                    add_special_tokens=True,
+                    truncation=True,
+                    max_length=self.max_length,
+                    return_attention_mask=False,
+                    return_token_type_ids=False
+                )['input_ids']
+                return np.fromiter((len(ids) for ids in input_ids), dtype=np.int64, count=len(texts))
+            except Exception as e:
+                logger.debug(f"Tokenizer length estimation failed, using character heuristic: {e}")
+
+        # Rough estimation: 1 token ≈ 4 characters
+        lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts)) // 4 + 2
+        return np.minimum(lengths, self.max_length)
+
+    def plan_buckets(self, lengths: np.ndarray) -> List[Dict[str, Any]]:
+        """
+        Group texts into power-of-two length buckets.
+
+        Returns:
+            List of {'indices', 'max_length', 'batch_size'} dictionaries, longest bucket first
+        """
+        bucket_lengths = np.maximum(MIN_BUCKET_LENGTH, 2 ** np.ceil(np.log2(np.maximum(lengths, 1))))
+        bucket_lengths = np.minimum(bucket_lengths, self.max_length).astype(np.int64)
+
+        buckets = []
+        for bucket_length in np.unique(bucket_lengths)[::-1]:
+            indices = np.flatnonzero(bucket_lengths == bucket_length)
+            # Longest first within the bucket, so the model's own batching sees similar lengths
+            indices = indices[np.argsort(-lengths[indices], kind='stable')]
+            buckets.append({
+                'indices': indices,
+                'max_length': int(bucket_length),
+                'batch_size': int(max(1, min(self.max_batch_size, self.token_budget // bucket_length)))
+            })
+        return buckets
+
+    def _resolve_processes(self, n_texts: int) -> int:
+        processes = self.num_processes or os.cpu_count() or 1
+        if processes <= 1 or n_texts < self.multiprocess_min_texts:
+            return 1
+        if not hasattr(self.model, 'start_multi_process_pool'):
+            logger.warning("Model does not support multi-process encoding, using a single process")
+            return 1
+        return processes
+
+    def _get_pool(self, processes: int) -> Any:
+        """Multi-process pool with `processes` workers, started once and reused."""
+        if self._pool is not None and self._pool_processes != processes:
+            self.close()
+        if self._pool is None:
+            logger.info(f"Starting multi-process encoding pool with {processes} workers")
+            self._pool = self.model.start_multi_process_pool(target_devices=[self.device] * processes)
+            self._pool_processes = processes
+        return self._pool
+
+    def close(self):
+        """Stop the multi-process pool, if one was started."""
+        if self._pool is not None:
+            self.model.stop_multi_process_pool(self._pool)
+            self._pool = None
+            self._pool_processes = 0
+
+    def __enter__(self) -> 'EmbeddingEngine':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def encode(self, texts: Sequence[str], normalize_embeddings: bool = True,
+               show_progress_bar: bool = False) -> np.ndarray:
+        """
+        Encode texts and return embeddings in the original order.
+
+        Args:
+            texts: Texts to encode
+            normalize_embeddings: L2-normalize embeddings (cosine similarity)
+            show_progress_bar: Show the model's progress bar per bucket
+
+        Returns:
+            float32 array of shape (len(texts), dimension)
+        """
+        texts = list(texts)
+        start_time = time.perf_counter()
+
+        lengths = self.token_lengths(texts)
+        buckets = self.plan_buckets(lengths)
+        processes = self._resolve_processes(len(texts))
+
+        pool = self._get_pool(processes) if processes > 1 else None
+
+        embeddings = None
+        for bucket in buckets:
+            bucket_texts = [texts[i] for i in bucket['indices']]
+            if pool is not None:
+                encoded = self.model.encode_multi_process(
+                    bucket_texts,
+                    pool,
+                    batch_size=bucket['batch_size'],
+                    normalize_embeddings=normalize_embeddings
+                )
+            else:
+                encoded = self.model.encode(
+                    bucket_texts,
+                    batch_size=bucket['batch_size'],
+                    show_progress_bar=show_progress_bar,
+                    convert_to_numpy=True,
+                    normalize_embeddings=normalize_embeddings
+                )
+
+            encoded = np.asarray(encoded, dtype=np.float32)
+            if embeddings is None:
+                embeddings = np.zeros((len(texts), encoded.shape[1]), dtype=np.float32)
+            embeddings[bucket['indices']] = encoded
+
+        if embeddings is None:
+            embeddings = np.zeros((0, 0), dtype=np.float32)
+
+        elapsed = time.perf_counter() - start_time
+        padded_tokens = sum(len(bucket['indices']) * bucket['max_length'] for bucket in buckets)
+        self.last_stats = {
+            'texts': len(texts),
+            'seconds': elapsed,
+            'texts_per_second': len(texts) / elapsed if elapsed > 0 else float('inf'),
+            'buckets': len(buckets),
+            'processes': processes,
+            'padding_ratio': float(1 - lengths.sum() / padded_tokens) if padded_tokens else 0.0
+        }
+        logger.info(f"Encoded {len(texts)} texts in {elapsed:.2f}s "
+                    f"({self.last_stats['texts_per_second']:.1f} texts/sec, "
+                    f"{len(buckets)} length buckets, {processes} process(es))")
+        return embeddings
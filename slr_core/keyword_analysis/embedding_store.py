@@ -0,0 +1,328 @@
+"""
+Embedding Storage
+
+Content-addressed per-text embedding store and zero-copy embedding snapshots.
+
+The store caches embeddings per text, keyed by a hash of (model name, max length,
+preprocessed text). Vectors live in append-only .npy shards; a sorted key index
+is memory-mapped for lookups, so only texts that have never been encoded with
+the same model settings need to be sent to the model.
+
+Snapshots save a whole embedding matrix as a raw .npy file with a JSON sidecar
+(model, dimension, dtype, row IDs) and load it back as a memory-mapped view.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+KEY_DTYPE = np.dtype('S16')  # 128-bit blake2b digests
+SUPPORTED_DTYPES = ('float32', 'float16')
+SNAPSHOT_DTYPES = ('float32', 'float16', 'int8')
+
+MANIFEST_FILE = 'manifest.json'
+INDEX_KEYS_FILE = 'index_keys.npy'
+INDEX_ROWS_FILE = 'index_rows.npy'
+
+
+def text_key(model_name: str, max_length: int, text: str) -> bytes:
+    """Content hash identifying the embedding of a preprocessed text for a model configuration."""
+    digest = hashlib.blake2b(digest_size=KEY_DTYPE.itemsize)
+    digest.update(f"{model_name}\x00{max_length}\x00".encode('utf-8'))
+    digest.update(text.encode('utf-8'))
+    return digest.digest()
+
+
+def _atomic_save(path: Path, array: np.ndarray):
+    """Write an .npy file via a temporary file so readers never see partial data."""
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+class EmbeddingStore:
+    """
+    Append-only, content-addressed embedding cache for one model configuration.
+
+    Layout of `store_dir`:
+    - manifest.json: model name, max length, dimension, dtype and shard list
+    - shard_NNNNN.npy: embedding rows, written once and never modified
+    - index_keys.npy / index_rows.npy: sorted text keys and their global row numbers
+    """
+
+    def __init__(self, store_dir: Union[str, Path], model_name: str, max_length: int,
+                 dtype: str = 'float32'):
+        """
+        Initialize the EmbeddingStore.
+
+        Args:
+            store_dir: Directory holding the shards and index
+            model_name: Embedding model name (part of every key)
+            max_length: Model maximum sequence length (part of every key)
+            dtype: Storage dtype for new shards ('float32' or 'float16')
+        """
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"Unsupported embedding store dtype: {dtype}")
+
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.model_name = model_name
+        self.max_length = max_length
+        self.dtype = dtype
+
+        self.manifest = self._load_manifest()
+        self._index_keys: Optional[np.ndarray] = None
+        self._index_rows: Optional[np.ndarray] = None
+        self._shards: Dict[str, np.ndarray] = {}
+
+    def _load_manifest(self) -> Dict:
+        manifest_path = self.store_dir / MANIFEST_FILE
+        if manifest_path.exists():
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('model_name') != self.model_name or manifest.get('max_length') != self.max_length:
+                raise ValueError(f"Embedding store {self.store_dir} belongs to "
+                                 f"{manifest.get('model_name')} (max_length={manifest.get('max_length')})")
+            return manifest
+
+        return {
+            'model_name': self.model_name,
+            'max_length': self.max_length,
+            'dimension': None,
+            'shards': []
+        }
+
+    def _save_manifest(self):
+        manifest_path = self.store_dir / MANIFEST_FILE
+        tmp_path = manifest_path.with_name(MANIFEST_FILE + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_path, manifest_path)
+
+    def __len__(self) -> int:
+        return sum(shard['rows'] for shard in self.manifest['shards'])
+
+    @property
+    def dimension(self) -> Optional[int]:
+        return self.manifest['dimension']
+
+    def _index(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Sorted keys and global rows, memory-mapped from disk."""
+        if self._index_keys is None:
+            keys_path = self.store_dir / INDEX_KEYS_FILE
+            if keys_path.exists():
+                self._index_keys = np.load(keys_path, mmap_mode='r')
+                self._index_rows = np.load(self.store_dir / INDEX_ROWS_FILE, mmap_mode='r')
+                # Rows beyond the manifest's shards (an interrupted append) are not stored
+                valid = self._index_rows < len(self)
+                if not valid.all():
+                    logger.warning(f"Dropping {int((~valid).sum())} index entries without stored embeddings")
+                    self._index_keys = np.asarray(self._index_keys)[valid]
+                    self._index_rows = np.asarray(self._index_rows)[valid]
+            else:
+                self._index_keys = np.empty(0, dtype=KEY_DTYPE)
+                self._index_rows = np.empty(0, dtype=np.int64)
+        return self._index_keys, self._index_rows
+
+    def _shard(self, name: str) -> np.ndarray:
+        if name not in self._shards:
+            self._shards[name] = np.load(self.store_dir / name, mmap_mode='r')
+        return self._shards[name]
+
+    def keys(self, texts: Sequence[str]) -> np.ndarray:
+        """Compute store keys for preprocessed texts."""
+        return np.array([text_key(self.model_name, self.max_length, text) for text in texts], dtype=KEY_DTYPE)
+
+    def lookup(self, keys: np.ndarray) -> np.ndarray:
+        """Global row number for each key, or -1 if it is not stored."""
+        index_keys, index_rows = self._index()
+        rows = np.full(len(keys), -1, dtype=np.int64)
+        if len(index_keys) == 0 or len(keys) == 0:
+            return rows
+
+        positions = np.searchsorted(index_keys, keys)
+        in_range = positions < len(index_keys)
+        found = np.zeros(len(keys), dtype=bool)
+        found[in_range] = index_keys[positions[in_range]] == keys[in_range]
+        rows[found] = index_rows[positions[found]]
+        return rows
+
+    def get_rows(self, rows: np.ndarray) -> np.ndarray:
+        """Gather stored embeddings by global row number as a float32 array."""
+        output = np.zeros((len(rows), self.dimension or 0), dtype=np.float32)
+        start = 0
+        for shard in self.manifest['shards']:
+            end = start + shard['rows']
+            selected = np.flatnonzero((rows >= start) & (rows < end))
+            if len(selected):
+                output[selected] = self._shard(shard['file'])[rows[selected] - start]
+            start = end
+        return output
+
+    def append(self, keys: np.ndarray, embeddings: np.ndarray) -> np.ndarray:
+        """
+        Append embeddings for new keys as a new shard and merge them into the index.
+
+        Returns:
+            Global row numbers of the appended embeddings
+        """
+        if len(keys) == 0:
+            return np.empty(0, dtype=np.int64)
+        if self.dimension is None:
+            self.manifest['dimension'] = int(embeddings.shape[1])
+        elif embeddings.shape[1] != self.dimension:
+            raise ValueError(f"Embedding dimension {embeddings.shape[1]} does not match store ({self.dimension})")
+
+        first_row = len(self)
+        shard_file = f"shard_{len(self.manifest['shards']):05d}.npy"
+        _atomic_save(self.store_dir / shard_file, np.ascontiguousarray(embeddings, dtype=self.dtype))
+
+        index_keys, index_rows = self._index()
+        new_rows = np.arange(first_row, first_row + len(keys), dtype=np.int64)
+        merged_keys = np.concatenate([np.asarray(index_keys), keys])
+        merged_rows = np.concatenate([np.asarray(index_rows), new_rows])
+        order = np.argsort(merged_keys, kind='stable')
+
+        # The shard is registered before it is indexed: an interrupted append leaves
+        # unindexed rows, never index entries pointing past the stored shards
+        self.manifest['shards'].append({'file': shard_file, 'rows': len(keys), 'dtype': self.dtype})
+        self._save_manifest()
+
+        # Release memory maps before replacing the index files
+        self._index_keys = self._index_rows = None
+        _atomic_save(self.store_dir / INDEX_KEYS_FILE, merged_keys[order])
+        _atomic_save(self.store_dir / INDEX_ROWS_FILE, merged_rows[order])
+        return new_rows
+
+    def embed(self, texts: Sequence[str], encode: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """
+        Get embeddings for preprocessed texts, encoding only those not yet stored.
+
+        Empty texts are never encoded and get all-zero rows, so the result is always
+        row-aligned with `texts`.
+
+        Args:
+            texts: Preprocessed texts
+            encode: Callable mapping a list of texts to an embedding array
+
+        Returns:
+            float32 array of shape (len(texts), dimension)
+        """
+        texts = list(texts)
+        non_empty = np.array([bool(text.strip()) for text in texts], dtype=bool)
+        keys = self.keys([texts[i] for i in np.flatnonzero(non_empty)])
+
+        unique_keys, first_index, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        rows = self.lookup(unique_keys)
+
+        missing = np.flatnonzero(rows < 0)
+        if len(missing):
+            non_empty_texts = [texts[i] for i in np.flatnonzero(non_empty)]
+            missing_texts = [non_empty_texts[first_index[i]] for i in missing]
+            logger.info(f"Encoding {len(missing_texts)} new texts "
+                        f"({len(unique_keys) - len(missing)} of {len(unique_keys)} unique texts cached)")
+            rows[missing] = self.append(unique_keys[missing], np.asarray(encode(missing_texts)))
+        else:
+            logger.info(f"All {len(unique_keys)} unique texts found in embedding store")
+
+        output = np.zeros((len(texts), self.dimension or 0), dtype=np.float32)
+        if len(unique_keys):
+            output[non_empty] = self.get_rows(rows)[inverse]
+        return output
+
+
+def _snapshot_paths(path: Union[str, Path]) -> Tuple[Path, Path, Path]:
+    """Data, sidecar and int8 scale file paths for a snapshot path (suffix ignored)."""
+    path = Path(path)
+    stem = path.with_suffix('') if path.suffix in ('.npy', '.json') else path
+    return (stem.with_name(stem.name + '.npy'),
+            stem.with_name(stem.name + '.json'),
+            stem.with_name(stem.name + '.scales.npy'))
+
+
+def save_embeddings(path: Union[str, Path], embeddings: np.ndarray, model_name: Optional[str] = None,
+                    row_ids: Optional[Sequence[Any]] = None, dtype: str = 'float32',
+                    metadata: Optional[Dict[str, Any]] = None) -> Path:
+    """
+    Save an embedding matrix as a raw .npy file with a JSON sidecar.
+
+    Args:
+        path: Snapshot path; '<path>.npy' and '<path>.json' are written
+        embeddings: 2-D embedding matrix
+        model_name: Name of the model that produced the embeddings
+        row_ids: Optional identifiers (e.g. publication IDs), one per row
+        dtype: Storage dtype: 'float32', 'float16' or 'int8' (per-row symmetric quantization)
+        metadata: Extra JSON-serializable metadata to store in the sidecar
+
+    Returns:
+        Path of the .npy data file
+    """
+    if dtype not in SNAPSHOT_DTYPES:
+        raise ValueError(f"Unsupported snapshot dtype: {dtype}")
+    embeddings = np.asarray(embeddings)
+    if embeddings.ndim != 2:
+        raise ValueError("Embeddings must be a 2-D array")
+    if row_ids is not None and len(row_ids) != len(embeddings):
+        raise ValueError(f"Got {len(row_ids)} row IDs for {len(embeddings)} embeddings")
+
+    data_path, sidecar_path, scales_path = _snapshot_paths(path)
+    data_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if dtype == 'int8':
+        scales = np.abs(embeddings).max(axis=1).astype(np.float32) / 127
+        scales[scales == 0] = 1
+        data = np.round(embeddings / scales[:, None]).astype(np.int8)
+        _atomic_save(scales_path, scales)
+    else:
+        data = np.ascontiguousarray(embeddings, dtype=dtype)
+    _atomic_save(data_path, data)
+
+    sidecar = dict(metadata or {})
+    sidecar.update({
+        'model_name': model_name,
+        'rows': int(embeddings.shape[0]),
+        'dimension': int(embeddings.shape[1]),
+        'dtype': dtype,
+        'row_ids': [str(row_id) for row_id in row_ids] if row_ids is not None else None
+    })
+    tmp_path = sidecar_path.with_name(sidecar_path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(sidecar, f)
+    os.replace(tmp_path, sidecar_path)
+
+    return data_path
+
+
+def load_embeddings(path: Union[str, Path], mmap: bool = True,
+                    dequantize: bool = True) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """
+    Load an embedding snapshot written by `save_embeddings`.
+
+    float32/float16 snapshots are returned as read-only memory-mapped views (no copy).
+    int8 snapshots are dequantized to float32 unless `dequantize` is False, in which
+    case the raw int8 view is returned and the scales are in metadata['scales'].
+
+    Returns:
+        Tuple of (embeddings, sidecar metadata)
+    """
+    data_path, sidecar_path, scales_path = _snapshot_paths(path)
+    with open(sidecar_path, 'r', encoding='utf-8') as f:
+        metadata = json.load(f)
+
+    embeddings = np.load(data_path, mmap_mode='r' if mmap else None)
+    if metadata.get('dtype') == 'int8':
+        scales = np.load(scales_path)
+        if dequantize:
+            embeddings = embeddings.astype(np.float32) * scales[:, None]
+        else:
+            metadata['scales'] = scales
+
+    return embeddings, metadata
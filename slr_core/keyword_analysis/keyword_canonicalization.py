@@ -0,0 +1,171 @@
+"""
+Keyword Canonicalization
+
+API, TF-IDF, RAKE and YAKE keywords contain many near-synonyms ("supply chain",
+"supply chains", "supply-chain management"). This module merges them into one
+canonical keyword per group, in two passes:
+
+1. Lexical: keywords with the same lexical key (hyphens/underscores as spaces,
+   simple plural endings removed) are merged without any embedding.
+2. Semantic: one representative per lexical group is embedded, and
+   representatives are linked in a sparse cosine kNN graph when their
+   similarity reaches a threshold. Connected components become synonym groups.
+
+The most frequent keyword of a group is its canonical form. Members that are
+less similar to the canonical keyword than the threshold (chained in through
+other members) are kept as their own keyword.
+
+The resulting synonym map (variant -> canonical) is applied to keyword
+DataFrames and extraction results before frequency, temporal and visualization
+stages, which shrinks the vocabulary every per-keyword loop runs over.
+"""
+
+import logging
+import re
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy.sparse.csgraph import connected_components
+
+from .scalable_clustering import build_knn_graph
+from .vector_index import _normalize
+
+logger = logging.getLogger(__name__)
+
+_SEPARATORS = re.compile(r'[\s\-_/]+')
+_PLURAL = re.compile(r'(?<=[a-z]{3})(?<!s)s$')
+
+
+def lexical_key(keyword: str) -> str:
+    """Spelling-insensitive key: lowercase, separators as single spaces, plural 's' removed per word."""
+    words = _SEPARATORS.split(str(keyword).lower().strip())
+    return ' '.join(_PLURAL.sub('', word) for word in words if word)
+
+
+def _canonical_order(keywords: Sequence[str], frequencies: np.ndarray) -> np.ndarray:
+    """Order by descending frequency, then shorter, then alphabetical."""
+    lengths = np.array([len(keyword) for keyword in keywords])
+    return np.lexsort((np.asarray(keywords, dtype=object).astype(str), lengths, -frequencies))
+
+
+def build_synonym_map(keywords: Sequence[str],
+                      embed_fn: Optional[Callable[[List[str]], np.ndarray]] = None,
+                      frequencies: Optional[Mapping[str, float]] = None,
+                      similarity_threshold: float = 0.9,
+                      n_neighbors: int = 10,
+                      backend: str = 'auto') -> Dict[str, Any]:
+    """
+    Group near-synonym keywords and map each variant to its canonical keyword.
+
+    Args:
+        keywords: Keywords (duplicates are counted when no frequencies are given)
+        embed_fn: Callable returning one embedding row per keyword; without it
+            only lexical merging is done
+        frequencies: Optional keyword -> frequency, used to choose canonical forms
+        similarity_threshold: Minimum cosine similarity of synonyms
+        n_neighbors: Neighbours per keyword in the kNN graph
+        backend: kNN backend ('auto', 'hnswlib', 'faiss', 'numpy')
+
+    Returns:
+        Dictionary with 'synonym_map' (variant -> canonical, only for merged
+        variants), 'groups' (canonical -> variants, groups of two or more) and
+        vocabulary sizes before and after canonicalization
+    """
+    counts = pd.Series(list(keywords), dtype=object).dropna().astype(str)
+    counts = counts[counts.str.strip() != ''].value_counts()
+    if frequencies is not None:
+        counts = pd.Series({keyword: frequencies.get(keyword, count) for keyword, count in counts.items()},
+                           dtype=float)
+
+    unique = counts.index.to_numpy(dtype=object)
+    if len(unique) == 0:
+        return {'synonym_map': {}, 'groups': {}, 'n_keywords': 0, 'n_canonical': 0}
+    freq = counts.to_numpy(dtype=float)
+
+    # Pass 1: lexical groups, represented by their most frequent variant
+    order = _canonical_order(unique, freq)
+    keys = pd.Series([lexical_key(keyword) for keyword in unique[order]])
+    lexical_group = keys.factorize()[0]
+    representatives = order[np.unique(lexical_group, return_index=True)[1]]
+    group_of = np.empty(len(unique), dtype=np.int64)
+    group_of[order] = lexical_group
+    group_freq = np.bincount(group_of, weights=freq)
+
+    # Pass 2: semantic groups of lexical representatives
+    semantic_group = np.arange(len(representatives))
+    if embed_fn is not None and len(representatives) > 1:
+        vectors = _normalize(np.asarray(embed_fn([str(unique[i]) for i in representatives]), dtype=np.float32))
+        graph = build_knn_graph(vectors, n_neighbors=n_neighbors, backend=backend)
+        graph.data[graph.data > 1 - similarity_threshold] = 0
+        graph.eliminate_zeros()
+        _, components = connected_components(graph, directed=False)
+
+        # Canonical representative of each component: highest combined lexical-group frequency
+        rep_order = _canonical_order([str(unique[i]) for i in representatives], group_freq)
+        first = np.unique(components[rep_order], return_index=True)[1]
+        canonical_of_component = np.empty(components.max() + 1, dtype=np.int64)
+        canonical_of_component[components[rep_order[first]]] = rep_order[first]
+        semantic_group = canonical_of_component[components]
+
+        # Members chained in below the threshold stay on their own
+        similarity_to_canonical = np.einsum('ij,ij->i', vectors, vectors[semantic_group])
+        detached = similarity_to_canonical < similarity_threshold
+        semantic_group[detached] = np.flatnonzero(detached)
+
+    canonical = unique[representatives[semantic_group[group_of]]]
+    synonym_map = {str(variant): str(target) for variant, target in zip(unique, canonical) if variant != target}
+
+    groups: Dict[str, List[str]] = {}
+    for variant, target in synonym_map.items():
+        groups.setdefault(target, [target]).append(variant)
+
+    n_canonical = len(np.unique(canonical.astype(str)))
+    logger.info(f"Canonicalized {len(unique)} keywords into {n_canonical} "
+                f"({len(synonym_map)} variants merged into {len(groups)} groups)")
+    return {
+        'synonym_map': synonym_map,
+        'groups': groups,
+        'n_keywords': int(len(unique)),
+        'n_canonical': int(n_canonical)
+    }
+
+
+def apply_synonym_map_to_frame(keywords_df: pd.DataFrame, synonym_map: Mapping[str, str],
+                               column: str = 'keyword', dedupe_on: Optional[str] = 'publication_id') -> pd.DataFrame:
+    """
+    Replace keyword variants with their canonical keyword.
+
+    The original spelling is kept in `original_<column>`. When `dedupe_on` is a
+    column, a publication listing several variants of one keyword keeps a
+    single row, so frequencies count publications rather than spellings.
+    """
+    if keywords_df.empty or column not in keywords_df.columns or not synonym_map:
+        return keywords_df
+
+    result = keywords_df.copy()
+    result[f'original_{column}'] = result[column]
+    result[column] = result[column].map(synonym_map).fillna(result[column])
+
+    if dedupe_on and dedupe_on in result.columns:
+        result = result.drop_duplicates(subset=[dedupe_on, column]).reset_index(drop=True)
+    return result
+
+
+def apply_synonym_map_to_results(extraction: Dict[str, Any], synonym_map: Mapping[str, str]) -> Dict[str, Any]:
+    """
+    Canonicalize an extraction result ({'keywords': [{'keyword', 'score'}, ...]}).
+
+    Merged variants keep the entry with the best score (the lowest for YAKE,
+    the highest otherwise).
+    """
+    if not synonym_map or not extraction.get('keywords'):
+        return extraction
+
+    sign = -1 if extraction.get('method') == 'yake' else 1
+    merged: Dict[str, Dict[str, Any]] = {}
+    for item in extraction['keywords']:
+        keyword = synonym_map.get(item['keyword'], item['keyword'])
+        if keyword not in merged or sign * item.get('score', 0) > sign * merged[keyword].get('score', 0):
+            merged[keyword] = {**item, 'keyword': keyword}
+    return {**extraction, 'keywords': list(merged.values())}
@@ -5,22 +5,21 @@ This module handles:
 1. Extraction of existing keywords provided by academic APIs
 2. NLP-based keyword extraction using TF-IDF, RAKE, and YAKE
 3. Frequency analysis and temporal distribution tracking
+4. Keyword co-occurrence networks and their evolution over time
 """
 
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any, Optional, Union, Tuple
+from typing import List, Dict, Any, FrozenSet, Optional, Union, Tuple
 import re
 from collections import Counter, defaultdict
+from functools import lru_cache
 import logging
 
 # NLP Libraries
 import nltk
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize, sent_tokenize
 from nltk.stem import WordNetLemmatizer
-from nltk.chunk import ne_chunk
-from nltk.tag import pos_tag
 
 # Keyword extraction libraries
 try:
@@ -34,11 +33,71 @@ except ImportError:
     Rake = None
 
 # Scikit-learn for TF-IDF
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, TfidfVectorizer
 
 # Configuration
 from ..config_manager import ConfigManager
+from .cooccurrence import build_network, network_snapshots, publication_keyword_matrix
+from .date_normalization import add_date_columns, format_period_labels, normalize_dates, parse_date
+from .keyword_canonicalization import apply_synonym_map_to_frame, apply_synonym_map_to_results
+from .text_preprocessing import clean_keyword, clean_keywords, preprocess_for_keywords, preprocess_for_keywords_batch
+
+# Quoted items of a stringified Python list, e.g. "['supply chain', \"children's\"]"
+STRINGIFIED_ITEM_PATTERN = re.compile(r"'((?:[^'\\]|\\.)*)'|\"((?:[^\"\\]|\\.)*)\"")
+ESCAPE_PATTERN = re.compile(r'\\(.)')
+
+# Sentence splitting for RAKE when the NLTK punkt tokenizer data is not installed
+SENTENCE_BOUNDARY_PATTERN = re.compile(r'(?<=[.!?;])\s+')
+
+# NLTK data used by the extractor: resource path -> download package
+NLTK_RESOURCES = {
+    'corpora/stopwords': 'stopwords',
+    'tokenizers/punkt_tab': 'punkt_tab'  # RAKE sentence splitting
+}
+
+DOMAIN_STOP_WORDS = frozenset({
+    'paper', 'article', 'study', 'research', 'analysis', 'approach',
+    'method', 'result', 'conclusion', 'abstract', 'introduction',
+    'literature', 'review', 'survey', 'work', 'works', 'author',
+    'authors', 'et', 'al', 'also', 'however', 'therefore', 'thus',
+    'furthermore', 'moreover', 'additionally', 'finally'
+})
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def nltk_resource_available(resource: str) -> bool:
+    """Check for local NLTK data without any network access (cached per process)."""
+    try:
+        nltk.data.find(resource)
+        return True
+    except LookupError:
+        return False
+
+
+def download_missing_nltk_data():
+    """Download only the NLTK data packages that are not installed locally."""
+    for resource, package in NLTK_RESOURCES.items():
+        if not nltk_resource_available(resource):
+            nltk.download(package, quiet=True)
+    nltk_resource_available.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def get_stop_words(language: str = 'english') -> FrozenSet[str]:
+    """
+    Stop words for keyword extraction (cached per process).
+    
+    NLTK stop words plus DOMAIN_STOP_WORDS; scikit-learn's English stop words
+    are used when the NLTK corpus is not installed.
+    """
+    if nltk_resource_available('corpora/stopwords'):
+        base = stopwords.words(language)
+    else:
+        logger.warning("NLTK stopwords not installed locally, using scikit-learn English stop words")
+        base = ENGLISH_STOP_WORDS
+    return frozenset(base) | DOMAIN_STOP_WORDS
 
 class KeywordExtractor:
     """
@@ -50,6 +109,7 @@ class KeywordExtractor:
     - RAKE (Rapid Automatic Keyword Extraction)
     - YAKE (Yet Another Keyword Extractor)
     - Frequency analysis and temporal tracking
+    - Co-occurrence networks with community detection
     """
     
     def __init__(self, config_manager: Optional[ConfigManager] = None):
@@ -67,82 +127,91 @@ class KeywordExtractor:
         self.nlp_config = self.keyword_config.get('nlp', {})
         self.output_config = self.keyword_config.get('output', {})
         
-        # Initialize NLP components
+        # NLP components; extractors are built on first use
         self._init_nltk_components()
-        self._init_extractors()
+        self._extractors: Dict[str, Any] = {}
         
     def _init_nltk_components(self):
-        """Initialize NLTK components with error handling"""
+        """Initialize NLTK components from local data (downloads only if configured)"""
         try:
-            # Download required NLTK data
-            nltk.download('punkt', quiet=True)
-            nltk.download('stopwords', quiet=True)  
-            nltk.download('wordnet', quiet=True)
-            nltk.download('averaged_perceptron_tagger', quiet=True)
-            nltk.download('maxent_ne_chunker', quiet=True)
-            nltk.download('words', quiet=True)
-            
-            self.stop_words = set(stopwords.words('english'))
-            self.lemmatizer = WordNetLemmatizer()
-            
-            # Add domain-specific stop words
-            domain_stop_words = {
-                'paper', 'article', 'study', 'research', 'analysis', 'approach',
-                'method', 'result', 'conclusion', 'abstract', 'introduction',
-                'literature', 'review', 'survey', 'work', 'works', 'author',
-                'authors', 'et', 'al', 'also', 'however', 'therefore', 'thus',
-                'furthermore', 'moreover', 'additionally', 'finally'
-            }
-            self.stop_words.update(domain_stop_words)
+            if self.nlp_config.get('download_nltk_data', False):
+                download_missing_nltk_data()
+            
+            # Copy of the shared per-process set, so callers may extend it
+            self.stop_words = set(get_stop_words('english'))
             
         except Exception as e:
             self.logger.warning(f"Error initializing NLTK components: {e}")
             self.stop_words = set()
-            self.lemmatizer = None
     
-    def _init_extractors(self):
-        """Initialize keyword extraction algorithms"""
-        # Initialize TF-IDF vectorizer
-        tfidf_config = self.nlp_config.get('tfidf', {})
-        self.tfidf_vectorizer = TfidfVectorizer(
-            ngram_range=tuple(tfidf_config.get('ngram_range', [1, 3])),
-            max_features=tfidf_config.get('max_features', 1000),
-            min_df=tfidf_config.get('min_df', 2),
-            max_df=tfidf_config.get('max_df', 0.85),
-            stop_words=list(self.stop_words) if self.stop_words else 'english',
-            lowercase=True,
-            token_pattern=r'\b[a-zA-Z][a-zA-Z]+\b'  # Only alphabetic tokens
-        )
-        
-        # Initialize RAKE
-        if Rake is not None:
-            rake_config = self.nlp_config.get('rake', {})
-            self.rake = Rake(
-                min_length=rake_config.get('min_length', 1),
-                max_length=rake_config.get('max_length', 4),
-                stopwords=self.stop_words if self.stop_words else None
-            )
-        else:
-            self.rake = None
-            self.logger.warning("RAKE not available. Install rake-nltk package.")
-            
-        # Initialize YAKE
-        if yake is not None:
-            yake_config = self.nlp_config.get('yake', {})
-            self.yake_extractor = yake.KeywordExtractor(
-                lan=yake_config.get('language', 'en'),
-                n=yake_config.get('max_ngram_size', 3),
-                dedupLim=yake_config.get('deduplication_threshold', 0.7),
-                top=yake_config.get('num_keywords', 20)
+    @property
+    def lemmatizer(self) -> Optional[WordNetLemmatizer]:
+        """WordNet lemmatizer, if the WordNet corpus is installed"""
+        if 'lemmatizer' not in self._extractors:
+            self._extractors['lemmatizer'] = WordNetLemmatizer() if nltk_resource_available('corpora/wordnet') else None
+        return self._extractors['lemmatizer']
+    
+    @property
+    def tfidf_vectorizer(self) -> TfidfVectorizer:
+        """TF-IDF vectorizer"""
+        if 'tfidf' not in self._extractors:
+            tfidf_config = self.nlp_config.get('tfidf', {})
+            self._extractors['tfidf'] = TfidfVectorizer(
+                ngram_range=tuple(tfidf_config.get('ngram_range', [1, 3])),
+                max_features=tfidf_config.get('max_features', 1000),
+                min_df=tfidf_config.get('min_df', 2),
+                max_df=tfidf_config.get('max_df', 0.85),
+                stop_words=list(self.stop_words) if self.stop_words else 'english',
+                lowercase=True,
+                token_pattern=r'\b[a-zA-Z][a-zA-Z]+\b'  # Only alphabetic tokens
             )
-        else:
-            self.yake_extractor = None
-            self.logger.warning("YAKE not available. Install yake package.")
+        return self._extractors['tfidf']
+    
+    @property
+    def rake(self) -> Optional[Any]:
+        """RAKE extractor, or None if rake-nltk is not installed"""
+        if 'rake' not in self._extractors:
+            if Rake is not None:
+                rake_config = self.nlp_config.get('rake', {})
+                # Stop words are always passed, so RAKE does not load the NLTK corpus itself
+                self._extractors['rake'] = Rake(
+                    min_length=rake_config.get('min_length', 1),
+                    max_length=rake_config.get('max_length', 4),
+                    stopwords=self.stop_words or set(ENGLISH_STOP_WORDS),
+                    sentence_tokenizer=None if nltk_resource_available('tokenizers/punkt_tab')
+                    else SENTENCE_BOUNDARY_PATTERN.split
+                )
+            else:
+                self._extractors['rake'] = None
+                self.logger.warning("RAKE not available. Install rake-nltk package.")
+        return self._extractors['rake']
+    
+    @property
+    def yake_extractor(self) -> Optional[Any]:
+        """YAKE extractor, or None if yake is not installed"""
+        if 'yake' not in self._extractors:
+            if yake is not None:
+                yake_config = self.nlp_config.get('yake', {})
+                self._extractors['yake'] = yake.KeywordExtractor(
+                    lan=yake_config.get('language', 'en'),
+                    n=yake_config.get('max_ngram_size', 3),
+                    dedupLim=yake_config.get('deduplication_threshold', 0.7),
+                    top=yake_config.get('num_keywords', 20)
+                )
+            else:
+                self._extractors['yake'] = None
+                self.logger.warning("YAKE not available. Install yake package.")
+        return self._extractors['yake']
 
     def extract_api_keywords(self, publications_df: pd.DataFrame) -> pd.DataFrame:
         """
         Extract keywords that are already provided by academic APIs
         
+        The 'keywords' column may hold lists, comma/semicolon/pipe-separated
+        strings or stringified Python lists (CSV exports); 'fieldsOfStudy' lists
+        or comma-separated strings are added as well. Each distinct keyword string
+        is split and cleaned once, and the results are exploded to all rows.
+        
         Args:
             publications_df: DataFrame with publication metadata
             
@@ -151,72 +220,103 @@ class KeywordExtractor:
         """
         if publications_df.empty:
             return pd.DataFrame()
-            
-        api_keywords_data = []
-        
-        for idx, row in publications_df.iterrows():
-            # Extract keywords from the API-provided keywords field
-            api_keywords = []
-            
-            # Handle different keyword field formats
-            try:
-                if 'keywords' in publications_df.columns and row['keywords'] is not None and str(row['keywords']) != 'nan':
-                    keywords_raw = row['keywords']
-                    
-                    if isinstance(keywords_raw, list):
-                        api_keywords = [str(kw).strip() for kw in keywords_raw if kw is not None and str(kw).strip()]
-                    elif isinstance(keywords_raw, str):
-                        # Handle comma-separated, semicolon-separated, or pipe-separated
-                        for sep in [',', ';', '|']:
-                            if sep in keywords_raw:
-                                api_keywords = [kw.strip() for kw in keywords_raw.split(sep) if kw.strip()]
-                                break
-                        if not api_keywords:
-                            api_keywords = [keywords_raw.strip()]
-            except Exception as e:
-                self.logger.warning(f"Error extracting API keywords from row {idx}: {e}")
-                api_keywords = []
-            
-            # Also extract from fieldsOfStudy if available (OpenAlex, Semantic Scholar)
-            if 'fieldsOfStudy' in publications_df.columns and not pd.isna(row['fieldsOfStudy']):
-                fields = row['fieldsOfStudy']
-                if isinstance(fields, list):
-                    api_keywords.extend([str(field).strip() for field in fields if field is not None and str(field).strip()])
-                elif isinstance(fields, str):
-                    api_keywords.extend([field.strip() for field in fields.split(',') if field.strip()])
-            
-            # Clean and normalize keywords
-            cleaned_keywords = []
-            for kw in api_keywords:
-                kw_clean = self._clean_keyword(kw)
-                if kw_clean and len(kw_clean) > 2:  # Filter very short keywords
-                    cleaned_keywords.append(kw_clean)
-            
-            # Add to results
-            for keyword in cleaned_keywords:
-                api_keywords_data.append({
-                    'publication_id': idx,
-                    'doi': row.get('doi', ''),
-                    'title': row.get('title', ''),
-                    'publication_date': row.get('publication_date', ''),
-                    'source': row.get('source', ''),
-                    'keyword': keyword,
-                    'extraction_method': 'api_provided',
-                    'keyword_type': 'api'
-                })
-        
-        api_keywords_df = pd.DataFrame(api_keywords_data)
-        
-        if not api_keywords_df.empty:
-            # Add year column for temporal analysis
-            api_keywords_df['year'] = api_keywords_df['publication_date'].apply(
-                self._extract_year_from_date
-            )
-            
-            self.logger.info(f"Extracted {len(api_keywords_df)} API-provided keywords from {len(publications_df)} publications")
+        
+        parts = []
+        if 'keywords' in publications_df.columns:
+            parts.append(self._explode_keyword_column(publications_df['keywords'], [',', ';', '|']))
+        if 'fieldsOfStudy' in publications_df.columns:
+            parts.append(self._explode_keyword_column(publications_df['fieldsOfStudy'], [',']))
+        
+        # Long format (publication row, keyword), keywords before fields of study
+        keywords = pd.concat(parts).sort_index(kind='stable') if parts else pd.Series([], dtype=object)
+        if keywords.empty:
+            return pd.DataFrame()
+        rows = keywords.index.to_numpy()
+        
+        def column_values(column: str) -> np.ndarray:
+            if column in publications_df.columns:
+                return publications_df[column].to_numpy(dtype=object)[rows]
+            return np.full(len(rows), '', dtype=object)
+        
+        api_keywords_df = pd.DataFrame({
+            'publication_id': publications_df.index.to_numpy()[rows],
+            'doi': column_values('doi'),
+            'title': column_values('title'),
+            'publication_date': column_values('publication_date'),
+            'source': column_values('source'),
+            'keyword': keywords.to_numpy(dtype=object),
+            'extraction_method': 'api_provided',
+            'keyword_type': 'api'
+        })
+        
+        # Add integer year/month/quarter columns for temporal analysis (parsed once per publication)
+        if 'publication_date' in publications_df.columns:
+            dates = normalize_dates(publications_df['publication_date'].reset_index(drop=True))
+            date_columns = dates.iloc[rows].reset_index(drop=True)
+        else:
+            date_columns = normalize_dates(api_keywords_df['publication_date'])
+        api_keywords_df = pd.concat([api_keywords_df, date_columns], axis=1)
+        
+        self.logger.info(f"Extracted {len(api_keywords_df)} API-provided keywords from {len(publications_df)} publications")
         
         return api_keywords_df
     
+    def _explode_keyword_column(self, values: pd.Series, separators: List[str]) -> pd.Series:
+        """
+        Split and clean a keyword column into one keyword per element
+        
+        Each distinct string is split and cleaned once; the results are broadcast
+        back to all rows holding it.
+        
+        Args:
+            values: Column of lists, delimited strings or stringified lists
+            separators: Candidate separators for plain strings; the first one
+                present in a string is used
+            
+        Returns:
+            Series of cleaned keywords (longer than 2 characters) indexed by
+            publication row position, in their original order within each row
+        """
+        values = pd.Series(values.to_numpy(dtype=object))
+        is_list = values.map(lambda value: isinstance(value, (list, tuple, np.ndarray)))
+        is_string = values.map(lambda value: isinstance(value, str))
+        
+        lists = clean_keywords(values[is_list].explode().dropna().astype(str))
+        
+        strings = values[is_string]
+        codes, uniques = pd.factorize(strings)
+        split_uniques = [self._split_keyword_string(text, separators) for text in uniques]
+        
+        # Broadcast each distinct string's keywords to its rows
+        lengths = np.fromiter(map(len, split_uniques), dtype=np.int64, count=len(split_uniques))
+        flat = np.array([keyword for keywords in split_uniques for keyword in keywords], dtype=object)
+        row_lengths = lengths[codes]
+        starts = np.repeat((np.cumsum(lengths) - lengths)[codes], row_lengths)
+        within = np.arange(row_lengths.sum()) - np.repeat(np.cumsum(row_lengths) - row_lengths, row_lengths)
+        split = pd.Series(flat[starts + within], index=np.repeat(strings.index.to_numpy(), row_lengths), dtype=object)
+        
+        return pd.concat([lists[lists.str.len() > 2], split]).sort_index(kind='stable')
+    
+    def _split_keyword_string(self, text: str, separators: List[str]) -> List[str]:
+        """Split one delimited string or stringified list into cleaned keywords"""
+        text = text.strip()
+        if text == 'nan':
+            return []
+        
+        if text.startswith('[') and text.endswith(']'):
+            # Stringified Python list: quoted items ('...' or "...")
+            items = [ESCAPE_PATTERN.sub(r'\1', single or double)
+                     for single, double in STRINGIFIED_ITEM_PATTERN.findall(text)]
+        else:
+            items = [text]
+            for separator in separators:
+                if separator in text:
+                    items = text.split(separator)
+                    break
+        
+        keywords = [clean_keyword(item) for item in items]
+        return [keyword for keyword in keywords if len(keyword) > 2]  # Filter very short keywords
+    
     def extract_nlp_keywords(self, 
                            texts: List[str], 
                            method: str = 'tfidf',
@@ -236,7 +336,7 @@ class KeywordExtractor:
             return {'keywords': [], 'method': method, 'metadata': {}}
         
         # Clean texts
-        cleaned_texts = [self._preprocess_text(text) for text in texts if text and not pd.isna(text)]
+        cleaned_texts = [text for text in preprocess_for_keywords_batch(texts) if text]
         
         if method == 'all':
             # Extract using all available methods
@@ -389,10 +489,43 @@ class KeywordExtractor:
             self.logger.error(f"Error in YAKE extraction: {e}")
             return {'keywords': [], 'method': 'yake', 'metadata': {'error': str(e)}}
     
+    def apply_synonym_map(self, keywords_data: Union[pd.DataFrame, Dict], 
+                          synonym_map: Dict[str, str]) -> Union[pd.DataFrame, Dict]:
+        """
+        Replace keyword variants with their canonical keywords
+        
+        Apply before frequency, temporal and visualization stages so they run over
+        the deduplicated vocabulary (see SemanticAnalyzer.build_keyword_synonym_map).
+        
+        Args:
+            keywords_data: Keywords DataFrame, extraction result dictionary, or the
+                per-method dictionary returned by extract_nlp_keywords(method='all')
+            synonym_map: Variant -> canonical keyword mapping
+            
+        Returns:
+            Canonicalized keywords in the same form as keywords_data; DataFrames keep
+            the original spelling in 'original_keyword' and one row per publication
+            and keyword
+        """
+        if isinstance(keywords_data, pd.DataFrame):
+            return apply_synonym_map_to_frame(keywords_data, synonym_map)
+        
+        if isinstance(keywords_data, dict):
+            if 'keywords' in keywords_data:
+                return apply_synonym_map_to_results(keywords_data, synonym_map)
+            return {method: self.apply_synonym_map(results, synonym_map) 
+                    for method, results in keywords_data.items()}
+        
+        return keywords_data
+    
     def calculate_keyword_frequencies(self, keywords_data: Union[pd.DataFrame, Dict]) -> pd.DataFrame:
         """
         Calculate frequency statistics for extracted keywords
         
+        For keyword DataFrames, frequency, first extraction method and year
+        statistics (year_span, first_year, last_year) come from a single groupby
+        aggregation; per-period counts are in analyze_temporal_distribution.
+        
         Args:
             keywords_data: Keywords DataFrame or dictionary from extraction methods
             
@@ -424,31 +557,25 @@ class KeywordExtractor:
             if 'keyword' not in keywords_data.columns:
                 return pd.DataFrame()
             
-            freq_counts = keywords_data['keyword'].value_counts()
-            freq_df = pd.DataFrame({
-                'keyword': freq_counts.index,
-                'frequency': freq_counts.values
-            })
-            
-            # Add additional statistics if available
+            # One aggregation pass over all keywords
+            aggregations = {'frequency': ('keyword', 'size')}
             if 'extraction_method' in keywords_data.columns:
-                method_info = keywords_data.groupby('keyword')['extraction_method'].first()
-                freq_df['method'] = freq_df['keyword'].map(method_info)
-            
+                aggregations['method'] = ('extraction_method', 'first')
             if 'year' in keywords_data.columns:
-                # Add temporal frequency information
-                year_info = keywords_data.groupby('keyword')['year'].apply(list)
-                freq_df['years'] = freq_df['keyword'].map(year_info)
-                freq_df['year_span'] = freq_df['years'].apply(lambda x: len(set(x)) if x else 0)
-                freq_df['first_year'] = freq_df['years'].apply(lambda x: min(x) if x else None)
-                freq_df['last_year'] = freq_df['years'].apply(lambda x: max(x) if x else None)
+                # Temporal frequency information
+                aggregations['year_span'] = ('year', 'nunique')
+                aggregations['first_year'] = ('year', 'min')
+                aggregations['last_year'] = ('year', 'max')
+            
+            freq_df = keywords_data.groupby('keyword', sort=False).agg(**aggregations).reset_index()
         
         else:
             return pd.DataFrame()
         
         # Sort by frequency
         if not freq_df.empty:
-            freq_df = freq_df.sort_values('frequency', ascending=False).reset_index(drop=True)
+            freq_df = freq_df.sort_values(['frequency', 'keyword'], ascending=[False, True], 
+                                          kind='stable').reset_index(drop=True)
             
             # Add relative frequency
             total_keywords = freq_df['frequency'].sum()
@@ -469,7 +596,9 @@ class KeywordExtractor:
             time_granularity: Time granularity ('year', 'quarter', 'month')
             
         Returns:
-            DataFrame with temporal distribution analysis
+            DataFrame with one row per keyword: total_frequency, active_periods,
+            first_appearance, last_appearance, peak_period, peak_frequency, followed
+            by one count column per time period (wide format)
         """
         if keywords_df.empty or 'keyword' not in keywords_df.columns:
             return pd.DataFrame()
@@ -477,7 +606,7 @@ class KeywordExtractor:
         # Ensure we have temporal information
         if 'year' not in keywords_df.columns:
             if 'publication_date' in keywords_df.columns:
-                keywords_df['year'] = keywords_df['publication_date'].apply(self._extract_year_from_date)
+                add_date_columns(keywords_df)
             else:
                 self.logger.warning("No temporal information available for temporal analysis")
                 return pd.DataFrame()
@@ -485,159 +614,161 @@ class KeywordExtractor:
         # Remove rows with missing year information
         keywords_df = keywords_df.dropna(subset=['year'])
         
-        if time_granularity == 'year':
-            time_col = 'year'
-        elif time_granularity == 'quarter':
-            keywords_df['quarter'] = keywords_df['publication_date'].apply(self._extract_quarter_from_date)
-            time_col = 'quarter'
-        elif time_granularity == 'month':
-            keywords_df['month'] = keywords_df['publication_date'].apply(self._extract_month_from_date)
-            time_col = 'month'
+        if time_granularity in ('quarter', 'month'):
+            if 'month' not in keywords_df.columns:
+                if 'publication_date' in keywords_df.columns:
+                    keywords_df['month'] = normalize_dates(keywords_df['publication_date'])['month']
+                else:
+                    keywords_df['month'] = pd.array([pd.NA] * len(keywords_df), dtype='Int64')
+            keywords_df['period'] = format_period_labels(keywords_df, time_granularity)
+            time_col = 'period'
         else:
             time_col = 'year'
         
-        # Calculate temporal distribution
-        temporal_dist = keywords_df.groupby(['keyword', time_col]).size().reset_index(name='count')
+        # Keyword x period count matrix
+        counts = keywords_df.groupby(['keyword', time_col]).size().unstack(fill_value=0)
+        periods = counts.columns.to_numpy()
+        values = counts.to_numpy()
+        active = values > 0
+        
+        # Summary statistics for all keywords at once (every keyword is active in some period)
+        last_active = values.shape[1] - 1 - active[:, ::-1].argmax(axis=1)
+        temporal_df = pd.DataFrame({
+            'keyword': counts.index.to_numpy(),
+            'total_frequency': values.sum(axis=1),
+            'active_periods': active.sum(axis=1),
+            'first_appearance': periods[active.argmax(axis=1)],
+            'last_appearance': periods[last_active],
+            'peak_period': periods[values.argmax(axis=1)],
+            'peak_frequency': values.max(axis=1)
+        })
+        
+        # Per-period counts as numeric columns (one per period)
+        temporal_df = pd.concat([temporal_df, counts.reset_index(drop=True)], axis=1)
+        temporal_df = temporal_df.sort_values('total_frequency', ascending=False, kind='stable').reset_index(drop=True)
         
-        # Pivot to get keywords as rows and time periods as columns
-        temporal_pivot = temporal_dist.pivot(index='keyword', columns=time_col, values='count').fillna(0)
+        return temporal_df
+    
+    def build_cooccurrence_network(self, keywords_df: pd.DataFrame, **kwargs) -> Dict[str, Any]:
+        """
+        Build the keyword co-occurrence network of a keywords DataFrame
         
-        # Calculate summary statistics
-        temporal_stats = []
-        for keyword in temporal_pivot.index:
-            keyword_data = temporal_pivot.loc[keyword]
-            non_zero_periods = keyword_data[keyword_data > 0]
+        Args:
+            keywords_df: Long-format keywords with 'publication_id' and 'keyword'
+                (e.g. from extract_api_keywords, canonicalized first if desired)
+            **kwargs: normalization ('association', 'jaccard', 'cosine', 'count'),
+                top_k, min_occurrences, min_cooccurrence, min_weight, communities,
+                community_method ('auto', 'louvain', 'label_propagation'),
+                resolution, random_state (default to config keyword_analysis.cooccurrence)
             
-            temporal_stats.append({
-                'keyword': keyword,
-                'total_frequency': keyword_data.sum(),
-                'active_periods': len(non_zero_periods),
-                'first_appearance': non_zero_periods.index.min() if len(non_zero_periods) > 0 else None,
-                'last_appearance': non_zero_periods.index.max() if len(non_zero_periods) > 0 else None,
-                'peak_period': non_zero_periods.idxmax() if len(non_zero_periods) > 0 else None,
-                'peak_frequency': non_zero_periods.max() if len(non_zero_periods) > 0 else 0,
-                'temporal_distribution': keyword_data.to_dict()
-            })
+        Returns:
+            Dictionary with 'nodes' and 'edges' DataFrames, sparse 'adjacency' and
+            'cooccurrence' matrices, 'keywords' (matrix order) and 'modularity'
+        """
+        try:
+            matrix, keywords, _ = self._publication_keyword_matrix(keywords_df, kwargs)
+            network = build_network(matrix, keywords, **self._cooccurrence_parameters(kwargs))
+            network['keywords'] = keywords
+            return network
+        except Exception as e:
+            self.logger.error(f"Error building co-occurrence network: {e}")
+            return {'nodes': pd.DataFrame(), 'edges': pd.DataFrame(), 'error': str(e)}
+    
+    def cooccurrence_snapshots(self, keywords_df: pd.DataFrame, 
+                             time_granularity: str = 'year', 
+                             **kwargs) -> Dict[Any, Dict[str, Any]]:
+        """
+        Build one co-occurrence network per time period
         
-        temporal_df = pd.DataFrame(temporal_stats)
-        temporal_df = temporal_df.sort_values('total_frequency', ascending=False).reset_index(drop=True)
+        All snapshots share the keyword vocabulary of the full table, so their
+        sparse matrices are index-aligned for comparing network evolution.
         
-        return temporal_df
+        Args:
+            keywords_df: Long-format keywords with publication dates or 'year'
+            time_granularity: Time granularity ('year', 'quarter', 'month')
+            **kwargs: Network options, see build_cooccurrence_network
+            
+        Returns:
+            Dictionary of period -> network, in period order
+        """
+        try:
+            matrix, keywords, publication_ids = self._publication_keyword_matrix(keywords_df, kwargs)
+            
+            # Period of each publication (matrix row)
+            date_columns = [column for column in ('publication_date', 'year', 'month', 'quarter') if column in keywords_df.columns]
+            dates = add_date_columns(keywords_df[date_columns].copy())
+            periods = format_period_labels(dates, time_granularity)
+            publication_periods = periods.groupby(keywords_df['publication_id'].to_numpy()).first()
+            
+            snapshots = network_snapshots(matrix, keywords, publication_periods.reindex(publication_ids).to_numpy(),
+                                          **self._cooccurrence_parameters(kwargs))
+            for network in snapshots.values():
+                network['keywords'] = keywords
+            return snapshots
+        except Exception as e:
+            self.logger.error(f"Error building co-occurrence snapshots: {e}")
+            return {}
+    
+    def _publication_keyword_matrix(self, keywords_df: pd.DataFrame, 
+                                    kwargs: Dict[str, Any]) -> Tuple[Any, np.ndarray, np.ndarray]:
+        """Publication x keyword matrix honouring the min_occurrences setting"""
+        min_occurrences = kwargs.get('min_occurrences', self.keyword_config.get('cooccurrence', {}).get('min_occurrences', 1))
+        matrix, publication_ids, keywords = publication_keyword_matrix(keywords_df, min_occurrences=min_occurrences)
+        return matrix, keywords, publication_ids
+    
+    def _cooccurrence_parameters(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Network options from kwargs, defaulting to config keyword_analysis.cooccurrence"""
+        cooccurrence_config = self.keyword_config.get('cooccurrence', {})
+        defaults = {
+            'normalization': 'association',
+            'top_k': 20,
+            'min_cooccurrence': 1,
+            'min_weight': 0.0,
+            'communities': True,
+            'community_method': 'auto',
+            'resolution': 1.0,
+            'random_state': 42
+        }
+        return {key: kwargs.get(key, cooccurrence_config.get(key, default)) for key, default in defaults.items()}
     
     def _preprocess_text(self, text: str) -> str:
         """Preprocess text for keyword extraction"""
-        if not text or pd.isna(text):
-            return ""
-        
-        # Convert to string and lowercase
-        text = str(text).lower()
-        
-        # Remove special characters but keep spaces and hyphens
-        text = re.sub(r'[^\w\s\-]', ' ', text)
-        
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        # Remove very short words (less than 3 characters)
-        words = text.split()
-        words = [word for word in words if len(word) >= 3]
-        
-        return ' '.join(words)
+        return preprocess_for_keywords(text)
     
     def _clean_keyword(self, keyword: str) -> str:
         """Clean and normalize a keyword"""
-        if not keyword or pd.isna(keyword):
-            return ""
-        
-        # Convert to string and strip
-        keyword = str(keyword).strip()
-        
-        # Remove special characters at start and end
-        keyword = re.sub(r'^[^\w]+|[^\w]+$', '', keyword)
-        
-        # Convert to lowercase
-        keyword = keyword.lower()
-        
-        # Remove extra whitespace
-        keyword = re.sub(r'\s+', ' ', keyword).strip()
-        
-        return keyword
+        return clean_keyword(keyword)
     
     def _extract_year_from_date(self, date_str: Union[str, int]) -> Optional[int]:
         """Extract year from various date formats"""
-        if pd.isna(date_str):
-            return None
-        
-        try:
-            # If already an integer year
-            if isinstance(date_str, int):
-                if 1900 <= date_str <= 2030:  # Reasonable year range
-                    return date_str
-                else:
-                    return None
-            
-            # Convert to string
-            date_str = str(date_str).strip()
-            
-            # Extract 4-digit year using regex
-            year_match = re.search(r'\b(19|20)\d{2}\b', date_str)
-            if year_match:
-                return int(year_match.group())
-            
-            # Try to extract just first 4 digits if they look like a year
-            if len(date_str) >= 4 and date_str[:4].isdigit():
-                year = int(date_str[:4])
-                if 1900 <= year <= 2030:
-                    return year
-            
-            return None
-        except (ValueError, TypeError):
-            return None
+        return parse_date(date_str)[0]
     
     def _extract_quarter_from_date(self, date_str: Union[str, int]) -> Optional[str]:
         """Extract quarter from date string"""
-        year = self._extract_year_from_date(date_str)
+        year, month, _ = parse_date(date_str)
         if not year:
             return None
         
-        try:
-            date_str = str(date_str)
-            # Simple month extraction for quarter calculation
-            month_match = re.search(r'-(\d{1,2})-', date_str)
-            if month_match:
-                month = int(month_match.group(1))
-                quarter = (month - 1) // 3 + 1
-                return f"{year}Q{quarter}"
-            else:
-                return f"{year}Q1"  # Default to Q1 if month not found
-        except (ValueError, TypeError):
-            return f"{year}Q1"
+        # Default to Q1 if month not found
+        return f"{year}Q{(month - 1) // 3 + 1 if month else 1}"
     
     def _extract_month_from_date(self, date_str: Union[str, int]) -> Optional[str]:
         """Extract year-month from date string"""
-        year = self._extract_year_from_date(date_str)
+        year, month, _ = parse_date(date_str)
         if not year:
             return None
         
-        try:
-            date_str = str(date_str)
-            month_match = re.search(r'-(\d{1,2})-', date_str)
-            if month_match:
-                month = int(month_match.group(1))
-                return f"{year}-{month:02d}"
-            else:
-                return f"{year}-01"  # Default to January if month not found
-        except (ValueError, TypeError):
-            return f"{year}-01"
+        # Default to January if month not found
+        return f"{year}-{month or 1:02d}"
     
     def _is_method_available(self, method: str) -> bool:
         """Check if a keyword extraction method is available"""
         if method == 'tfidf':
             return True
         elif method == 'rake':
-            return self.rake is not None
+            return Rake is not None
         elif method == 'yake':
-            return self.yake_extractor is not None
+            return yake is not None
         else:
             return False
 
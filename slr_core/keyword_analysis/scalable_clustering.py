@@ -0,0 +1,411 @@
+"""
+Scalable Clustering for Large Embedding Collections
+
+Clustering building blocks that never materialize an n x n distance matrix and
+read embeddings in row chunks, so they work on memory-mapped embedding
+snapshots with hundreds of thousands of rows:
+
+- Streaming MiniBatchKMeans (`partial_fit` over row chunks)
+- Sparse, symmetric cosine kNN graphs built with an ANN backend (hnswlib,
+  faiss) or chunked exact search
+- DBSCAN and HDBSCAN on a precomputed kNN graph
+- Incremental PCA pre-reduction
+- k sweeps with warm-started fits, parallel across worker processes
+"""
+
+import logging
+import mmap
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from sklearn.cluster import DBSCAN, HDBSCAN, KMeans, MiniBatchKMeans
+from sklearn.decomposition import IncrementalPCA
+
+from .cluster_metrics import compute_cluster_metrics
+from .vector_index import _normalize, _resolve_backend
+
+logger = logging.getLogger(__name__)
+
+# Batches per contiguous block read (and shuffled) by streaming MiniBatchKMeans
+SHUFFLE_BLOCK_BATCHES = 8
+
+# Smallest stored graph distance; sparse matrices drop explicit zeros in some operations
+MIN_GRAPH_DISTANCE = 1e-8
+
+# Distance of the edges linking disconnected graph components (cosine distance is at most 2)
+BRIDGE_DISTANCE = 2.0
+
+# Upper bound on the similarity block materialized by exact kNN search (floats)
+EXACT_KNN_BLOCK = 32 * 1024 * 1024
+
+
+def iter_row_chunks(embeddings: np.ndarray, chunk_size: int,
+                    min_chunk_size: int = 1) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Yield (start, float32 chunk) pairs over the rows of a (memory-mapped) array.
+
+    A trailing chunk smaller than `min_chunk_size` is merged into the previous one.
+    """
+    n_rows = len(embeddings)
+    starts = list(range(0, n_rows, max(1, chunk_size)))
+    if len(starts) > 1 and n_rows - starts[-1] < min_chunk_size:
+        starts.pop()
+    for i, start in enumerate(starts):
+        end = starts[i + 1] if i + 1 < len(starts) else n_rows
+        yield start, np.asarray(embeddings[start:end], dtype=np.float32)
+
+
+def fit_minibatch_kmeans(embeddings: np.ndarray, n_clusters: int, batch_size: int = 4096,
+                         max_epochs: int = 3, random_state: Optional[int] = 42,
+                         init: str = 'k-means++', n_init: int = 3,
+                         init_centers: Optional[np.ndarray] = None) -> Tuple[MiniBatchKMeans, np.ndarray, float]:
+    """
+    Fit MiniBatchKMeans by streaming row chunks through `partial_fit`.
+
+    Blocks of rows are visited in a shuffled order each epoch and read
+    contiguously, so a memory-mapped array is paged in sequentially; rows are
+    shuffled within each block before being split into mini-batches.
+
+    Args:
+        embeddings: (n, d) array, typically a memory-mapped snapshot
+        n_clusters: Number of clusters
+        batch_size: Rows per `partial_fit` call (at least n_clusters)
+        max_epochs: Passes over the data
+        random_state: Seed for initialization and chunk order
+        init: Initialization method when `init_centers` is not given
+        n_init: Initializations tried on the seeding sample
+        init_centers: Optional (n_clusters, d) starting centroids (warm start)
+
+    Returns:
+        Tuple of (fitted model, int labels, inertia)
+    """
+    n_rows = len(embeddings)
+    batch_size = max(batch_size, n_clusters)
+    rng = np.random.default_rng(random_state)
+
+    if init_centers is None:
+        # Seed centroids with a full KMeans on a sample spread over all rows: embedding
+        # stores are ordered by insertion, so the first chunk is rarely representative
+        sample_size = min(n_rows, max(3 * batch_size, 10 * n_clusters))
+        sample_rows = np.sort(rng.choice(n_rows, size=sample_size, replace=False))
+        sample = np.asarray(embeddings[sample_rows], dtype=np.float32)
+        init_centers = KMeans(n_clusters=n_clusters, init=init, n_init=n_init,
+                              random_state=random_state).fit(sample).cluster_centers_
+
+    model = MiniBatchKMeans(
+        n_clusters=n_clusters,
+        init=np.asarray(init_centers, dtype=np.float32),
+        batch_size=batch_size,
+        random_state=random_state,
+        n_init=1,
+        # Rows arrive in insertion order, so a batch may miss whole clusters; random
+        # reassignment of rarely updated centroids would discard the seeded solution
+        reassignment_ratio=0.0
+    )
+
+    # Read contiguous blocks of several batches, shuffle rows within each block
+    block_size = batch_size * SHUFFLE_BLOCK_BATCHES
+    for _ in range(max(1, max_epochs)):
+        for start in rng.permutation(np.arange(0, n_rows, block_size)):
+            block = np.asarray(embeddings[start:start + block_size], dtype=np.float32)
+            block = block[rng.permutation(len(block))]
+            for batch_start in range(0, len(block), batch_size):
+                model.partial_fit(block[batch_start:batch_start + batch_size])
+
+    labels = np.empty(len(embeddings), dtype=np.int64)
+    inertia = 0.0
+    for start, chunk in iter_row_chunks(embeddings, batch_size):
+        labels[start:start + len(chunk)] = model.predict(chunk)
+        inertia -= model.score(chunk)
+
+    return model, labels, float(inertia)
+
+
+def pca_reduce(embeddings: np.ndarray, n_components: int,
+               batch_size: int = 4096) -> Tuple[np.ndarray, IncrementalPCA]:
+    """
+    Reduce embeddings with IncrementalPCA fitted and applied chunk by chunk.
+
+    Returns:
+        Tuple of (float32 (n, n_components) array, fitted IncrementalPCA)
+    """
+    n_components = min(n_components, embeddings.shape[1], len(embeddings))
+    batch_size = max(batch_size, n_components)
+    pca = IncrementalPCA(n_components=n_components, batch_size=batch_size)
+    for _, chunk in iter_row_chunks(embeddings, batch_size, min_chunk_size=n_components):
+        pca.partial_fit(chunk)
+
+    reduced = np.empty((len(embeddings), n_components), dtype=np.float32)
+    for start, chunk in iter_row_chunks(embeddings, batch_size):
+        reduced[start:start + len(chunk)] = pca.transform(chunk)
+    return reduced, pca
+
+
+def _exact_neighbors(embeddings: np.ndarray, n_neighbors: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Exact cosine kNN (self included) by chunked matrix products."""
+    n_rows = len(embeddings)
+    k = min(n_neighbors, n_rows)
+    vectors = _normalize(embeddings)
+    chunk_size = max(1, EXACT_KNN_BLOCK // max(n_rows, 1))
+
+    neighbors = np.empty((n_rows, k), dtype=np.int64)
+    distances = np.empty((n_rows, k), dtype=np.float32)
+    for start in range(0, n_rows, chunk_size):
+        similarity = vectors[start:start + chunk_size] @ vectors.T
+        top = np.argpartition(-similarity, k - 1, axis=1)[:, :k] if k < n_rows else \
+            np.broadcast_to(np.arange(n_rows), similarity.shape)
+        neighbors[start:start + len(similarity)] = top
+        distances[start:start + len(similarity)] = 1 - np.take_along_axis(similarity, top, axis=1)
+    return neighbors, distances
+
+
+def _ann_neighbors(embeddings: np.ndarray, n_neighbors: int, backend: str, M: int,
+                   ef_construction: int, ef_search: int,
+                   chunk_size: int = 8192) -> Tuple[np.ndarray, np.ndarray]:
+    """Approximate cosine kNN (self included) with a temporary HNSW index."""
+    n_rows, dimension = embeddings.shape
+    ef_search = max(ef_search, n_neighbors)
+
+    if backend == 'hnswlib':
+        import hnswlib
+
+        index = hnswlib.Index(space='ip', dim=dimension)
+        index.init_index(max_elements=n_rows, M=M, ef_construction=ef_construction)
+        for start, chunk in iter_row_chunks(embeddings, chunk_size):
+            index.add_items(_normalize(chunk), np.arange(start, start + len(chunk)))
+        index.set_ef(ef_search)
+
+        def query(chunk):
+            labels, distances = index.knn_query(chunk, k=n_neighbors)
+            return labels.astype(np.int64), distances  # 'ip' distance is 1 - similarity
+    else:
+        import faiss
+
+        index = faiss.IndexHNSWFlat(dimension, M, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = ef_construction
+        for _, chunk in iter_row_chunks(embeddings, chunk_size):
+            index.add(_normalize(chunk))
+        index.hnsw.efSearch = ef_search
+
+        def query(chunk):
+            similarity, labels = index.search(chunk, n_neighbors)
+            return labels.astype(np.int64), 1 - similarity
+
+    neighbors = np.empty((n_rows, n_neighbors), dtype=np.int64)
+    distances = np.empty((n_rows, n_neighbors), dtype=np.float32)
+    for start, chunk in iter_row_chunks(embeddings, chunk_size):
+        neighbors[start:start + len(chunk)], distances[start:start + len(chunk)] = query(_normalize(chunk))
+    return neighbors, distances
+
+
+def build_knn_graph(embeddings: np.ndarray, n_neighbors: int = 15, backend: str = 'auto',
+                    M: int = 32, ef_construction: int = 200, ef_search: int = 64) -> sparse.csr_matrix:
+    """
+    Build a sparse, symmetric cosine-distance kNN graph.
+
+    Args:
+        embeddings: (n, d) array
+        n_neighbors: Neighbours per point (excluding the point itself)
+        backend: 'auto', 'hnswlib', 'faiss' or 'numpy' (exact, chunked)
+        M, ef_construction, ef_search: HNSW parameters for ANN backends
+
+    Returns:
+        (n, n) CSR matrix of cosine distances; an edge is kept if either endpoint
+        lists the other among its neighbours
+    """
+    n_rows = len(embeddings)
+    n_neighbors = max(1, min(n_neighbors, n_rows - 1))
+    backend = _resolve_backend(backend)
+
+    if backend == 'numpy':
+        neighbors, distances = _exact_neighbors(embeddings, n_neighbors + 1)
+    else:
+        neighbors, distances = _ann_neighbors(embeddings, n_neighbors + 1, backend, M,
+                                              ef_construction, ef_search)
+
+    # Drop each point's self-match (or the farthest neighbour if the ANN missed it)
+    rows = np.arange(n_rows)
+    distances = np.where(neighbors == rows[:, None], np.inf, distances)
+    keep = np.argsort(distances, axis=1, kind='stable')[:, :n_neighbors]
+    neighbors = np.take_along_axis(neighbors, keep, axis=1)
+    distances = np.take_along_axis(distances, keep, axis=1)
+
+    valid = neighbors >= 0  # faiss pads missing results with -1
+    graph = sparse.csr_matrix(
+        (np.maximum(distances[valid], MIN_GRAPH_DISTANCE),
+         (np.repeat(rows, n_neighbors)[valid.ravel()], neighbors[valid])),
+        shape=(n_rows, n_rows)
+    )
+    logger.info(f"Built {n_neighbors}-NN graph over {n_rows} points ({backend} backend, {graph.nnz} edges)")
+    return graph.maximum(graph.T).tocsr()
+
+
+def dbscan_on_graph(graph: sparse.csr_matrix, eps: float = 0.3, min_samples: int = 5) -> Tuple[DBSCAN, np.ndarray]:
+    """
+    Run DBSCAN on a precomputed sparse distance graph.
+
+    Only graph edges are considered neighbourhoods, so eps-neighbourhoods are
+    truncated at the graph's k nearest neighbours.
+    """
+    model = DBSCAN(eps=eps, min_samples=min_samples, metric='precomputed')
+    return model, model.fit_predict(graph)
+
+
+def hdbscan_on_graph(graph: sparse.csr_matrix, min_cluster_size: int = 15, min_samples: Optional[int] = 5,
+                     cluster_selection_epsilon: float = 0.0) -> Tuple[Dict[str, Any], np.ndarray]:
+    """
+    Run HDBSCAN on a precomputed sparse distance graph.
+
+    HDBSCAN requires a connected graph, so disconnected components of the kNN
+    graph are chained together with maximum-distance (BRIDGE_DISTANCE) edges;
+    they separate at the top of the cluster hierarchy as they would on the
+    full distance matrix.
+
+    Returns:
+        Tuple of (run summary, int labels)
+    """
+    n_components, component_labels = connected_components(graph, directed=False)
+    if n_components > 1:
+        representatives = np.unique(component_labels, return_index=True)[1]
+        bridges = sparse.csr_matrix(
+            (np.full(n_components - 1, BRIDGE_DISTANCE), (representatives[:-1], representatives[1:])),
+            shape=graph.shape
+        )
+        graph = graph.maximum(bridges).maximum(bridges.T).tocsr()
+
+    # Core distances need at least min_samples stored neighbours per row
+    min_samples = min(min_samples or min_cluster_size, int(np.diff(graph.indptr).min()))
+    model = HDBSCAN(
+        min_cluster_size=min_cluster_size,
+        min_samples=max(1, min_samples),
+        cluster_selection_epsilon=cluster_selection_epsilon,
+        metric='precomputed',
+        copy=True
+    )
+    labels = model.fit_predict(graph)
+    return {'graph_components': int(n_components), 'min_samples': int(max(1, min_samples))}, labels
+
+
+def embedding_source(embeddings: np.ndarray) -> Union[np.ndarray, Tuple]:
+    """
+    Describe embeddings for a worker process.
+
+    A memory-mapped file is passed as (filename, dtype, shape, offset) so workers
+    reopen it instead of receiving a pickled copy of the data.
+    """
+    if isinstance(embeddings, np.memmap) and isinstance(embeddings.base, mmap.mmap) and embeddings.filename:
+        return (embeddings.filename, embeddings.dtype.str, embeddings.shape, embeddings.offset)
+    return embeddings
+
+
+def open_embedding_source(source: Union[np.ndarray, Tuple]) -> np.ndarray:
+    """Reopen embeddings described by `embedding_source`."""
+    if isinstance(source, tuple):
+        filename, dtype, shape, offset = source
+        return np.memmap(filename, dtype=np.dtype(dtype), mode='r', shape=tuple(shape), offset=offset)
+    return source
+
+
+def _add_farthest_center(sample: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    """Warm start for k + 1 clusters: keep the k centroids and add the worst-served sample point."""
+    squared = (np.sum(sample ** 2, axis=1)[:, None] - 2 * sample @ centers.T
+               + np.sum(centers ** 2, axis=1))
+    return np.vstack([centers, sample[np.argmax(squared.min(axis=1))]])
+
+
+def sweep_k_segment(source: Union[np.ndarray, Tuple], k_values: Sequence[int],
+                    algorithm: str = 'minibatch_kmeans', batch_size: int = 4096,
+                    max_epochs: int = 3, max_iter: int = 300, n_init: int = 3,
+                    random_state: Optional[int] = 42,
+                    metrics_params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Fit and score k-means for increasing k values.
+
+    The first k is fitted from scratch; every following fit warm-starts from the
+    previous centroids plus the sample point farthest from them. Module-level so
+    it can be pickled for ProcessPoolExecutor workers.
+
+    Args:
+        source: Embeddings or an `embedding_source` description
+        k_values: Increasing cluster counts
+        algorithm: 'minibatch_kmeans' (streaming) or 'kmeans' (full batch)
+        batch_size, max_epochs: MiniBatchKMeans parameters
+        max_iter, n_init: KMeans parameters (n_init applies to cold starts only)
+        random_state: Seed
+        metrics_params: Keyword arguments for `compute_cluster_metrics`
+
+    Returns:
+        One row per k with inertia, quality metrics, fit time and centroids
+    """
+    embeddings = open_embedding_source(source)
+    metrics_params = metrics_params or {}
+
+    rng = np.random.default_rng(random_state)
+    sample_size = min(len(embeddings), max(3 * batch_size, 10 * max(k_values)))
+    sample = np.asarray(embeddings[np.sort(rng.choice(len(embeddings), size=sample_size, replace=False))],
+                        dtype=np.float32)
+
+    rows, centers = [], None
+    for k in k_values:
+        start_time = time.perf_counter()
+        init_centers = None
+        if centers is not None and len(centers) < k:
+            init_centers = centers
+            while len(init_centers) < k:
+                init_centers = _add_farthest_center(sample, init_centers)
+
+        if algorithm == 'minibatch_kmeans':
+            model, labels, inertia = fit_minibatch_kmeans(
+                embeddings, k, batch_size=batch_size, max_epochs=max_epochs,
+                random_state=random_state, n_init=n_init, init_centers=init_centers
+            )
+        else:
+            model = KMeans(
+                n_clusters=k,
+                init=init_centers if init_centers is not None else 'k-means++',
+                n_init=1 if init_centers is not None else n_init,
+                max_iter=max_iter,
+                random_state=random_state
+            )
+            labels = model.fit_predict(np.asarray(embeddings, dtype=np.float32))
+            inertia = float(model.inertia_)
+
+        centers = model.cluster_centers_.astype(np.float32)
+        seconds = time.perf_counter() - start_time
+        metrics = compute_cluster_metrics(embeddings, labels, centroids=centers, **metrics_params)
+        rows.append({
+            'k': int(k),
+            'inertia': inertia,
+            'silhouette_score': metrics.get('silhouette_score'),
+            'silhouette_ci': metrics['metrics'].get('silhouette_ci'),
+            'calinski_harabasz_score': metrics.get('calinski_harabasz_score'),
+            'davies_bouldin_score': metrics.get('davies_bouldin_score'),
+            'warm_start': init_centers is not None,
+            'fit_seconds': seconds,
+            'metrics': metrics['metrics'],
+            'centers': centers
+        })
+        logger.info(f"k={k}: inertia={inertia:.1f}, silhouette={metrics.get('silhouette_score')} ({seconds:.2f}s)")
+    return rows
+
+
+def find_elbow(k_values: Sequence[int], inertias: Sequence[float]) -> int:
+    """
+    Locate the elbow of an inertia curve.
+
+    Returns the k whose (normalized) point lies farthest below the straight line
+    between the first and last points of the curve.
+    """
+    k_values = np.asarray(k_values, dtype=float)
+    inertias = np.asarray(inertias, dtype=float)
+    if len(k_values) < 3:
+        return int(k_values[0])
+
+    x = (k_values - k_values[0]) / (k_values[-1] - k_values[0])
+    y_range = inertias[0] - inertias[-1]
+    y = (inertias - inertias[-1]) / y_range if y_range > 0 else np.zeros_like(inertias)
+    # The chord runs from (0, 1) to (1, 0); distance below it is 1 - x - y
+    return int(k_values[np.argmax(1 - x - y)])
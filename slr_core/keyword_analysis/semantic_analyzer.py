@@ -10,36 +10,42 @@ This module handles:
 
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any, Optional, Union, Tuple
+from typing import List, Dict, Any, Callable, Optional, Union, Tuple
 import logging
 import os
-import pickle
+import importlib.util
+import json
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 from pathlib import Path
 
+import joblib
+
 # Machine learning libraries
 from sklearn.cluster import KMeans, DBSCAN
 from sklearn.decomposition import PCA
-from sklearn.metrics import silhouette_score, calinski_harabasz_score
 from sklearn.preprocessing import StandardScaler
 
-# Sentence transformers for BGE-M3
-try:
-    from sentence_transformers import SentenceTransformer
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
-    SentenceTransformer = None
-
-# UMAP for dimensionality reduction
-try:
-    import umap
-    UMAP_AVAILABLE = True
-except ImportError:
-    UMAP_AVAILABLE = False
-    umap = None
+# UMAP for dimensionality reduction (imported lazily when used)
+UMAP_AVAILABLE = importlib.util.find_spec('umap') is not None
 
 # Configuration
 from ..config_manager import ConfigManager
+from .date_normalization import add_date_columns, parse_year
+from .cluster_assignment import ClusterModel
+from .cluster_metrics import cluster_statistics, compute_cluster_metrics
+from .cluster_topics import label_clusters
+# Sentence transformers for BGE-M3 (imported lazily when a model is loaded)
+from .embedding_backends import (SENTENCE_TRANSFORMERS_AVAILABLE, check_backend_parity, get_embedding_model,
+                                 load_parity_report, load_sentence_transformer, save_parity_report)
+from .embedding_engine import EmbeddingEngine
+from .embedding_store import EmbeddingStore, load_embeddings, save_embeddings
+from .keyword_canonicalization import build_synonym_map
+from .scalable_clustering import (build_knn_graph, dbscan_on_graph, embedding_source, find_elbow,
+                                  fit_minibatch_kmeans, hdbscan_on_graph, iter_row_chunks, pca_reduce,
+                                  sweep_k_segment)
+from .text_preprocessing import preprocess_for_embedding, preprocess_for_embedding_batch
+from .vector_index import VectorIndex
 
 class SemanticAnalyzer:
     """
@@ -48,9 +54,10 @@ class SemanticAnalyzer:
     Features:
     - BGE-M3 model loading and embedding generation
     - K-means and DBSCAN clustering
+    - Scalable MiniBatchKMeans and kNN-graph DBSCAN/HDBSCAN clustering
     - PCA and UMAP dimensionality reduction
     - Cluster quality metrics and analysis
-    - Embedding caching for performance
+    - Content-addressed per-text embedding cache
     """
     
     def __init__(self, config_manager: Optional[ConfigManager] = None):
@@ -68,16 +75,41 @@ class SemanticAnalyzer:
         self.embedding_config = self.semantic_config.get('embedding', {})
         self.clustering_config = self.semantic_config.get('clustering', {})
         self.reduction_config = self.semantic_config.get('dimensionality_reduction', {})
+        self.index_config = self.semantic_config.get('vector_index', {})
+        self.incremental_config = self.semantic_config.get('incremental', {})
         
         # Initialize components
         self.embedding_model = None
+        self.embedding_engine = None
+        self.tokenizer = None  # standalone tokenizer for truncation before the model is loaded
+        self.model_name = self.embedding_config.get('model_name', 'BAAI/bge-m3')
+        self.max_length = self.embedding_config.get('max_length', 512)
         self.embeddings_cache = {}
+        
+        # Inference backend: 'torch', 'onnx' or 'onnx-int8'
+        self.backend = self.embedding_config.get('backend', 'torch')
+        self.quantization_config = self.embedding_config.get('quantization_config', 'avx512_vnni')
+        self.parity_threshold = self.embedding_config.get('parity_threshold', 0.99)
+        self.backend_parity = None
         self.scaler = StandardScaler()
         
         # Set up cache directory
         self.cache_dir = Path(self.embedding_config.get('cache_dir', './data/embeddings_cache'))
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
+        # Per-text embedding store, one per model configuration (created lazily)
+        self.store_dtype = self.embedding_config.get('store_dtype', 'float32')
+        self.embedding_stores = {}
+        
+        # Named embedding snapshots (.npy + JSON sidecar): 'float32', 'float16' or 'int8'
+        self.snapshot_dtype = self.embedding_config.get('snapshot_dtype', 'float32')
+        
+        # Semantic search index (opened lazily)
+        self.vector_index = None
+        
+        # Fitted dimensionality reducers, persisted under <cache_dir>/reducers
+        self.reducers = {}
+        
         # Check dependencies
         self._check_dependencies()
     
@@ -104,22 +136,24 @@ class SemanticAnalyzer:
             return False
         
         try:
-            model_name = model_name or self.embedding_config.get('model_name', 'BAAI/bge-m3')
+            model_name = model_name or self.model_name
             device = self.embedding_config.get('device', 'cpu')
             
-            self.logger.info(f"Loading embedding model: {model_name}")
+            self.logger.info(f"Loading embedding model: {model_name} (backend={self.backend})")
             
-            # Load model with configuration
-            self.embedding_model = SentenceTransformer(
+            # Load model with configuration (shared across analyzers in this process)
+            self.embedding_model = get_embedding_model(
                 model_name,
                 device=device,
-                cache_folder=str(self.cache_dir / 'models')
+                max_length=self.max_length,
+                backend=self.backend,
+                cache_folder=self.cache_dir / 'models',
+                quantization_config=self.quantization_config
             )
+            self.model_name = model_name
             
-            # Set maximum sequence length
-            max_length = self.embedding_config.get('max_length', 512)
-            if hasattr(self.embedding_model, 'max_seq_length'):
-                self.embedding_model.max_seq_length = max_length
+            if self.backend != 'torch' and self.embedding_config.get('parity_check', True):
+                self._verify_backend_parity()
             
             self.logger.info(f"Successfully loaded model {model_name} on device {device}")
             return True
@@ -128,63 +162,99 @@ class SemanticAnalyzer:
             self.logger.error(f"Error loading embedding model: {e}")
             return False
     
+    def check_backend_parity(self, texts: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Compare the loaded backend's embeddings against the PyTorch model
+        
+        Args:
+            texts: Sample texts, defaults to a small built-in sample
+            
+        Returns:
+            Parity statistics (cosine similarity, nearest-neighbour agreement, speedup)
+        """
+        if self.embedding_model is None and not self.load_embedding_model():
+            return {'error': 'Embedding model not available'}
+        
+        device = self.embedding_config.get('device', 'cpu')
+        reference_model = load_sentence_transformer(self.model_name, device=device,
+                                                    cache_folder=self.cache_dir / 'models')
+        reference_model.max_seq_length = self.max_length
+        texts = preprocess_for_embedding_batch(texts, self.max_length, self._get_tokenizer()) if texts else None
+        
+        return check_backend_parity(reference_model, self.embedding_model, texts)
+    
+    def _backend_key(self) -> str:
+        """Backend name, including the quantization target for int8 exports"""
+        if self.backend == 'onnx-int8':
+            return f"{self.backend}:{self.quantization_config}"
+        return self.backend
+    
+    def _verify_backend_parity(self):
+        """Check a non-PyTorch backend once per export and warn if it drifts too far"""
+        cache_folder = self.cache_dir / 'models'
+        report_key = self._backend_key()
+        report = load_parity_report(self.model_name, report_key, cache_folder)
+        if report is None:
+            self.logger.info(f"Checking {self.backend} backend parity against PyTorch")
+            report = self.check_backend_parity()
+            save_parity_report(self.model_name, report_key, cache_folder, report)
+        
+        self.backend_parity = report
+        if report['min_cosine'] < self.parity_threshold:
+            self.logger.warning(f"{self.backend} backend deviates from PyTorch: min cosine "
+                                f"{report['min_cosine']:.4f} < {self.parity_threshold}")
+        else:
+            self.logger.info(f"{self.backend} backend parity: mean cosine {report['mean_cosine']:.4f}, "
+                             f"speedup {report.get('speedup') or 0:.1f}x")
+    
     def generate_embeddings(self, 
                           texts: List[str], 
                           use_cache: bool = True,
-                          cache_key: Optional[str] = None) -> Optional[np.ndarray]:
+                          cache_key: Optional[str] = None,
+                          row_ids: Optional[List[str]] = None) -> Optional[np.ndarray]:
         """
         Generate embeddings for text documents
         
+        Embeddings are looked up per text in the content-addressed embedding store,
+        so only texts never encoded with the current model settings are sent to the
+        model. The result is row-aligned with `texts`; empty texts get zero vectors.
+        
         Args:
             texts: List of text documents
-            use_cache: Whether to use embedding cache
-            cache_key: Cache key for storing/retrieving embeddings
+            use_cache: Whether to use the per-text embedding store
+            cache_key: Optional name under which to also save the resulting matrix
+            row_ids: Optional identifiers (e.g. publication IDs) recorded with the saved matrix
             
         Returns:
-            Numpy array of embeddings or None if failed
+            Numpy array of embeddings (one row per input text) or None if failed
         """
         if not texts:
             self.logger.warning("No texts provided for embedding generation")
             return None
         
-        # Clean texts
-        cleaned_texts = [self._preprocess_text_for_embedding(text) for text in texts]
-        cleaned_texts = [text for text in cleaned_texts if text.strip()]
+        # Clean texts without truncating them: store keys are already scoped to max_length
+        # and the model truncates to max_seq_length itself, so a key never depends on
+        # whether a tokenizer happened to be available
+        cleaned_texts = preprocess_for_embedding_batch(texts, max_tokens=None)
+        non_empty = np.array([bool(text.strip()) for text in cleaned_texts])
         
-        if not cleaned_texts:
+        if not non_empty.any():
             self.logger.warning("No valid texts after preprocessing")
             return None
-        
-        # Check cache first
-        if use_cache and cache_key:
-            cached_embeddings = self._load_embeddings_from_cache(cache_key)
-            if cached_embeddings is not None:
-                self.logger.info(f"Loaded embeddings from cache: {cache_key}")
-                return cached_embeddings
-        
-        # Load model if not already loaded
-        if self.embedding_model is None:
-            if not self.load_embedding_model():
-                self.logger.error("Failed to load embedding model")
-                return None
+        if not non_empty.all():
+            self.logger.warning(f"{int((~non_empty).sum())} empty texts will get zero embeddings")
         
         try:
-            batch_size = self.embedding_config.get('batch_size', 32)
-            
-            self.logger.info(f"Generating embeddings for {len(cleaned_texts)} texts")
-            
-            # Generate embeddings in batches
-            embeddings = self.embedding_model.encode(
-                cleaned_texts,
-                batch_size=batch_size,
-                show_progress_bar=True,
-                convert_to_numpy=True,
-                normalize_embeddings=True  # L2 normalize for cosine similarity
-            )
+            if use_cache:
+                embeddings = self._get_embedding_store().embed(cleaned_texts, self._encode_texts)
+            else:
+                encoded = self._encode_texts([text for text in cleaned_texts if text.strip()])
+                embeddings = np.zeros((len(cleaned_texts), encoded.shape[1]), dtype=np.float32)
+                embeddings[non_empty] = encoded
             
-            # Cache embeddings if requested
-            if use_cache and cache_key:
-                self._save_embeddings_to_cache(embeddings, cache_key)
+            # Save a named copy if requested
+            if cache_key:
+                self._save_embeddings_to_cache(embeddings, cache_key, row_ids=row_ids)
             
             self.logger.info(f"Generated embeddings shape: {embeddings.shape}")
             return embeddings
@@ -193,17 +263,57 @@ class SemanticAnalyzer:
             self.logger.error(f"Error generating embeddings: {e}")
             return None
     
+    def _encode_texts(self, texts: List[str]) -> np.ndarray:
+        """Encode preprocessed, non-empty texts with the embedding model (original order)"""
+        # Load model if not already loaded
+        if self.embedding_model is None:
+            if not self.load_embedding_model():
+                raise RuntimeError("Failed to load embedding model")
+        
+        # Length-bucketed, token-budget batching (optionally multi-process)
+        if self.embedding_engine is None or self.embedding_engine.model is not self.embedding_model:
+            if self.embedding_engine is not None:
+                self.embedding_engine.close()
+            self.embedding_engine = EmbeddingEngine(self.embedding_model, self.embedding_config)
+        
+        self.logger.info(f"Generating embeddings for {len(texts)} texts")
+        
+        return self.embedding_engine.encode(
+            texts,
+            normalize_embeddings=True,  # L2 normalize for cosine similarity
+            show_progress_bar=True
+        )
+    
+    def _get_embedding_store(self) -> EmbeddingStore:
+        """Get the embedding store for the current model name and max length"""
+        # Backends (and int8 quantization targets) produce slightly different vectors,
+        # so each gets its own keys
+        model_id = self.model_name if self.backend == 'torch' else f"{self.model_name}@{self._backend_key()}"
+        store_key = (model_id, self.max_length)
+        if store_key not in self.embedding_stores:
+            store_name = f"{model_id.replace('/', '__').replace(':', '_')}-{self.max_length}"
+            self.embedding_stores[store_key] = EmbeddingStore(
+                self.cache_dir / 'store' / store_name,
+                model_id,
+                self.max_length,
+                dtype=self.store_dtype
+            )
+        return self.embedding_stores[store_key]
+    
     def perform_clustering(self, 
                          embeddings: np.ndarray, 
-                         method: str = 'kmeans',
+                         method: Optional[str] = 'kmeans',
                          **kwargs) -> Dict[str, Any]:
         """
         Perform clustering on embeddings
         
         Args:
-            embeddings: Numpy array of embeddings
-            method: Clustering method ('kmeans', 'dbscan', 'both')
-            **kwargs: Additional parameters for clustering algorithms
+            embeddings: Numpy array of embeddings (may be memory-mapped)
+            method: Clustering method ('kmeans', 'dbscan', 'both', 'minibatch_kmeans',
+                'knn_dbscan', 'hdbscan'), or None for every method in config
+                clustering.methods
+            **kwargs: Additional parameters for clustering algorithms; `pca_components`
+                reduces embeddings with incremental PCA before clustering
             
         Returns:
             Dictionary with clustering results and metadata
@@ -211,6 +321,15 @@ class SemanticAnalyzer:
         if embeddings is None or embeddings.size == 0:
             return {'cluster_labels': [], 'labels': [], 'method': method, 'metadata': {'error': 'No embeddings provided'}}
         
+        if method is None:
+            methods = self.clustering_config.get('methods', ['kmeans'])
+            if len(methods) == 1:
+                return self.perform_clustering(embeddings, method=methods[0], **kwargs)
+            
+            results = {m: self.perform_clustering(embeddings, method=m, **kwargs) for m in methods}
+            results['method'] = 'multiple'
+            return results
+        
         try:
             if method == 'both':
                 # Perform both clustering methods
@@ -223,19 +342,153 @@ class SemanticAnalyzer:
                     'method': 'both'
                 }
             
-            elif method == 'kmeans':
-                return self._perform_kmeans_clustering(embeddings, **kwargs)
+            clustering_functions = {
+                'kmeans': self._perform_kmeans_clustering,
+                'dbscan': self._perform_dbscan_clustering,
+                'minibatch_kmeans': self._perform_minibatch_kmeans_clustering,
+                'knn_dbscan': self._perform_knn_dbscan_clustering,
+                'hdbscan': self._perform_hdbscan_clustering
+            }
+            if method not in clustering_functions:
+                raise ValueError(f"Unknown clustering method: {method}")
             
-            elif method == 'dbscan':
-                return self._perform_dbscan_clustering(embeddings, **kwargs)
+            # Optional PCA pre-reduction
+            pca_components = kwargs.pop('pca_components', self.clustering_config.get('pca_components'))
+            pca_info = None
+            if pca_components and pca_components < embeddings.shape[1]:
+                self.logger.info(f"Reducing embeddings to {pca_components} PCA components before clustering")
+                embeddings, pca = pca_reduce(
+                    embeddings, pca_components,
+                    batch_size=self.clustering_config.get('minibatch_kmeans', {}).get('batch_size', 4096)
+                )
+                pca_info = {
+                    'n_components': int(pca.n_components_),
+                    'explained_variance_ratio': float(pca.explained_variance_ratio_.sum())
+                }
             
-            else:
-                raise ValueError(f"Unknown clustering method: {method}")
+            result = clustering_functions[method](embeddings, **kwargs)
+            if pca_info is not None:
+                result['metadata']['pca'] = pca_info
+            return result
                 
         except Exception as e:
             self.logger.error(f"Error in clustering: {e}")
             return {'cluster_labels': [], 'labels': [], 'method': method, 'metadata': {'error': str(e)}}
     
+    def select_k(self, 
+                 embeddings: np.ndarray,
+                 k_values: Optional[List[int]] = None,
+                 method: Optional[str] = None,
+                 criterion: Optional[str] = None,
+                 max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Choose the number of clusters with a k sweep
+        
+        The k range is split into contiguous segments fitted in parallel worker
+        processes; within a segment each fit warm-starts from the previous k's
+        centroids. Every k is scored with the sampled quality metrics, then the
+        chosen k is refitted (warm-started) to produce the full clustering result.
+        
+        Args:
+            embeddings: Numpy array of embeddings (memory-mapped files are reopened by workers)
+            k_values: Cluster counts to try, defaults to config select_k k_min..k_max
+            method: 'minibatch_kmeans' or 'kmeans', defaults to config setting
+            criterion: 'silhouette' (highest score) or 'elbow' (inertia knee)
+            max_workers: Number of worker processes, defaults to config / CPU count
+            
+        Returns:
+            Dictionary with the sweep 'table' (DataFrame), 'best_k', 'elbow_k',
+            'criterion' and the clustering 'result' for the chosen k
+        """
+        select_config = self.clustering_config.get('select_k', {})
+        minibatch_config = self.clustering_config.get('minibatch_kmeans', {})
+        metrics_config = self.clustering_config.get('metrics', {})
+        
+        method = method or select_config.get('method', 'minibatch_kmeans')
+        criterion = criterion or select_config.get('criterion', 'silhouette')
+        if method not in ('minibatch_kmeans', 'kmeans'):
+            raise ValueError(f"Unsupported method for k selection: {method}")
+        if criterion not in ('silhouette', 'elbow'):
+            raise ValueError(f"Unknown k selection criterion: {criterion}")
+        
+        if k_values is None:
+            k_values = range(select_config.get('k_min', 2), select_config.get('k_max', 30) + 1,
+                             select_config.get('step', 1))
+        k_values = sorted({int(k) for k in k_values if 2 <= k < len(embeddings)})
+        if not k_values:
+            return {'error': 'No valid k values for the number of embeddings'}
+        
+        max_workers = max_workers or select_config.get('max_workers') or os.cpu_count() or 1
+        segments = [list(segment) for segment in np.array_split(k_values, min(max_workers, len(k_values)))]
+        
+        sweep_params = {
+            'algorithm': method,
+            'batch_size': minibatch_config.get('batch_size', 4096),
+            'max_epochs': minibatch_config.get('max_epochs', 3),
+            'max_iter': self.clustering_config.get('kmeans', {}).get('max_iter', 300),
+            'random_state': minibatch_config.get('random_state', 42),
+            'metrics_params': {
+                'mode': select_config.get('metrics_mode', 'sampled'),
+                'sample_size': metrics_config.get('sample_size', 10000),
+                'n_repeats': metrics_config.get('n_repeats', 5),
+                'metric': metrics_config.get('silhouette_metric', 'euclidean'),
+                'random_state': metrics_config.get('random_state', 42)
+            }
+        }
+        
+        self.logger.info(f"Sweeping k over {k_values[0]}..{k_values[-1]} ({len(k_values)} values) "
+                         f"with {len(segments)} worker(s)")
+        
+        source = embedding_source(embeddings)
+        if len(segments) > 1:
+            with ProcessPoolExecutor(max_workers=len(segments)) as pool:
+                futures = [pool.submit(sweep_k_segment, source, segment, **sweep_params) for segment in segments]
+                rows = [row for future in futures for row in future.result()]
+        else:
+            rows = sweep_k_segment(source, k_values, **sweep_params)
+        
+        centers = {row['k']: row.pop('centers') for row in rows}
+        table = pd.DataFrame(rows).sort_values('k').reset_index(drop=True)
+        
+        elbow_k = find_elbow(table['k'], table['inertia'])
+        if criterion == 'silhouette' and table['silhouette_score'].notna().any():
+            best_k = int(table.loc[table['silhouette_score'].idxmax(), 'k'])
+        else:
+            best_k = elbow_k
+        
+        self.logger.info(f"Selected k={best_k} ({criterion}); elbow at k={elbow_k}")
+        result = self.perform_clustering(embeddings, method=method, n_clusters=best_k,
+                                         init_centers=centers[best_k], pca_components=None)
+        
+        return {
+            'table': table,
+            'best_k': best_k,
+            'elbow_k': elbow_k,
+            'criterion': criterion,
+            'method': method,
+            'result': result
+        }
+    
+    def _calculate_quality_metrics(self, embeddings: np.ndarray, labels: np.ndarray,
+                                   centroids: Optional[np.ndarray] = None, **kwargs) -> Dict[str, Any]:
+        """
+        Calculate cluster quality metrics as configured in clustering.metrics
+        
+        The 'metrics' entry of the result records the mode and silhouette
+        approximation used ('exact', 'stratified_sample' or 'centroid_simplified').
+        """
+        metrics_config = self.clustering_config.get('metrics', {})
+        return compute_cluster_metrics(
+            embeddings,
+            labels,
+            mode=kwargs.get('metrics_mode', metrics_config.get('mode', 'auto')),
+            sample_size=kwargs.get('metrics_sample_size', metrics_config.get('sample_size', 10000)),
+            n_repeats=metrics_config.get('n_repeats', 5),
+            metric=metrics_config.get('silhouette_metric', 'euclidean'),
+            random_state=metrics_config.get('random_state', 42),
+            centroids=centroids
+        )
+    
     def _perform_kmeans_clustering(self, embeddings: np.ndarray, **kwargs) -> Dict[str, Any]:
         """Perform K-means clustering"""
         kmeans_config = self.clustering_config.get('kmeans', {})
@@ -251,20 +504,22 @@ class SemanticAnalyzer:
         
         self.logger.info(f"Performing K-means clustering with {n_clusters} clusters")
         
+        # Warm start from given centroids (e.g. chosen by select_k)
+        init_centers = kwargs.get('init_centers')
+        
         # Perform clustering
         kmeans = KMeans(
             n_clusters=n_clusters,
             random_state=random_state,
-            init=init,
+            init=init if init_centers is None else np.asarray(init_centers),
             max_iter=max_iter,
-            n_init=10
+            n_init=10 if init_centers is None else 1
         )
         
         labels = kmeans.fit_predict(embeddings)
         
         # Calculate quality metrics
-        silhouette = silhouette_score(embeddings, labels) if len(set(labels)) > 1 else -1
-        calinski_harabasz = calinski_harabasz_score(embeddings, labels) if len(set(labels)) > 1 else 0
+        metrics = self._calculate_quality_metrics(embeddings, labels, kmeans.cluster_centers_, **kwargs)
         
         # Calculate cluster statistics
         cluster_stats = self._calculate_cluster_statistics(embeddings, labels)
@@ -276,8 +531,7 @@ class SemanticAnalyzer:
             'model': kmeans,
             'cluster_centers': kmeans.cluster_centers_.tolist(),
             'inertia': float(kmeans.inertia_),
-            'silhouette_score': float(silhouette),
-            'calinski_harabasz_score': float(calinski_harabasz),
+            **metrics,
             'n_clusters': n_clusters,
             'cluster_statistics': cluster_stats,
             'metadata': {
@@ -318,8 +572,7 @@ class SemanticAnalyzer:
         n_clusters = len(unique_labels) - (1 if -1 in unique_labels else 0)
         n_noise = list(labels).count(-1)
         
-        silhouette = silhouette_score(embeddings, labels) if n_clusters > 1 else -1
-        calinski_harabasz = calinski_harabasz_score(embeddings, labels) if n_clusters > 1 else 0
+        metrics = self._calculate_quality_metrics(embeddings, labels, **kwargs)
         
         # Calculate cluster statistics
         cluster_stats = self._calculate_cluster_statistics(embeddings, labels)
@@ -331,8 +584,7 @@ class SemanticAnalyzer:
             'model': dbscan,
             'n_clusters': n_clusters,
             'n_noise_points': n_noise,
-            'silhouette_score': float(silhouette),
-            'calinski_harabasz_score': float(calinski_harabasz),
+            **metrics,
             'cluster_statistics': cluster_stats,
             'metadata': {
                 'n_samples': len(embeddings),
@@ -346,6 +598,146 @@ class SemanticAnalyzer:
             }
         }
     
+    def _perform_minibatch_kmeans_clustering(self, embeddings: np.ndarray, **kwargs) -> Dict[str, Any]:
+        """Perform MiniBatchKMeans clustering, streaming row chunks through partial_fit"""
+        kmeans_config = self.clustering_config.get('kmeans', {})
+        minibatch_config = self.clustering_config.get('minibatch_kmeans', {})
+        
+        # Get parameters
+        n_clusters = kwargs.get('n_clusters', minibatch_config.get('n_clusters', kmeans_config.get('n_clusters', 10)))
+        random_state = kwargs.get('random_state', minibatch_config.get('random_state', 42))
+        batch_size = kwargs.get('batch_size', minibatch_config.get('batch_size', 4096))
+        max_epochs = kwargs.get('max_epochs', minibatch_config.get('max_epochs', 3))
+        
+        # Ensure reasonable number of clusters
+        n_clusters = min(n_clusters, len(embeddings) - 1)
+        
+        self.logger.info(f"Performing MiniBatchKMeans clustering with {n_clusters} clusters "
+                         f"(batch_size={batch_size}, epochs={max_epochs})")
+        
+        model, labels, inertia = fit_minibatch_kmeans(
+            embeddings,
+            n_clusters,
+            batch_size=batch_size,
+            max_epochs=max_epochs,
+            random_state=random_state,
+            init_centers=kwargs.get('init_centers')
+        )
+        
+        metrics = self._calculate_quality_metrics(embeddings, labels, model.cluster_centers_, **kwargs)
+        cluster_stats = self._calculate_cluster_statistics(embeddings, labels)
+        
+        return {
+            'cluster_labels': labels.tolist(),
+            'labels': labels.tolist(),
+            'method': 'minibatch_kmeans',
+            'model': model,
+            'cluster_centers': model.cluster_centers_.tolist(),
+            'inertia': inertia,
+            **metrics,
+            'n_clusters': n_clusters,
+            'cluster_statistics': cluster_stats,
+            'metadata': {
+                'n_samples': len(embeddings),
+                'n_features': embeddings.shape[1],
+                'parameters': {
+                    'n_clusters': n_clusters,
+                    'random_state': random_state,
+                    'batch_size': batch_size,
+                    'max_epochs': max_epochs
+                }
+            }
+        }
+    
+    def _build_knn_graph(self, embeddings: np.ndarray, **kwargs):
+        """Build the sparse cosine kNN graph used by graph-based clustering"""
+        graph_config = self.clustering_config.get('knn_graph', {})
+        n_neighbors = kwargs.get('n_neighbors', graph_config.get('n_neighbors', 15))
+        backend = kwargs.get('graph_backend', graph_config.get('backend', self.index_config.get('backend', 'auto')))
+        
+        graph = build_knn_graph(
+            embeddings,
+            n_neighbors=n_neighbors,
+            backend=backend,
+            M=self.index_config.get('M', 32),
+            ef_construction=self.index_config.get('ef_construction', 200),
+            ef_search=self.index_config.get('ef_search', 64)
+        )
+        return graph, {'n_neighbors': n_neighbors, 'backend': backend, 'edges': int(graph.nnz)}
+    
+    def _perform_knn_dbscan_clustering(self, embeddings: np.ndarray, **kwargs) -> Dict[str, Any]:
+        """Perform DBSCAN on a precomputed sparse kNN graph"""
+        dbscan_config = self.clustering_config.get('knn_dbscan', self.clustering_config.get('dbscan', {}))
+        
+        # Get parameters
+        eps = kwargs.get('eps', dbscan_config.get('eps', 0.5))
+        min_samples = kwargs.get('min_samples', dbscan_config.get('min_samples', 5))
+        
+        graph, graph_info = self._build_knn_graph(embeddings, **kwargs)
+        
+        self.logger.info(f"Performing kNN-graph DBSCAN clustering with eps={eps}, min_samples={min_samples}")
+        model, labels = dbscan_on_graph(graph, eps=eps, min_samples=min_samples)
+        
+        return self._density_clustering_result(embeddings, labels, 'knn_dbscan', model, {
+            'eps': eps,
+            'min_samples': min_samples,
+            'knn_graph': graph_info
+        }, **kwargs)
+    
+    def _perform_hdbscan_clustering(self, embeddings: np.ndarray, **kwargs) -> Dict[str, Any]:
+        """Perform HDBSCAN on a precomputed sparse kNN graph"""
+        hdbscan_config = self.clustering_config.get('hdbscan', {})
+        
+        # Get parameters
+        min_cluster_size = kwargs.get('min_cluster_size', hdbscan_config.get('min_cluster_size', 15))
+        min_samples = kwargs.get('min_samples', hdbscan_config.get('min_samples', 5))
+        cluster_selection_epsilon = kwargs.get('cluster_selection_epsilon',
+                                               hdbscan_config.get('cluster_selection_epsilon', 0.0))
+        
+        graph, graph_info = self._build_knn_graph(embeddings, **kwargs)
+        
+        self.logger.info(f"Performing kNN-graph HDBSCAN clustering with min_cluster_size={min_cluster_size}")
+        summary, labels = hdbscan_on_graph(
+            graph,
+            min_cluster_size=min_cluster_size,
+            min_samples=min_samples,
+            cluster_selection_epsilon=cluster_selection_epsilon
+        )
+        
+        return self._density_clustering_result(embeddings, labels, 'hdbscan', None, {
+            'min_cluster_size': min_cluster_size,
+            'min_samples': summary['min_samples'],
+            'cluster_selection_epsilon': cluster_selection_epsilon,
+            'knn_graph': {**graph_info, 'components': summary['graph_components']}
+        }, **kwargs)
+    
+    def _density_clustering_result(self, embeddings: np.ndarray, labels: np.ndarray, method: str,
+                                   model: Any, parameters: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        """Assemble the result of a density-based clustering run (noise labelled -1)"""
+        unique_labels = set(labels)
+        n_clusters = len(unique_labels) - (1 if -1 in unique_labels else 0)
+        n_noise = int(np.sum(labels == -1))
+        
+        metrics = self._calculate_quality_metrics(embeddings, labels, **kwargs)
+        cluster_stats = self._calculate_cluster_statistics(embeddings, labels)
+        
+        return {
+            'cluster_labels': labels.tolist(),
+            'labels': labels.tolist(),
+            'method': method,
+            'model': model,
+            'n_clusters': n_clusters,
+            'n_noise_points': n_noise,
+            **metrics,
+            'cluster_statistics': cluster_stats,
+            'metadata': {
+                'n_samples': len(embeddings),
+                'n_features': embeddings.shape[1],
+                'noise_ratio': n_noise / len(embeddings) if len(embeddings) > 0 else 0,
+                'parameters': parameters
+            }
+        }
+    
     def reduce_dimensions(self, 
                          embeddings: np.ndarray, 
                          method: str = 'umap',
@@ -354,11 +746,19 @@ class SemanticAnalyzer:
         """
         Reduce dimensionality of embeddings for visualization
         
+        With a `reducer_key`, the fitted reducer is saved under the embedding cache
+        directory and later calls project embeddings with the saved reducer's
+        `transform`, so adding publications keeps the existing layout.
+        
         Args:
             embeddings: Input embeddings
             method: Reduction method ('umap', 'pca')
             n_components: Number of output components
-            **kwargs: Additional parameters
+            **kwargs: Additional parameters:
+                reducer_key: Name to persist / reuse the fitted reducer under
+                refit: Fit a new reducer even if one is saved under reducer_key
+                fit_sample_size: Fit on a random sample of this many rows and
+                    project the remaining rows afterwards
             
         Returns:
             Reduced embeddings or None if failed
@@ -368,22 +768,47 @@ class SemanticAnalyzer:
             return None
         
         try:
+            if method not in ('umap', 'pca'):
+                raise ValueError(f"Unknown dimension reduction method: {method}")
+            
+            reducer_key = kwargs.pop('reducer_key', None)
+            refit = kwargs.pop('refit', False)
+            if reducer_key and not refit:
+                reducer = self.load_reducer(reducer_key, method, n_components, n_features=embeddings.shape[1])
+                if reducer is not None:
+                    self.logger.info(f"Projecting {len(embeddings)} embeddings with saved {method} reducer '{reducer_key}'")
+                    return self._transform_with_reducer(reducer, embeddings)
+            
             if method == 'umap':
-                return self._reduce_with_umap(embeddings, n_components, **kwargs)
-            elif method == 'pca':
-                return self._reduce_with_pca(embeddings, n_components, **kwargs)
+                reduced, reducer = self._reduce_with_umap(embeddings, n_components, **kwargs)
             else:
-                raise ValueError(f"Unknown dimension reduction method: {method}")
+                reduced, reducer = self._reduce_with_pca(embeddings, n_components, **kwargs)
+            
+            if reducer is not None and reducer_key:
+                self._save_reducer(reducer, reducer_key, method, n_components, embeddings.shape[1])
+            return reduced
                 
         except Exception as e:
             self.logger.error(f"Error in dimension reduction: {e}")
             return None
     
-    def _reduce_with_umap(self, embeddings: np.ndarray, n_components: int, **kwargs) -> Optional[np.ndarray]:
-        """Reduce dimensions using UMAP"""
+    def _fit_sample_rows(self, n_rows: int, fit_sample_size: Optional[int], random_state: Optional[int]) -> Optional[np.ndarray]:
+        """Sorted random rows to fit a reducer on, or None to fit on all rows"""
+        if not fit_sample_size or fit_sample_size >= n_rows:
+            return None
+        rng = np.random.default_rng(random_state)
+        return np.sort(rng.choice(n_rows, size=fit_sample_size, replace=False))
+    
+    def _transform_with_reducer(self, reducer: Any, embeddings: np.ndarray,
+                                chunk_size: int = 65536) -> np.ndarray:
+        """Project embeddings with a fitted reducer, chunk by chunk"""
+        return np.vstack([reducer.transform(chunk) for _, chunk in iter_row_chunks(embeddings, chunk_size)])
+    
+    def _reduce_with_umap(self, embeddings: np.ndarray, n_components: int, **kwargs) -> Tuple[Optional[np.ndarray], Any]:
+        """Reduce dimensions using UMAP, returning the reduced embeddings and fitted reducer"""
         if not UMAP_AVAILABLE:
             self.logger.error("UMAP not available. Install umap-learn package.")
-            return None
+            return None, None
         
         umap_config = self.reduction_config.get('umap', {})
         
@@ -392,11 +817,17 @@ class SemanticAnalyzer:
         min_dist = kwargs.get('min_dist', umap_config.get('min_dist', 0.1))
         metric = kwargs.get('metric', umap_config.get('metric', 'cosine'))
         random_state = kwargs.get('random_state', umap_config.get('random_state', 42))
+        fit_sample_size = kwargs.get('fit_sample_size', umap_config.get('fit_sample_size'))
+        
+        fit_rows = self._fit_sample_rows(len(embeddings), fit_sample_size, random_state)
+        n_fit = len(embeddings) if fit_rows is None else len(fit_rows)
         
         # Ensure n_neighbors is not larger than n_samples
-        n_neighbors = min(n_neighbors, len(embeddings) - 1)
+        n_neighbors = min(n_neighbors, n_fit - 1)
         
-        self.logger.info(f"Reducing dimensions with UMAP to {n_components} components")
+        self.logger.info(f"Reducing dimensions with UMAP to {n_components} components (fitted on {n_fit} rows)")
+        
+        import umap
         
         # Create UMAP reducer
         reducer = umap.UMAP(
@@ -408,110 +839,183 @@ class SemanticAnalyzer:
             verbose=False
         )
         
-        # Fit and transform
-        reduced_embeddings = reducer.fit_transform(embeddings)
+        if fit_rows is None:
+            # Fit and transform
+            reduced_embeddings = reducer.fit_transform(embeddings)
+        else:
+            # Fit on the sample, keep its layout and project the remaining rows
+            reducer.fit(np.asarray(embeddings[fit_rows], dtype=np.float32))
+            reduced_embeddings = np.empty((len(embeddings), n_components), dtype=np.float32)
+            rest = np.setdiff1d(np.arange(len(embeddings)), fit_rows, assume_unique=True)
+            reduced_embeddings[fit_rows] = reducer.embedding_
+            reduced_embeddings[rest] = self._transform_with_reducer(reducer, embeddings[rest])
         
         self.logger.info(f"UMAP reduction completed. Shape: {reduced_embeddings.shape}")
-        return reduced_embeddings
+        return reduced_embeddings, reducer
     
-    def _reduce_with_pca(self, embeddings: np.ndarray, n_components: int, **kwargs) -> np.ndarray:
-        """Reduce dimensions using PCA"""
+    def _reduce_with_pca(self, embeddings: np.ndarray, n_components: int, **kwargs) -> Tuple[np.ndarray, PCA]:
+        """Reduce dimensions using PCA, returning the reduced embeddings and fitted reducer"""
         pca_config = self.reduction_config.get('pca', {})
         
         # Get parameters
         random_state = kwargs.get('random_state', pca_config.get('random_state', 42))
+        fit_sample_size = kwargs.get('fit_sample_size', pca_config.get('fit_sample_size'))
+        
+        fit_rows = self._fit_sample_rows(len(embeddings), fit_sample_size, random_state)
+        fit_data = embeddings if fit_rows is None else np.asarray(embeddings[fit_rows], dtype=np.float32)
         
         # Ensure n_components is not larger than min(n_samples, n_features)
-        max_components = min(embeddings.shape[0], embeddings.shape[1])
+        max_components = min(fit_data.shape[0], fit_data.shape[1])
         n_components = min(n_components, max_components)
         
-        self.logger.info(f"Reducing dimensions with PCA to {n_components} components")
+        self.logger.info(f"Reducing dimensions with PCA to {n_components} components (fitted on {len(fit_data)} rows)")
         
         # Create PCA reducer
         pca = PCA(n_components=n_components, random_state=random_state)
         
         # Fit and transform
-        reduced_embeddings = pca.fit_transform(embeddings)
+        if fit_rows is None:
+            reduced_embeddings = pca.fit_transform(embeddings)
+        else:
+            pca.fit(fit_data)
+            reduced_embeddings = self._transform_with_reducer(pca, embeddings)
         
         # Log explained variance
         explained_variance_ratio = pca.explained_variance_ratio_.sum()
         self.logger.info(f"PCA reduction completed. Explained variance: {explained_variance_ratio:.3f}")
         
-        return reduced_embeddings
+        return reduced_embeddings, pca
     
-    def _calculate_cluster_statistics(self, embeddings: np.ndarray, labels: np.ndarray) -> Dict[str, Any]:
-        """Calculate statistics for each cluster"""
-        cluster_stats = {}
-        unique_labels = set(labels)
+    def _reducer_path(self, reducer_key: str, method: str, n_components: int) -> Path:
+        return self.cache_dir / 'reducers' / f"{reducer_key}_{method}_{n_components}d.joblib"
+    
+    def _save_reducer(self, reducer: Any, reducer_key: str, method: str, n_components: int, n_features: int):
+        """Persist a fitted reducer with a JSON sidecar describing what it was fitted on"""
+        path = self._reducer_path(reducer_key, method, n_components)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            joblib.dump(reducer, path)
+            with open(path.with_suffix('.json'), 'w', encoding='utf-8') as f:
+                json.dump({
+                    'method': method,
+                    'n_components': n_components,
+                    'n_features': int(n_features),
+                    'model_name': self.model_name,
+                    'fitted_at': datetime.now().isoformat()
+                }, f, indent=2)
+            self.reducers[path.name] = reducer
+            self.logger.info(f"Saved {method} reducer to {path}")
+        except Exception as e:
+            self.logger.error(f"Error saving reducer: {e}")
+    
+    def load_reducer(self, reducer_key: str, method: str = 'umap', n_components: int = 2,
+                     n_features: Optional[int] = None, model_name: Optional[str] = None) -> Optional[Any]:
+        """
+        Load a reducer saved by reduce_dimensions
         
-        for label in unique_labels:
-            if label == -1:  # Skip noise points in DBSCAN
-                continue
-                
-            cluster_mask = labels == label
-            cluster_embeddings = embeddings[cluster_mask]
-            
-            if len(cluster_embeddings) == 0:
-                continue
-            
-            # Calculate cluster statistics
-            centroid = np.mean(cluster_embeddings, axis=0)
+        Args:
+            reducer_key: Name the reducer was saved under
+            method: Reduction method ('umap', 'pca')
+            n_components: Number of output components
+            n_features: Expected embedding dimension; a reducer fitted on a
+                different dimension is ignored
+            model_name: Embedding model of the embeddings to project, defaults to
+                the current model; a reducer fitted on another model is ignored
             
-            # Calculate intra-cluster distances
-            distances_to_centroid = np.linalg.norm(cluster_embeddings - centroid, axis=1)
+        Returns:
+            Fitted reducer or None if there is no usable saved reducer
+        """
+        model_name = model_name or self.model_name
+        path = self._reducer_path(reducer_key, method, n_components)
+        if not path.exists():
+            return None
+        
+        try:
+            with open(path.with_suffix('.json'), 'r', encoding='utf-8') as f:
+                info = json.load(f)
+            if n_features is not None and info.get('n_features') != n_features:
+                self.logger.warning(f"Saved reducer '{reducer_key}' was fitted on {info.get('n_features')}-dim "
+                                    f"embeddings, not {n_features}; refitting")
+                return None
+            if info.get('model_name') != model_name:
+                # Same dimension does not mean the same embedding space
+                self.logger.warning(f"Saved reducer '{reducer_key}' was fitted on {info.get('model_name')} "
+                                    f"embeddings, not {model_name}; refitting")
+                return None
             
-            cluster_stats[int(label)] = {
-                'size': int(np.sum(cluster_mask)),
-                'centroid': centroid.tolist(),
-                'mean_distance_to_centroid': float(np.mean(distances_to_centroid)),
-                'std_distance_to_centroid': float(np.std(distances_to_centroid)),
-                'max_distance_to_centroid': float(np.max(distances_to_centroid)),
-                'min_distance_to_centroid': float(np.min(distances_to_centroid))
-            }
+            if path.name not in self.reducers:
+                self.reducers[path.name] = joblib.load(path)
+            return self.reducers[path.name]
+        except Exception as e:
+            self.logger.warning(f"Error loading reducer {path}: {e}")
+            return None
+    
+    def _calculate_cluster_statistics(self, embeddings: np.ndarray, labels: np.ndarray) -> Dict[str, Any]:
+        """
+        Calculate statistics for all clusters at once (noise points are skipped)
         
-        return cluster_stats
+        Returns:
+            Dictionary of arrays aligned with 'cluster_ids': 'sizes', 'centroids'
+            (one n_clusters x n_features ndarray) and mean/std/max/min distance to centroid
+        """
+        return cluster_statistics(embeddings, np.asarray(labels))
     
     def _preprocess_text_for_embedding(self, text: str) -> str:
         """Preprocess text for embedding generation"""
-        if not text or pd.isna(text):
-            return ""
-        
-        # Convert to string and strip
-        text = str(text).strip()
-        
-        # Remove excessive whitespace
-        import re
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Truncate if too long (BGE-M3 has token limits)
-        max_length = self.embedding_config.get('max_length', 512)
-        
-        # Rough estimation: 1 token ≈ 4 characters
-        max_chars = max_length * 4
-        if len(text) > max_chars:
-            text = text[:max_chars]
+        return preprocess_for_embedding(text, self.max_length, self._get_tokenizer())
+    
+    def _get_tokenizer(self) -> Optional[Any]:
+        """Tokenizer of the embedding model (read from the local model cache if the model is not loaded yet)"""
+        if self.embedding_model is not None:
+            return getattr(self.embedding_model, 'tokenizer', None)
         
-        return text
+        if self.tokenizer is None:
+            self.tokenizer = False
+            if SENTENCE_TRANSFORMERS_AVAILABLE:
+                try:
+                    from transformers import AutoTokenizer
+                    self.tokenizer = AutoTokenizer.from_pretrained(self.model_name, cache_dir=self.cache_dir / 'models',
+                                                                   local_files_only=True)
+                except Exception as e:
+                    self.logger.warning(f"Tokenizer not available, truncating texts by character count: {e}")
+        return self.tokenizer or None
     
-    def _load_embeddings_from_cache(self, cache_key: str) -> Optional[np.ndarray]:
-        """Load embeddings from cache file"""
+    def load_cached_embeddings(self, cache_key: str) -> Tuple[Optional[np.ndarray], Dict[str, Any]]:
+        """
+        Load a named embedding snapshot without copying it into memory
+        
+        Args:
+            cache_key: Name the embeddings were saved under
+            
+        Returns:
+            Tuple of (memory-mapped embeddings or None, sidecar metadata with
+            model_name, dimension, dtype and row_ids)
+        """
         try:
-            cache_file = self.cache_dir / f"{cache_key}.pkl"
-            if cache_file.exists():
-                with open(cache_file, 'rb') as f:
-                    embeddings = pickle.load(f)
-                return embeddings
+            if (self.cache_dir / f"{cache_key}.json").exists():
+                return load_embeddings(self.cache_dir / cache_key)
         except Exception as e:
             self.logger.warning(f"Error loading embeddings from cache: {e}")
         
-        return None
+        return None, {}
     
-    def _save_embeddings_to_cache(self, embeddings: np.ndarray, cache_key: str) -> bool:
-        """Save embeddings to cache file"""
+    def _load_embeddings_from_cache(self, cache_key: str) -> Optional[np.ndarray]:
+        """Load embeddings from cache file (memory-mapped)"""
+        embeddings, _ = self.load_cached_embeddings(cache_key)
+        return embeddings
+    
+    def _save_embeddings_to_cache(self, embeddings: np.ndarray, cache_key: str,
+                                  row_ids: Optional[List[str]] = None) -> bool:
+        """Save embeddings to cache file (.npy with JSON sidecar)"""
         try:
-            cache_file = self.cache_dir / f"{cache_key}.pkl"
-            with open(cache_file, 'wb') as f:
-                pickle.dump(embeddings, f)
+            save_embeddings(
+                self.cache_dir / cache_key,
+                embeddings,
+                model_name=self.model_name,
+                row_ids=row_ids,
+                dtype=self.snapshot_dtype,
+                metadata={'max_length': self.max_length}
+            )
             
             self.logger.info(f"Saved embeddings to cache: {cache_key}")
             return True
@@ -520,17 +1024,315 @@ class SemanticAnalyzer:
             self.logger.error(f"Error saving embeddings to cache: {e}")
             return False
     
+    def get_vector_index(self, index_dir: Optional[Union[str, Path]] = None) -> VectorIndex:
+        """
+        Open (or create) the persisted semantic search index
+        
+        Args:
+            index_dir: Index directory, defaults to config vector_index.index_dir
+            
+        Returns:
+            VectorIndex instance
+        """
+        if self.vector_index is None or index_dir is not None:
+            index_dir = index_dir or self.index_config.get('index_dir', str(self.cache_dir / 'vector_index'))
+            self.vector_index = VectorIndex(
+                index_dir,
+                backend=self.index_config.get('backend', 'auto'),
+                M=self.index_config.get('M', 32),
+                ef_construction=self.index_config.get('ef_construction', 200),
+                ef_search=self.index_config.get('ef_search', 64),
+                exact_search_threshold=self.index_config.get('exact_search_threshold', 20000)
+            )
+        return self.vector_index
+    
+    def build_vector_index(self, 
+                         publications_df: pd.DataFrame,
+                         text_column: str = 'abstract',
+                         id_column: str = 'id',
+                         index_dir: Optional[Union[str, Path]] = None) -> Dict[str, Any]:
+        """
+        Add publications to the semantic search index
+        
+        Only publications whose IDs are not yet indexed are embedded and added, so
+        the index can be updated incrementally as new publications arrive.
+        
+        Args:
+            publications_df: Publications with ID, text, and optional date/source columns
+            text_column: Column with the text to embed
+            id_column: Column with unique publication IDs
+            index_dir: Index directory, defaults to config setting
+            
+        Returns:
+            Dictionary with the number of added and total indexed publications
+        """
+        index = self.get_vector_index(index_dir)
+        
+        # Skip indexed publications and publications without text
+        has_text = publications_df[text_column].fillna('').astype(str).str.strip() != ''
+        new_pubs = publications_df[has_text & ~publications_df[id_column].astype(str).isin(index.ids)].copy()
+        if new_pubs.empty:
+            self.logger.info("Vector index is up to date")
+            return {'added': 0, 'total': len(index)}
+        
+        embeddings = self.generate_embeddings(new_pubs[text_column].tolist())
+        if embeddings is None:
+            return {'error': 'Embedding generation failed', 'added': 0, 'total': len(index)}
+        
+        add_date_columns(new_pubs)
+        added = index.add(
+            embeddings,
+            new_pubs[id_column].tolist(),
+            years=new_pubs['year'].tolist(),
+            sources=new_pubs['source'].tolist() if 'source' in new_pubs.columns else None
+        )
+        
+        return {'added': added, 'total': len(index)}
+    
+    def search_similar(self, 
+                     query: Union[str, np.ndarray],
+                     k: int = 10,
+                     filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Find the publications most similar to a text or embedding
+        
+        Args:
+            query: Query text or embedding vector
+            k: Number of results
+            filters: Optional filters: 'year' (int or (start, end)), 'year_min',
+                'year_max', 'source' (string or list)
+            
+        Returns:
+            List of {'id', 'score', 'year', 'source', 'row'} dictionaries, best first
+        """
+        if isinstance(query, str):
+            query_embeddings = self.generate_embeddings([query])
+            if query_embeddings is None:
+                return []
+            query = query_embeddings[0]
+        
+        return self.get_vector_index().search(query, k=k, filters=filters)
+    
+    def build_keyword_synonym_map(self, 
+                                keywords: List[str],
+                                frequencies: Optional[Dict[str, float]] = None,
+                                embed_fn: Optional[Callable[[List[str]], np.ndarray]] = None,
+                                **kwargs) -> Dict[str, Any]:
+        """
+        Group near-synonym keywords into canonical keywords
+        
+        Keywords are merged lexically (spelling, hyphenation, plurals) and then
+        semantically via a thresholded kNN graph over keyword embeddings. Unique
+        keyword strings go through the embedding store, so each is encoded once.
+        Without an embedding model only lexical merging is done.
+        
+        Args:
+            keywords: Keywords (e.g. the 'keyword' column of extracted keywords)
+            frequencies: Optional keyword frequencies, used to choose canonical forms
+            embed_fn: Optional embedding function (defaults to generate_embeddings)
+            **kwargs: similarity_threshold, n_neighbors, backend (default to config
+                keyword_analysis.canonicalization)
+            
+        Returns:
+            Dictionary with 'synonym_map' (variant -> canonical), 'groups' and
+            vocabulary sizes, to be applied with KeywordExtractor.apply_synonym_map
+        """
+        canonicalization_config = self.config.get('keyword_analysis', {}).get('canonicalization', {})
+        
+        def embed_keywords(texts: List[str]) -> np.ndarray:
+            embeddings = (embed_fn or self.generate_embeddings)(texts)
+            if embeddings is None:
+                raise RuntimeError("Keyword embedding failed")
+            return embeddings
+        
+        try:
+            parameters = {
+                'similarity_threshold': kwargs.get('similarity_threshold', canonicalization_config.get('similarity_threshold', 0.9)),
+                'n_neighbors': kwargs.get('n_neighbors', canonicalization_config.get('n_neighbors', 10)),
+                'backend': kwargs.get('backend', canonicalization_config.get('backend', self.index_config.get('backend', 'auto')))
+            }
+            try:
+                result = build_synonym_map(keywords, embed_keywords, frequencies, **parameters)
+                result['semantic'] = True
+            except Exception as e:
+                self.logger.warning(f"Semantic keyword grouping unavailable ({e}), using lexical grouping only")
+                result = build_synonym_map(keywords, None, frequencies, **parameters)
+                result['semantic'] = False
+            result['parameters'] = parameters
+            return result
+        except Exception as e:
+            self.logger.error(f"Error building keyword synonym map: {e}")
+            return {'synonym_map': {}, 'groups': {}, 'error': str(e)}
+    
+    def _cluster_model_dir(self, model_key: str) -> Path:
+        model_root = self.incremental_config.get('model_dir') or self.cache_dir / 'cluster_models'
+        return Path(model_root) / model_key
+    
+    def save_cluster_model(self, 
+                         embeddings: np.ndarray,
+                         clustering_result: Dict[str, Any],
+                         model_key: str = 'default',
+                         row_ids: Optional[List[str]] = None) -> Optional[ClusterModel]:
+        """
+        Persist a clustering run for incremental assignment of new publications
+        
+        Args:
+            embeddings: Embeddings that were clustered (rows aligned with the labels)
+            clustering_result: Result of perform_clustering
+            model_key: Name of the cluster model
+            row_ids: Optional publication IDs, enables neighbour-based assignment
+            
+        Returns:
+            Saved ClusterModel or None if failed
+        """
+        try:
+            return ClusterModel.create(
+                self._cluster_model_dir(model_key),
+                embeddings,
+                clustering_result['labels'],
+                method=clustering_result.get('method', 'kmeans'),
+                parameters=clustering_result.get('metadata', {}).get('parameters', {}),
+                row_ids=row_ids,
+                outlier_z=self.incremental_config.get('outlier_z', 2.5)
+            )
+        except Exception as e:
+            self.logger.error(f"Error saving cluster model: {e}")
+            return None
+    
+    def assign_to_clusters(self, 
+                         new_data: Union[List[str], np.ndarray],
+                         model_key: str = 'default',
+                         ids: Optional[List[str]] = None,
+                         use_neighbors: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Assign new publications to the clusters of a saved cluster model
+        
+        Only the new texts are embedded (already stored texts are read from the
+        embedding store). Each publication gets the nearest centroid, or the
+        majority cluster of its nearest indexed neighbours, and is flagged as an
+        outlier when it lies unusually far from its cluster centroid.
+        
+        Args:
+            new_data: Texts or embeddings of the new publications
+            model_key: Name of the cluster model
+            ids: Optional publication IDs (excluded from their own neighbours)
+            use_neighbors: Vote among vector index neighbours, defaults to config
+                incremental.assignment == 'neighbors'
+            
+        Returns:
+            Dictionary with 'labels', 'distances', 'outliers', 'assigned_by' and
+            the accumulated 'drift' report (including 'recluster_recommended')
+        """
+        model_dir = self._cluster_model_dir(model_key)
+        if not ClusterModel.exists(model_dir):
+            return {'error': f"No cluster model saved under '{model_key}'"}
+        
+        embeddings = new_data
+        if len(new_data) and isinstance(new_data[0], str):
+            embeddings = self.generate_embeddings(list(new_data))
+            if embeddings is None:
+                return {'error': 'Embedding generation failed'}
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        
+        model = ClusterModel(model_dir)
+        if not len(model.cluster_ids):
+            return {'error': f"Cluster model '{model_key}' has no clusters"}
+        if use_neighbors is None:
+            use_neighbors = self.incremental_config.get('assignment', 'centroid') == 'neighbors'
+        
+        neighbor_ids = None
+        if use_neighbors:
+            index = self.get_vector_index()
+            if len(index):
+                k = self.incremental_config.get('n_neighbors', 10)
+                neighbor_ids = []
+                for i, vector in enumerate(embeddings):
+                    own_id = str(ids[i]) if ids is not None else None
+                    results = index.search(vector, k=k + 1)
+                    neighbor_ids.append([r['id'] for r in results if r['id'] != own_id][:k])
+        
+        assignment = model.assign(embeddings, neighbor_ids=neighbor_ids)
+        assignment['drift'] = model.drift_report(self.incremental_config.get('drift_thresholds'))
+        if ids is not None:
+            assignment['ids'] = [str(row_id) for row_id in ids]
+        
+        self.logger.info(f"Assigned {len(embeddings)} publications to {len(model.cluster_ids)} clusters "
+                         f"({int(assignment['outliers'].sum())} outliers)")
+        return assignment
+    
+    def update_clusters(self, 
+                      new_data: Union[List[str], np.ndarray],
+                      model_key: str = 'default',
+                      corpus_embeddings: Optional[np.ndarray] = None,
+                      corpus_ids: Optional[List[str]] = None,
+                      ids: Optional[List[str]] = None,
+                      force_recluster: bool = False) -> Dict[str, Any]:
+        """
+        Incrementally assign new publications, reclustering only when drift requires it
+        
+        Args:
+            new_data: Texts or embeddings of the new publications
+            model_key: Name of the cluster model
+            corpus_embeddings: Embeddings of the full corpus including the new
+                publications (e.g. a memory-mapped snapshot), used for reclustering
+            corpus_ids: Publication IDs of the corpus rows
+            ids: Publication IDs of the new publications
+            force_recluster: Recluster regardless of drift
+            
+        Returns:
+            Dictionary with the 'assignment', whether the corpus was 'reclustered'
+            and the new 'clustering' result if it was
+        """
+        assignment = self.assign_to_clusters(new_data, model_key=model_key, ids=ids)
+        if 'error' in assignment:
+            return assignment
+        
+        needs_recluster = force_recluster or assignment['drift']['recluster_recommended']
+        if not needs_recluster:
+            return {'assignment': assignment, 'reclustered': False}
+        
+        if corpus_embeddings is None:
+            self.logger.warning(f"Drift thresholds crossed ({assignment['drift']['thresholds_crossed']}), "
+                                "but no corpus embeddings were given for reclustering")
+            return {'assignment': assignment, 'reclustered': False}
+        
+        model = ClusterModel(self._cluster_model_dir(model_key))
+        method = model.manifest['method']
+        parameters = {key: value for key, value in model.manifest['parameters'].items() if key != 'knn_graph'}
+        if method in ('kmeans', 'minibatch_kmeans') and parameters.get('n_clusters') == len(model.centroids):
+            parameters['init_centers'] = model.centroids  # Warm start from the current centroids
+        
+        self.logger.info(f"Reclustering {len(corpus_embeddings)} publications with {method}")
+        clustering = self.perform_clustering(corpus_embeddings, method=method, **parameters)
+        if 'error' in clustering.get('metadata', {}):
+            return {'assignment': assignment, 'reclustered': False, 'clustering': clustering}
+        
+        if self.save_cluster_model(corpus_embeddings, clustering, model_key=model_key, row_ids=corpus_ids) is None:
+            # The previous model is kept, e.g. when the new clustering is all noise
+            return {'assignment': assignment, 'reclustered': False, 'clustering': clustering}
+        return {'assignment': assignment, 'reclustered': True, 'clustering': clustering}
+    
     def analyze_cluster_topics(self, 
                              publications_df: pd.DataFrame, 
                              cluster_labels: List[int],
-                             keywords_df: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+                             keywords_df: Optional[pd.DataFrame] = None,
+                             embeddings: Optional[np.ndarray] = None,
+                             include_publications: Optional[bool] = None) -> Dict[str, Any]:
         """
         Analyze topics and characteristics of each cluster
         
+        Topic terms are class-based TF-IDF (c-TF-IDF) weights computed once for all
+        clusters from a sparse document-term matrix; temporal, source and keyword
+        distributions come from single groupby passes over the cluster labels.
+        
         Args:
             publications_df: DataFrame with publication data
             cluster_labels: Cluster assignment for each publication
             keywords_df: Optional keywords DataFrame for topic analysis
+            embeddings: Optional publication embeddings; representative publications
+                are then those closest to the cluster centroid
+            include_publications: Include every publication of a cluster, defaults
+                to config topics.include_publications
             
         Returns:
             Dictionary with cluster topic analysis
@@ -539,70 +1341,90 @@ class SemanticAnalyzer:
             self.logger.error("Mismatch between publications and cluster labels length")
             return {}
         
-        cluster_analysis = {}
+        topics_config = self.semantic_config.get('topics', {})
+        if include_publications is None:
+            include_publications = topics_config.get('include_publications', True)
         
-        # Add cluster labels to publications
+        labels = np.asarray(cluster_labels)
         publications_with_clusters = publications_df.copy()
-        publications_with_clusters['cluster'] = cluster_labels
+        publications_with_clusters['cluster'] = labels
+        if 'publication_date' in publications_with_clusters.columns:
+            add_date_columns(publications_with_clusters)
+        clustered = publications_with_clusters[publications_with_clusters['cluster'] != -1]  # Skip noise cluster
+        if clustered.empty:
+            return {}
         
-        # Analyze each cluster
-        for cluster_id in set(cluster_labels):
-            if cluster_id == -1:  # Skip noise cluster
-                continue
-                
-            cluster_pubs = publications_with_clusters[publications_with_clusters['cluster'] == cluster_id]
-            
-            if cluster_pubs.empty:
-                continue
-            
-            # Basic statistics
+        # Topic terms and representative publications for all clusters at once
+        text_column = 'abstract' if 'abstract' in publications_df.columns else 'title'
+        texts = publications_df[text_column] if text_column in publications_df.columns else [''] * len(labels)
+        topics = label_clusters(
+            list(texts),
+            labels,
+            n_terms=topics_config.get('n_terms', 10),
+            n_representative=topics_config.get('n_representative', 3),
+            embeddings=embeddings,
+            ngram_range=tuple(topics_config.get('ngram_range', [1, 1])),
+            min_df=topics_config.get('min_df', 1)
+        )
+        
+        record_columns = [c for c in ('title', 'doi', 'publication_date') if c in clustered.columns]
+        grouped = clustered.groupby('cluster')
+        
+        year_distribution = {}
+        if 'year' in clustered.columns:
+            year_counts = clustered.dropna(subset=['year']).groupby(['cluster', 'year']).size()
+            year_distribution = {cluster_id: counts.droplevel(0) for cluster_id, counts in year_counts.groupby(level=0)}
+        
+        source_distribution = {}
+        if 'source' in clustered.columns:
+            source_counts = clustered.groupby(['cluster', 'source']).size()
+            source_distribution = {cluster_id: counts.droplevel(0).sort_values(ascending=False)
+                                   for cluster_id, counts in source_counts.groupby(level=0)}
+        
+        top_keywords = {}
+        if keywords_df is not None and 'publication_id' in keywords_df.columns:
+            keyword_clusters = keywords_df['publication_id'].map(publications_with_clusters['cluster'])
+            keyword_counts = (keywords_df.assign(cluster=keyword_clusters)
+                              .dropna(subset=['cluster'])
+                              .query('cluster != -1')
+                              .groupby('cluster')['keyword']
+                              .value_counts())
+            top_keywords = {int(cluster_id): counts.droplevel(0).head(10).to_dict()
+                            for cluster_id, counts in keyword_counts.groupby(level=0)}
+        
+        cluster_analysis = {}
+        for i, cluster_id in enumerate(topics['cluster_ids'].tolist()):
+            size = int(topics['sizes'][i])
+            representative = publications_df.iloc[topics['representative_rows'][i]]
             cluster_info = {
                 'cluster_id': cluster_id,
-                'size': len(cluster_pubs),
-                'percentage': len(cluster_pubs) / len(publications_df) * 100,
-                'publications': cluster_pubs[['title', 'doi', 'publication_date']].to_dict('records')
+                'size': size,
+                'percentage': size / len(publications_df) * 100,
+                'top_terms': topics['top_terms'][i],
+                'top_abstract_words': topics['top_words'][i],
+                'representative_publications': representative[
+                    [c for c in record_columns if c in representative.columns]
+                ].to_dict('records')
             }
+            if include_publications:
+                cluster_info['publications'] = grouped.get_group(cluster_id)[record_columns].to_dict('records')
             
             # Temporal analysis
-            if 'publication_date' in cluster_pubs.columns:
-                years = cluster_pubs['publication_date'].apply(self._extract_year_from_date).dropna()
-                if not years.empty:
-                    cluster_info['temporal_span'] = {
-                        'first_year': int(years.min()),
-                        'last_year': int(years.max()),
-                        'year_distribution': years.value_counts().to_dict()
-                    }
+            if cluster_id in year_distribution:
+                years = year_distribution[cluster_id]
+                cluster_info['temporal_span'] = {
+                    'first_year': int(years.index.min()),
+                    'last_year': int(years.index.max()),
+                    'year_distribution': years.sort_values(ascending=False).to_dict()
+                }
             
             # Source analysis
-            if 'source' in cluster_pubs.columns:
-                source_dist = cluster_pubs['source'].value_counts()
-                cluster_info['source_distribution'] = source_dist.to_dict()
+            if cluster_id in source_distribution:
+                cluster_info['source_distribution'] = source_distribution[cluster_id].to_dict()
             
             # Keywords analysis for this cluster
-            if keywords_df is not None and 'publication_id' in keywords_df.columns:
-                cluster_pub_ids = cluster_pubs.index.tolist()
-                cluster_keywords = keywords_df[keywords_df['publication_id'].isin(cluster_pub_ids)]
-                
-                if not cluster_keywords.empty:
-                    top_keywords = cluster_keywords['keyword'].value_counts().head(10)
-                    cluster_info['top_keywords'] = top_keywords.to_dict()
-            
-            # Abstract analysis (if available)
-            if 'abstract' in cluster_pubs.columns:
-                abstracts = cluster_pubs['abstract'].dropna()
-                if not abstracts.empty:
-                    # Simple word frequency analysis
-                    all_text = ' '.join(abstracts.astype(str))
-                    words = all_text.lower().split()
-                    word_freq = Counter(words)
-                    
-                    # Filter out common words
-                    common_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'been', 'be', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'can', 'this', 'that', 'these', 'those'}
-                    filtered_words = {word: count for word, count in word_freq.items() 
-                                    if word not in common_words and len(word) > 3}
-                    
-                    top_words = dict(Counter(filtered_words).most_common(10))
-                    cluster_info['top_abstract_words'] = top_words
+            if cluster_id in top_keywords:
+                cluster_info['top_keywords'] = top_keywords[cluster_id]
             
             cluster_analysis[cluster_id] = cluster_info
         
@@ -610,28 +1432,4 @@ class SemanticAnalyzer:
     
     def _extract_year_from_date(self, date_str: Union[str, int]) -> Optional[int]:
         """Extract year from date string - same as in KeywordExtractor"""
-        if pd.isna(date_str):
-            return None
-        
-        try:
-            if isinstance(date_str, int):
-                if 1900 <= date_str <= 2030:
-                    return date_str
-                else:
-                    return None
-            
-            date_str = str(date_str).strip()
-            
-            import re
-            year_match = re.search(r'\b(19|20)\d{2}\b', date_str)
-            if year_match:
-                return int(year_match.group())
-            
-            if len(date_str) >= 4 and date_str[:4].isdigit():
-                year = int(date_str[:4])
-                if 1900 <= year <= 2030:
-                    return year
-            
-            return None
-        except (ValueError, TypeError):
-            return None
+        return parse_year(date_str)
@@ -0,0 +1,312 @@
+"""
+Streaming Temporal Aggregation for Keyword Analysis
+
+Accumulates keyword x month publication counts incrementally from chunks of
+publications, so temporal statistics can be computed for corpora that do not
+fit in memory. Memory is bounded by vocabulary size x number of months, not by
+the number of publications.
+"""
+
+import ast
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .date_normalization import extract_publication_date_parts
+
+logger = logging.getLogger(__name__)
+
+# File formats understood by `TemporalAggregator.consume_partitions`
+PARTITION_SUFFIXES = ('.jsonl', '.ndjson', '.json', '.csv', '.parquet')
+
+_KEYWORD_SEPARATORS = (';', '|', ',')
+
+
+def _parse_keyword_field(value: Any) -> List[str]:
+    """Normalize a raw 'keywords' field (list, stringified list or delimited string) to a list."""
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple, set, np.ndarray)):
+        return [str(kw) for kw in value if kw is not None and str(kw).strip()]
+    if isinstance(value, float) and np.isnan(value):
+        return []
+
+    text = str(value).strip()
+    if text.startswith('[') and text.endswith(']'):
+        try:
+            parsed = ast.literal_eval(text)
+            if isinstance(parsed, (list, tuple)):
+                return [str(kw) for kw in parsed if kw is not None and str(kw).strip()]
+        except (ValueError, SyntaxError):
+            text = text[1:-1]
+
+    for separator in _KEYWORD_SEPARATORS:
+        if separator in text:
+            return [kw.strip() for kw in text.split(separator) if kw.strip()]
+    return [text] if text else []
+
+
+def extract_publication_keywords(publication: Dict, keywords: Dict) -> List[str]:
+    """
+    Extract keywords associated with a publication.
+
+    Combines the publication's own 'keywords' field with every keyword from
+    `keywords['all_keywords']` that occurs in its title or abstract.
+    """
+    pub_keywords = _parse_keyword_field(publication.get('keywords'))
+
+    vocabulary = keywords.get('all_keywords', []) if keywords else []
+    if vocabulary:
+        text_content = ' '.join([
+            str(publication.get('title') or ''),
+            str(publication.get('abstract') or '')
+        ]).lower()
+
+        for keyword in vocabulary:
+            if keyword.lower() in text_content:
+                pub_keywords.append(keyword)
+
+    return list(set(pub_keywords))
+
+
+def _iter_partition_files(paths: Union[str, Path, Sequence[Union[str, Path]]]) -> Iterator[Path]:
+    """Yield partition files from paths or directories, sorted for reproducible order."""
+    if isinstance(paths, (str, Path)):
+        paths = [paths]
+
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            for file_path in sorted(path.rglob('*')):
+                if file_path.suffix.lower() in PARTITION_SUFFIXES:
+                    yield file_path
+        elif path.suffix.lower() in PARTITION_SUFFIXES:
+            yield path
+        else:
+            logger.warning(f"Skipping unsupported partition: {path}")
+
+
+def _iter_publication_chunks(path: Path, chunk_size: int) -> Iterator[List[Dict]]:
+    """Yield lists of at most `chunk_size` publication dictionaries from one partition file."""
+    suffix = path.suffix.lower()
+
+    if suffix in ('.jsonl', '.ndjson'):
+        chunk = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    chunk.append(json.loads(line))
+                    if len(chunk) >= chunk_size:
+                        yield chunk
+                        chunk = []
+        if chunk:
+            yield chunk
+
+    elif suffix == '.json':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = data.get('results', data.get('publications', [data]))
+        for start in range(0, len(data), chunk_size):
+            yield data[start:start + chunk_size]
+
+    elif suffix == '.csv':
+        for chunk_df in pd.read_csv(path, chunksize=chunk_size):
+            yield chunk_df.to_dict('records')
+
+    elif suffix == '.parquet':
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("pyarrow is required to read parquet partitions")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pylist()
+
+
+class TemporalAggregator:
+    """
+    Incremental keyword x month count accumulator.
+
+    Features:
+    - Chunked ingestion of publication dictionaries or DataFrames
+    - Streaming reads of year-partitioned JSON/JSONL/CSV/Parquet files
+    - Keyword x month and publication x month count matrices
+    - Save/load of aggregates for resumable processing
+    """
+
+    def __init__(self, keywords: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the TemporalAggregator.
+
+        Args:
+            keywords: Keywords with their metadata; `all_keywords` entries are matched
+                against titles and abstracts, as in TemporalAnalyzer
+        """
+        self.keywords = keywords or {}
+        self.vocabulary: Dict[str, int] = {}
+
+        self._counts = np.zeros((0, 0), dtype=np.int32)
+        self._publication_counts = np.zeros(0, dtype=np.int64)
+        self._start_month: Optional[int] = None  # Month ordinal: year * 12 + month - 1
+
+        self.total_publications = 0
+        self.undated_publications = 0
+
+    def add_publications(self, publications: Union[Iterable[Dict], pd.DataFrame]) -> 'TemporalAggregator':
+        """
+        Accumulate counts from a chunk of publications.
+
+        Args:
+            publications: Iterable of publication dictionaries or a DataFrame chunk
+
+        Returns:
+            self, for chaining
+        """
+        if isinstance(publications, pd.DataFrame):
+            publications = publications.to_dict('records')
+
+        keyword_rows, keyword_months, publication_months = [], [], []
+        for pub in publications:
+            self.total_publications += 1
+            year, month, _ = extract_publication_date_parts(pub)
+            if year is None:
+                self.undated_publications += 1
+                continue
+
+            ordinal = year * 12 + (month or 1) - 1
+            publication_months.append(ordinal)
+            for keyword in extract_publication_keywords(pub, self.keywords):
+                keyword_rows.append(self.vocabulary.setdefault(keyword, len(self.vocabulary)))
+                keyword_months.append(ordinal)
+
+        if not publication_months:
+            return self
+
+        publication_months = np.asarray(publication_months, dtype=np.int64)
+        self._ensure_capacity(len(self.vocabulary), int(publication_months.min()), int(publication_months.max()))
+
+        np.add.at(self._publication_counts, publication_months - self._start_month, 1)
+        if keyword_rows:
+            np.add.at(
+                self._counts,
+                (np.asarray(keyword_rows), np.asarray(keyword_months, dtype=np.int64) - self._start_month),
+                1
+            )
+        return self
+
+    def consume_partitions(self, paths: Union[str, Path, Sequence[Union[str, Path]]],
+                           chunk_size: int = 10000) -> 'TemporalAggregator':
+        """
+        Stream publications from partition files in chunks and accumulate counts.
+
+        Args:
+            paths: Partition file(s) or directories (searched recursively), e.g. one
+                directory or file per publication year
+            chunk_size: Maximum number of publications held in memory at once
+
+        Returns:
+            self, for chaining
+        """
+        for path in _iter_partition_files(paths):
+            before = self.total_publications
+            for chunk in _iter_publication_chunks(path, chunk_size):
+                self.add_publications(chunk)
+            logger.info(f"Aggregated {self.total_publications - before} publications from {path}")
+        return self
+
+    def _ensure_capacity(self, n_keywords: int, first_month: int, last_month: int):
+        """Grow the count arrays to cover the vocabulary and month range."""
+        if self._start_month is None:
+            self._start_month = first_month
+
+        start = min(self._start_month, first_month)
+        n_months = max(self._start_month + self._counts.shape[1], last_month + 1) - start
+        rows = self._counts.shape[0]
+        if n_keywords > rows:
+            rows = max(n_keywords, 2 * rows, 64)  # Amortized vocabulary growth
+
+        if rows == self._counts.shape[0] and start == self._start_month and n_months == self._counts.shape[1]:
+            return
+
+        offset = self._start_month - start
+        counts = np.zeros((rows, n_months), dtype=self._counts.dtype)
+        counts[:self._counts.shape[0], offset:offset + self._counts.shape[1]] = self._counts
+        publication_counts = np.zeros(n_months, dtype=self._publication_counts.dtype)
+        publication_counts[offset:offset + len(self._publication_counts)] = self._publication_counts
+
+        self._counts = counts
+        self._publication_counts = publication_counts
+        self._start_month = start
+
+    @property
+    def keyword_list(self) -> List[str]:
+        """Keywords in row order."""
+        return list(self.vocabulary)
+
+    @property
+    def periods(self) -> pd.PeriodIndex:
+        """Monthly periods covered by the aggregates."""
+        if self._start_month is None:
+            return pd.PeriodIndex([], freq='M')
+        return pd.period_range(
+            start=pd.Period(year=self._start_month // 12, month=self._start_month % 12 + 1, freq='M'),
+            periods=self._counts.shape[1],
+            freq='M'
+        )
+
+    @property
+    def counts(self) -> np.ndarray:
+        """Keyword x month count matrix (view, rows follow `keyword_list`)."""
+        return self._counts[:len(self.vocabulary)]
+
+    @property
+    def publication_counts(self) -> pd.Series:
+        """Publications per month."""
+        return pd.Series(self._publication_counts, index=self.periods)
+
+    def count_matrix(self, min_occurrences: int = 1) -> Tuple[List[str], pd.PeriodIndex, np.ndarray]:
+        """
+        Get the keyword x month matrix restricted to sufficiently frequent keywords.
+
+        Returns:
+            Tuple of (keywords, monthly PeriodIndex, float counts array)
+        """
+        counts = self.counts
+        keep = np.flatnonzero(counts.sum(axis=1) >= min_occurrences)
+        keywords = self.keyword_list
+        return [keywords[i] for i in keep], self.periods, counts[keep].astype(float)
+
+    def yearly_counts(self) -> pd.DataFrame:
+        """Keyword x year count matrix as a DataFrame."""
+        periods = self.periods
+        frame = pd.DataFrame(self.counts.T, index=periods.year, columns=self.keyword_list)
+        return frame.groupby(level=0).sum().T
+
+    def save(self, path: Union[str, Path]) -> str:
+        """Save aggregates to a compressed .npz file."""
+        np.savez_compressed(
+            path,
+            vocabulary=np.array(self.keyword_list, dtype=str),  # Unicode array: loads without pickle
+            counts=self.counts,
+            publication_counts=self._publication_counts,
+            start_month=np.array(-1 if self._start_month is None else self._start_month),
+            totals=np.array([self.total_publications, self.undated_publications])
+        )
+        return str(path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path], keywords: Optional[Dict[str, Any]] = None) -> 'TemporalAggregator':
+        """Load aggregates saved with `save`, e.g. to resume ingestion."""
+        data = np.load(path)
+        aggregator = cls(keywords)
+        aggregator.vocabulary = {str(kw): i for i, kw in enumerate(data['vocabulary'])}
+        aggregator._counts = data['counts'].astype(np.int32)
+        aggregator._publication_counts = data['publication_counts']
+        start_month = int(data['start_month'])
+        aggregator._start_month = None if start_month < 0 else start_month
+        aggregator.total_publications, aggregator.undated_publications = (int(v) for v in data['totals'])
+        return aggregator
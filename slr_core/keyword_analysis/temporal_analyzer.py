@@ -8,7 +8,9 @@ import numpy as np
 from typing import Dict, List, Tuple, Optional, Any, Union
 from datetime import datetime, timedelta
 import logging
-from collections import defaultdict, Counter
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import os
 from scipy import stats
 from scipy.stats import mannwhitneyu, kruskal
 from sklearn.preprocessing import StandardScaler
@@ -17,6 +19,9 @@ from sklearn.cluster import KMeans
 import warnings
 warnings.filterwarnings('ignore')
 
+from .date_normalization import extract_publication_date_parts
+from .temporal_aggregator import TemporalAggregator, extract_publication_keywords
+
 logger = logging.getLogger(__name__)
 
 class TemporalAnalyzer:
@@ -48,6 +53,24 @@ class TemporalAnalyzer:
         self.seasonal_periods = self.temporal_config.get('seasonal_periods', [12, 6, 3])  # months
         self.change_point_threshold = self.temporal_config.get('change_point_threshold', 0.05)
         
+        # Pattern detection parameters ('batched' = FFT over the keyword x month matrix,
+        # 'per_keyword' = legacy per-series detection)
+        self.pattern_detection_mode = self.temporal_config.get('pattern_detection_mode', 'batched')
+        self.seasonality_threshold = self.temporal_config.get('seasonality_threshold', 0.3)
+        
+        # Parallel execution settings for run_all
+        self.parallel_config = self.temporal_config.get('parallel', {})
+        self.max_workers = self.parallel_config.get('max_workers', None)  # None = os.cpu_count()
+        self.chunk_size = self.parallel_config.get('chunk_size', 250)  # keywords per task
+        
+        # Streaming (out-of-core) aggregation settings
+        self.streaming_config = self.temporal_config.get('streaming', {})
+        self.streaming_chunk_size = self.streaming_config.get('chunk_size', 10000)  # publications per chunk
+        
+        # Sliding comparison periods (years); overrides time_periods when period_window is set
+        self.period_window = self.temporal_config.get('period_window', None)
+        self.period_step = self.temporal_config.get('period_step', None)  # None = window (non-overlapping)
+        
         # Time period definitions
         self.time_periods = self.temporal_config.get('time_periods', {
             'early': {'start': 2010, 'end': 2015},
@@ -88,13 +111,7 @@ class TemporalAnalyzer:
                     trend_results[keyword] = self._analyze_single_keyword_trend(keyword, data)
             
             # Aggregate results
-            self.keyword_trends = {
-                'individual_trends': trend_results,
-                'summary_statistics': self._calculate_trend_summary(trend_results),
-                'top_growing_keywords': self._identify_growing_keywords(trend_results),
-                'declining_keywords': self._identify_declining_keywords(trend_results),
-                'stable_keywords': self._identify_stable_keywords(trend_results)
-            }
+            self.keyword_trends = self._aggregate_keyword_trends(trend_results)
             
             logger.info(f"Analyzed trends for {len(trend_results)} keywords")
             return self.keyword_trends
@@ -127,30 +144,11 @@ class TemporalAnalyzer:
                 return {'error': 'No valid publication dates found'}
             
             # Create time series
-            df = pd.DataFrame({'date': pub_dates})
-            df['year'] = df['date'].dt.year
-            df['month'] = df['date'].dt.month
-            df['year_month'] = df['date'].dt.to_period('M')
+            monthly_counts = pd.Series(pub_dates).dt.to_period('M').value_counts().sort_index()
             
-            # Analyze publication volume trends
-            volume_trends = self._analyze_publication_volume(df)
-            
-            # Analyze seasonal patterns
-            seasonal_patterns = self._analyze_seasonal_patterns(df)
-            
-            # Analyze growth rates
-            growth_analysis = self._analyze_growth_rates(df)
-            
-            self.publication_trends = {
-                'volume_trends': volume_trends,
-                'seasonal_patterns': seasonal_patterns,
-                'growth_analysis': growth_analysis,
-                'total_publications': len(publications),
-                'date_range': {
-                    'start': min(pub_dates).strftime('%Y-%m-%d'),
-                    'end': max(pub_dates).strftime('%Y-%m-%d')
-                }
-            }
+            self.publication_trends = self._publication_trends_from_monthly_counts(
+                monthly_counts, len(publications), min(pub_dates), max(pub_dates)
+            )
             
             logger.info(f"Analyzed publication trends for {len(publications)} publications")
             return self.publication_trends
@@ -159,35 +157,38 @@ class TemporalAnalyzer:
             logger.error(f"Error in publication trend analysis: {str(e)}")
             raise
     
-    def detect_temporal_patterns(self, publications: List[Dict], keywords: Dict[str, Any]) -> Dict[str, Any]:
+    def detect_temporal_patterns(self, publications: List[Dict], keywords: Dict[str, Any],
+                                 mode: Optional[str] = None) -> Dict[str, Any]:
         """
         Detect temporal patterns and anomalies in keyword usage.
         
         Args:
             publications: List of publication dictionaries
             keywords: Keywords with their metadata
+            mode: Detection mode ('batched' or 'per_keyword'), defaults to config setting
             
         Returns:
             Dictionary containing pattern detection results
         """
-        logger.info("Starting temporal pattern detection")
+        mode = mode or self.pattern_detection_mode
+        logger.info(f"Starting temporal pattern detection (mode={mode})")
         
         try:
             # Prepare data for pattern detection
             temporal_data = self._prepare_temporal_data(publications, keywords)
             
-            patterns = {}
-            for keyword, data in temporal_data.items():
-                if len(data) >= self.min_occurrences:
-                    patterns[keyword] = self._detect_keyword_patterns(keyword, data)
+            if mode == 'batched':
+                patterns = self._detect_patterns_batched(temporal_data)
+            elif mode == 'per_keyword':
+                patterns = {}
+                for keyword, data in temporal_data.items():
+                    if len(data) >= self.min_occurrences:
+                        patterns[keyword] = self._detect_keyword_patterns(keyword, data)
+            else:
+                raise ValueError(f"Unknown pattern detection mode: {mode}")
             
             # Aggregate pattern analysis
-            self.temporal_patterns = {
-                'keyword_patterns': patterns,
-                'pattern_summary': self._summarize_patterns(patterns),
-                'anomalies': self._detect_anomalies(patterns),
-                'change_points': self._detect_change_points(patterns)
-            }
+            self.temporal_patterns = self._aggregate_patterns(patterns)
             
             logger.info(f"Detected patterns for {len(patterns)} keywords")
             return self.temporal_patterns
@@ -218,15 +219,7 @@ class TemporalAnalyzer:
                     lifecycle_results[keyword] = self._analyze_keyword_lifecycle(keyword, data)
             
             # Categorize keywords by lifecycle stage
-            lifecycle_categories = self._categorize_lifecycle_stages(lifecycle_results)
-            
-            self.lifecycle_analysis = {
-                'individual_lifecycles': lifecycle_results,
-                'lifecycle_categories': lifecycle_categories,
-                'emerging_keywords': lifecycle_categories.get('emerging', []),
-                'mature_keywords': lifecycle_categories.get('mature', []),
-                'declining_keywords': lifecycle_categories.get('declining', [])
-            }
+            self.lifecycle_analysis = self._aggregate_lifecycles(lifecycle_results)
             
             logger.info(f"Analyzed lifecycle for {len(lifecycle_results)} keywords")
             return self.lifecycle_analysis
@@ -235,13 +228,20 @@ class TemporalAnalyzer:
             logger.error(f"Error in keyword lifecycle analysis: {str(e)}")
             raise
     
-    def compare_time_periods(self, publications: List[Dict], keywords: Dict[str, Any]) -> Dict[str, Any]:
+    def compare_time_periods(self, publications: List[Dict], keywords: Dict[str, Any],
+                             time_periods: Optional[Dict[str, Dict[str, int]]] = None) -> Dict[str, Any]:
         """
         Compare keyword usage across different time periods.
         
+        Keyword counts are accumulated once into a keyword x year matrix and summed
+        into a keyword x period matrix, so any number of (possibly overlapping)
+        periods is compared with array operations.
+        
         Args:
             publications: List of publication dictionaries
             keywords: Keywords with their metadata
+            time_periods: Period definitions ({name: {'start': year, 'end': year}}),
+                defaults to config time_periods or sliding windows if period_window is set
             
         Returns:
             Dictionary containing comparative analysis results
@@ -249,44 +249,292 @@ class TemporalAnalyzer:
         logger.info("Starting time period comparison")
         
         try:
-            # Prepare data for each time period
-            period_data = {}
-            for period_name, period_config in self.time_periods.items():
-                period_pubs = self._filter_publications_by_period(publications, period_config)
-                period_keywords = self._extract_keywords_from_publications(period_pubs, keywords)
-                period_data[period_name] = period_keywords
+            aggregator = TemporalAggregator(keywords).add_publications(publications)
+            yearly_counts = aggregator.yearly_counts()
+            
+            period_counts = self._period_count_matrix(yearly_counts, time_periods)
+            self.comparative_analysis = self._compare_period_matrix(period_counts)
+            
+            logger.info(f"Completed comparison across {period_counts.shape[1]} time periods")
+            return self.comparative_analysis
+            
+        except Exception as e:
+            logger.error(f"Error in time period comparison: {str(e)}")
+            raise
+    
+    def _resolve_time_periods(self, years: pd.Index,
+                              time_periods: Optional[Dict[str, Dict[str, int]]] = None) -> Dict[str, Dict[str, int]]:
+        """
+        Get period definitions: explicit, sliding windows over the observed years, or config defaults.
+        
+        When `period_step` does not line up with the observed span, a final window
+        ending at the last observed year is added (overlapping the previous one), so
+        trailing years always fall in a period.
+        """
+        if time_periods:
+            return time_periods
+        if not self.period_window or len(years) == 0:
+            return self.time_periods
+        
+        first_year, last_year = int(min(years)), int(max(years))
+        window = self.period_window
+        step = self.period_step or window
+        
+        periods = {}
+        for start in range(first_year, max(last_year - window + 1, first_year) + 1, step):
+            end = start + window - 1
+            periods[f"{start}-{end}"] = {'start': start, 'end': end}
+        
+        if end < last_year:
+            start = last_year - window + 1
+            periods[f"{start}-{last_year}"] = {'start': start, 'end': last_year}
+        return periods
+    
+    def _period_count_matrix(self, yearly_counts: pd.DataFrame,
+                             time_periods: Optional[Dict[str, Dict[str, int]]] = None) -> pd.DataFrame:
+        """Sum a keyword x year count matrix into a keyword x period matrix."""
+        periods = self._resolve_time_periods(yearly_counts.columns, time_periods)
+        years = yearly_counts.columns.to_numpy()
+        
+        # Year x period membership; overlapping periods are allowed
+        membership = np.array([
+            (years >= config['start']) & (years <= config['end']) for config in periods.values()
+        ], dtype=np.int64).reshape(len(periods), len(years)).T
+        
+        return pd.DataFrame(
+            yearly_counts.to_numpy(dtype=np.int64) @ membership,
+            index=yearly_counts.index,
+            columns=list(periods)
+        )
+    
+    def _compare_period_matrix(self, period_counts: pd.DataFrame) -> Dict[str, Any]:
+        """Compare keyword counts across periods given a keyword x period count matrix."""
+        keywords = period_counts.index.to_numpy(dtype=object)
+        counts = period_counts.to_numpy(dtype=np.int64)
+        period_names = list(period_counts.columns)
+        
+        period_data = {}
+        for j, period_name in enumerate(period_names):
+            present = np.flatnonzero(counts[:, j])
+            period_data[period_name] = dict(zip(keywords[present].tolist(), counts[present, j].tolist()))
+        
+        # Perform comparative analysis
+        comparisons = {}
+        for i, period1 in enumerate(period_names):
+            for j in range(i + 1, len(period_names)):
+                period2 = period_names[j]
+                comparisons[f"{period1}_vs_{period2}"] = self._compare_keyword_sets(
+                    keywords, counts[:, i], counts[:, j], period1, period2
+                )
+        
+        # Statistical significance testing
+        statistical_tests = self._perform_statistical_tests(period_names, counts)
+        
+        return {
+            'period_data': period_data,
+            'pairwise_comparisons': comparisons,
+            'statistical_tests': statistical_tests,
+            'overall_trends': self._analyze_overall_trends(period_data)
+        }
+    
+    def run_all(self, publications: List[Dict], keywords: Dict[str, Any],
+                max_workers: Optional[int] = None, chunk_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Run all temporal analyses concurrently.
+        
+        Publication trends, period comparison and pattern detection run in threads
+        while per-keyword trend and lifecycle analysis is fanned out across a process
+        pool in chunks of keywords. Temporal data is prepared only once.
+        
+        Args:
+            publications: List of publication dictionaries
+            keywords: Keywords with their metadata
+            max_workers: Number of worker processes, defaults to config / CPU count
+            chunk_size: Number of keywords per worker task, defaults to config setting
+            
+        Returns:
+            Combined results dictionary in the layout expected by Visualizer
+        """
+        max_workers = max_workers or self.max_workers or os.cpu_count() or 1
+        chunk_size = chunk_size or self.chunk_size
+        logger.info(f"Running all temporal analyses with {max_workers} workers")
+        
+        try:
+            temporal_data = self._prepare_temporal_data(publications, keywords)
+            eligible = [(kw, data) for kw, data in temporal_data.items() if len(data) >= self.min_occurrences]
+            chunks = [eligible[i:i + chunk_size] for i in range(0, len(eligible), chunk_size)]
+            per_keyword_patterns = self.pattern_detection_mode == 'per_keyword'
+            
+            process_pool = None
+            if max_workers > 1 and len(chunks) > 1:
+                # Submit chunk tasks before starting any threads so worker processes
+                # are forked from a single-threaded parent
+                process_pool = ProcessPoolExecutor(max_workers=min(max_workers, len(chunks)))
+                chunk_futures = [
+                    process_pool.submit(_analyze_keyword_chunk, self.config, chunk, per_keyword_patterns)
+                    for chunk in chunks
+                ]
             
-            # Perform comparative analysis
-            comparisons = {}
-            period_names = list(period_data.keys())
+            try:
+                with ThreadPoolExecutor(max_workers=3) as thread_pool:
+                    publication_future = thread_pool.submit(self.analyze_publication_trends, publications)
+                    comparison_future = thread_pool.submit(self.compare_time_periods, publications, keywords)
+                    batched_future = None
+                    if not per_keyword_patterns:
+                        batched_future = thread_pool.submit(self._detect_patterns_batched, temporal_data)
+                    
+                    if process_pool is not None:
+                        chunk_results = [future.result() for future in chunk_futures]
+                    else:
+                        chunk_results = [_analyze_keyword_chunk(self.config, chunk, per_keyword_patterns) for chunk in chunks]
+                    
+                    publication_trends = publication_future.result()
+                    comparative_analysis = comparison_future.result()
+                    batched_patterns = batched_future.result() if batched_future is not None else None
+            finally:
+                if process_pool is not None:
+                    process_pool.shutdown()
             
-            for i, period1 in enumerate(period_names):
-                for period2 in period_names[i+1:]:
-                    comparison_key = f"{period1}_vs_{period2}"
-                    comparisons[comparison_key] = self._compare_keyword_sets(
-                        period_data[period1], 
-                        period_data[period2],
-                        period1,
-                        period2
-                    )
+            trend_results, lifecycle_results, patterns = {}, {}, {}
+            for chunk_trends, chunk_lifecycles, chunk_patterns in chunk_results:
+                trend_results.update(chunk_trends)
+                lifecycle_results.update(chunk_lifecycles)
+                patterns.update(chunk_patterns)
+            if batched_patterns is not None:
+                patterns = batched_patterns
             
-            # Statistical significance testing
-            statistical_tests = self._perform_statistical_tests(period_data)
+            self.keyword_trends = self._aggregate_keyword_trends(trend_results)
+            self.lifecycle_analysis = self._aggregate_lifecycles(lifecycle_results)
+            self.temporal_patterns = self._aggregate_patterns(patterns)
             
-            self.comparative_analysis = {
-                'period_data': period_data,
-                'pairwise_comparisons': comparisons,
-                'statistical_tests': statistical_tests,
-                'overall_trends': self._analyze_overall_trends(period_data)
+            logger.info(f"Completed all temporal analyses for {len(eligible)} keywords in {len(chunks)} chunks")
+            return {
+                'temporal_analysis': self.keyword_trends,
+                'temporal_patterns': self.temporal_patterns,
+                'lifecycle_analysis': self.lifecycle_analysis,
+                'publication_trends': publication_trends,
+                'comparative_analysis': comparative_analysis
             }
             
-            logger.info(f"Completed comparison across {len(self.time_periods)} time periods")
-            return self.comparative_analysis
+        except Exception as e:
+            logger.error(f"Error running temporal analyses: {str(e)}")
+            raise
+    
+    def aggregate_partitions(self, paths: Union[str, List[str]], keywords: Dict[str, Any],
+                             chunk_size: Optional[int] = None) -> TemporalAggregator:
+        """
+        Stream partitioned publication files into keyword x month aggregates.
+        
+        Args:
+            paths: Partition file(s) or directories, e.g. one JSONL/CSV/Parquet file per year
+            keywords: Keywords with their metadata
+            chunk_size: Publications read per chunk, defaults to config setting
+            
+        Returns:
+            TemporalAggregator holding the accumulated counts
+        """
+        chunk_size = chunk_size or self.streaming_chunk_size
+        logger.info(f"Aggregating partitioned publications (chunk_size={chunk_size})")
+        
+        aggregator = TemporalAggregator(keywords)
+        aggregator.consume_partitions(paths, chunk_size=chunk_size)
+        
+        logger.info(f"Aggregated {aggregator.total_publications} publications "
+                    f"({aggregator.undated_publications} undated) into {len(aggregator.vocabulary)} keywords")
+        return aggregator
+    
+    def analyze_aggregates(self, aggregator: TemporalAggregator) -> Dict[str, Any]:
+        """
+        Run all temporal analyses from streamed keyword x month aggregates.
+        
+        Trend, lifecycle, pattern, publication trend and period comparison results
+        are computed from counts only, so memory is bounded by vocabulary x months.
+        Dates are known at month resolution, so first/last occurrences refer to the
+        first day of the month.
+        
+        Args:
+            aggregator: TemporalAggregator filled via `aggregate_partitions` or `add_publications`
+            
+        Returns:
+            Combined results dictionary in the same layout as `run_all`
+        """
+        logger.info("Starting temporal analysis from aggregates")
+        
+        try:
+            keywords, periods, counts = aggregator.count_matrix(self.min_occurrences)
+            
+            trend_results, lifecycle_results = {}, {}
+            for i, keyword in enumerate(keywords):
+                months = np.flatnonzero(counts[i])
+                monthly_counts = pd.Series(counts[i, months].astype(int), index=periods[months])
+                first_date = monthly_counts.index[0].start_time
+                last_date = monthly_counts.index[-1].start_time
+                
+                trend_results[keyword] = self._trend_from_monthly_counts(keyword, monthly_counts, first_date, last_date)
+                lifecycle_results[keyword] = self._lifecycle_from_monthly_counts(keyword, monthly_counts)
+            
+            self.keyword_trends = self._aggregate_keyword_trends(trend_results)
+            self.lifecycle_analysis = self._aggregate_lifecycles(lifecycle_results)
+            self.temporal_patterns = self._aggregate_patterns(
+                self._detect_patterns_from_matrix(keywords, periods, counts)
+            )
+            
+            publication_counts = aggregator.publication_counts
+            dated = publication_counts[publication_counts > 0]
+            if dated.empty:
+                self.publication_trends = {'error': 'No valid publication dates found'}
+            else:
+                self.publication_trends = self._publication_trends_from_monthly_counts(
+                    dated, aggregator.total_publications, dated.index[0].start_time, dated.index[-1].start_time
+                )
+            
+            period_counts = self._period_count_matrix(aggregator.yearly_counts())
+            self.comparative_analysis = self._compare_period_matrix(period_counts)
+            
+            logger.info(f"Completed temporal analysis from aggregates for {len(keywords)} keywords")
+            return {
+                'temporal_analysis': self.keyword_trends,
+                'temporal_patterns': self.temporal_patterns,
+                'lifecycle_analysis': self.lifecycle_analysis,
+                'publication_trends': self.publication_trends,
+                'comparative_analysis': self.comparative_analysis
+            }
             
         except Exception as e:
-            logger.error(f"Error in time period comparison: {str(e)}")
+            logger.error(f"Error in temporal analysis from aggregates: {str(e)}")
             raise
     
+    def _aggregate_keyword_trends(self, trend_results: Dict[str, Dict]) -> Dict[str, Any]:
+        """Aggregate per-keyword trend results."""
+        return {
+            'individual_trends': trend_results,
+            'summary_statistics': self._calculate_trend_summary(trend_results),
+            'top_growing_keywords': self._identify_growing_keywords(trend_results),
+            'declining_keywords': self._identify_declining_keywords(trend_results),
+            'stable_keywords': self._identify_stable_keywords(trend_results)
+        }
+    
+    def _aggregate_patterns(self, patterns: Dict[str, Dict]) -> Dict[str, Any]:
+        """Aggregate per-keyword pattern results."""
+        return {
+            'keyword_patterns': patterns,
+            'pattern_summary': self._summarize_patterns(patterns),
+            'anomalies': self._detect_anomalies(patterns),
+            'change_points': self._detect_change_points(patterns)
+        }
+    
+    def _aggregate_lifecycles(self, lifecycle_results: Dict[str, Dict]) -> Dict[str, Any]:
+        """Categorize keywords by lifecycle stage and aggregate results."""
+        lifecycle_categories = self._categorize_lifecycle_stages(lifecycle_results)
+        
+        return {
+            'individual_lifecycles': lifecycle_results,
+            'lifecycle_categories': lifecycle_categories,
+            'emerging_keywords': lifecycle_categories.get('emerging', []),
+            'mature_keywords': lifecycle_categories.get('mature', []),
+            'declining_keywords': lifecycle_categories.get('declining', [])
+        }
+    
     def _prepare_temporal_data(self, publications: List[Dict], keywords: Dict[str, Any]) -> Dict[str, List]:
         """Prepare temporal data for analysis."""
         temporal_data = defaultdict(list)
@@ -320,6 +568,11 @@ class TemporalAnalyzer:
         # Create monthly aggregations
         monthly_counts = df.groupby(df['date'].dt.to_period('M')).size()
         
+        return self._trend_from_monthly_counts(keyword, monthly_counts, df['date'].min(), df['date'].max())
+    
+    def _trend_from_monthly_counts(self, keyword: str, monthly_counts: pd.Series,
+                                   first_date: datetime, last_date: datetime) -> Dict[str, Any]:
+        """Calculate trend statistics from monthly counts (months with occurrences only)."""
         # Calculate trend statistics
         x = np.arange(len(monthly_counts))
         y = monthly_counts.values
@@ -333,7 +586,7 @@ class TemporalAnalyzer:
         
         return {
             'keyword': keyword,
-            'total_occurrences': len(data),
+            'total_occurrences': int(monthly_counts.sum()),
             'time_span_months': len(monthly_counts),
             'trend_slope': slope,
             'trend_direction': trend_direction,
@@ -342,8 +595,8 @@ class TemporalAnalyzer:
             'p_value': p_value,
             'monthly_average': np.mean(y),
             'monthly_std': np.std(y),
-            'first_occurrence': df['date'].min().strftime('%Y-%m-%d'),
-            'last_occurrence': df['date'].max().strftime('%Y-%m-%d'),
+            'first_occurrence': first_date.strftime('%Y-%m-%d'),
+            'last_occurrence': last_date.strftime('%Y-%m-%d'),
             'peak_month': monthly_counts.idxmax().strftime('%Y-%m'),
             'peak_count': monthly_counts.max(),
             'monthly_data': monthly_counts.to_dict()
@@ -411,45 +664,39 @@ class TemporalAnalyzer:
     
     def _extract_publication_date(self, publication: Dict) -> Optional[datetime]:
         """Extract publication date from publication dictionary."""
-        # Try different date fields
-        date_fields = ['publication_date', 'published_date', 'date', 'year']
-        
-        for field in date_fields:
-            if field in publication and publication[field]:
-                try:
-                    if field == 'year':
-                        return datetime(int(publication[field]), 1, 1)
-                    else:
-                        return pd.to_datetime(publication[field])
-                except (ValueError, TypeError):
-                    continue
+        # Uses normalized year/month fields when present; raw values are parsed once (memoized)
+        year, month, day = extract_publication_date_parts(publication)
+        if year is None:
+            return None
         
-        return None
+        try:
+            return datetime(year, month or 1, day or 1)
+        except ValueError:  # e.g. day out of range for the month
+            return datetime(year, month or 1, 1)
     
     def _extract_publication_keywords(self, publication: Dict, keywords: Dict) -> List[str]:
         """Extract keywords associated with a publication."""
-        pub_keywords = []
-        
-        # Check if publication has keywords field
-        if 'keywords' in publication:
-            pub_keywords.extend(publication['keywords'])
-        
-        # Check if keywords are derived from title/abstract
-        text_content = ' '.join([
-            publication.get('title', ''),
-            publication.get('abstract', '')
-        ]).lower()
-        
-        for keyword in keywords.get('all_keywords', []):
-            if keyword.lower() in text_content:
-                pub_keywords.append(keyword)
+        return extract_publication_keywords(publication, keywords)
+    
+    def _publication_trends_from_monthly_counts(self, monthly_counts: pd.Series, total_publications: int,
+                                                start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+        """Build publication trend results from publications per month (PeriodIndex)."""
+        monthly_counts = monthly_counts[monthly_counts > 0]
         
-        return list(set(pub_keywords))
+        return {
+            'volume_trends': self._analyze_publication_volume(monthly_counts),
+            'seasonal_patterns': self._analyze_seasonal_patterns(monthly_counts),
+            'growth_analysis': self._analyze_growth_rates(monthly_counts),
+            'total_publications': total_publications,
+            'date_range': {
+                'start': start_date.strftime('%Y-%m-%d'),
+                'end': end_date.strftime('%Y-%m-%d')
+            }
+        }
     
-    def _analyze_publication_volume(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _analyze_publication_volume(self, monthly_counts: pd.Series) -> Dict[str, Any]:
         """Analyze publication volume trends."""
-        yearly_counts = df.groupby('year').size()
-        monthly_counts = df.groupby('year_month').size()
+        yearly_counts = monthly_counts.groupby(monthly_counts.index.year).sum()
         
         # Calculate year-over-year growth
         yearly_growth = yearly_counts.pct_change().fillna(0)
@@ -464,9 +711,9 @@ class TemporalAnalyzer:
             'peak_count': yearly_counts.max()
         }
     
-    def _analyze_seasonal_patterns(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _analyze_seasonal_patterns(self, monthly_counts: pd.Series) -> Dict[str, Any]:
         """Analyze seasonal patterns in publication volume."""
-        monthly_patterns = df.groupby('month').size()
+        monthly_patterns = monthly_counts.groupby(monthly_counts.index.month).sum()
         
         # Calculate seasonal indices
         overall_mean = monthly_patterns.mean()
@@ -480,9 +727,9 @@ class TemporalAnalyzer:
             'seasonal_variation': seasonal_indices.std()
         }
     
-    def _analyze_growth_rates(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _analyze_growth_rates(self, monthly_counts: pd.Series) -> Dict[str, Any]:
         """Analyze growth rates and acceleration."""
-        yearly_counts = df.groupby('year').size()
+        yearly_counts = monthly_counts.groupby(monthly_counts.index.year).sum()
         growth_rates = yearly_counts.pct_change().fillna(0)
         
         # Calculate acceleration (second derivative)
@@ -583,6 +830,219 @@ class TemporalAnalyzer:
         
         return []
     
+    def _build_monthly_count_matrix(self, temporal_data: Dict[str, List]) -> Tuple[List[str], pd.PeriodIndex, np.ndarray]:
+        """
+        Build a dense keyword x month count matrix from prepared temporal data.
+        
+        Only keywords with at least `min_occurrences` records are included. Columns
+        span every month between the first and last observation, so months without
+        publications are explicit zeros.
+        
+        Returns:
+            Tuple of (keywords, monthly PeriodIndex, counts array of shape (n_keywords, n_months))
+        """
+        keywords = [kw for kw, data in temporal_data.items() if len(data) >= self.min_occurrences]
+        if not keywords:
+            return [], pd.PeriodIndex([], freq='M'), np.zeros((0, 0))
+        
+        row_index = np.repeat(np.arange(len(keywords)), [len(temporal_data[kw]) for kw in keywords])
+        month_index = np.fromiter(
+            (record['year'] * 12 + record['month'] - 1 for kw in keywords for record in temporal_data[kw]),
+            dtype=np.int64,
+            count=len(row_index)
+        )
+        
+        start = month_index.min()
+        n_months = int(month_index.max() - start + 1)
+        flat_index = row_index * n_months + (month_index - start)
+        counts = np.bincount(flat_index, minlength=len(keywords) * n_months).reshape(len(keywords), n_months)
+        
+        periods = pd.period_range(
+            start=pd.Period(year=int(start // 12), month=int(start % 12 + 1), freq='M'),
+            periods=n_months,
+            freq='M'
+        )
+        return keywords, periods, counts.astype(float)
+    
+    def _detect_patterns_batched(self, temporal_data: Dict[str, List]) -> Dict[str, Dict[str, Any]]:
+        """
+        Detect seasonality, cycles, trend changes and volatility for all keywords at once.
+        
+        Works on the dense keyword x month matrix: autocorrelations and periodograms are
+        computed row-wise with a single FFT, peaks/troughs and rolling slopes with array
+        operations. Results use the same structure as `_detect_keyword_patterns`.
+        """
+        keywords, periods, counts = self._build_monthly_count_matrix(temporal_data)
+        return self._detect_patterns_from_matrix(keywords, periods, counts)
+    
+    def _detect_patterns_from_matrix(self, keywords: List[str], periods: pd.PeriodIndex,
+                                     counts: np.ndarray) -> Dict[str, Dict[str, Any]]:
+        """
+        Detect patterns for every row of a dense keyword x month count matrix.
+        
+        Like `_detect_keyword_patterns`, each keyword is analyzed over the months in
+        which it occurs: zero-count months are dropped from its row, and the remaining
+        months are left-aligned and processed in groups of equal length.
+        """
+        if not keywords:
+            return {}
+        
+        # Compact every row to its observed months (row-major order keeps months sorted)
+        active = counts > 0
+        lengths = active.sum(axis=1)
+        nz_rows, nz_cols = np.nonzero(active)
+        rank = np.arange(len(nz_rows)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        width = max(int(lengths.max()), 1)
+        compact = np.zeros((len(keywords), width))
+        compact[nz_rows, rank] = counts[nz_rows, nz_cols]
+        columns = np.zeros((len(keywords), width), dtype=np.int64)
+        columns[nz_rows, rank] = nz_cols
+        lengths = np.maximum(lengths, 1)
+        
+        patterns = [None] * len(keywords)
+        for length in np.unique(lengths):
+            rows = np.flatnonzero(lengths == length)
+            window = compact[rows, :length]
+            
+            seasonality = self._detect_seasonality_batched(window)
+            cycles = self._detect_cycles_batched(window)
+            trend_changes = self._detect_trend_changes_batched(window, periods, columns=columns[rows, :length])
+            
+            means = window.mean(axis=1)
+            stds = window.std(axis=1, ddof=1) if length > 1 else np.zeros(len(rows))
+            volatility = np.divide(stds, means, out=np.zeros_like(means), where=means > 0)
+            
+            for j, row in enumerate(rows):
+                patterns[row] = {
+                    'keyword': keywords[row],
+                    'seasonality': seasonality[j],
+                    'cyclical_patterns': cycles[j],
+                    'trend_changes': trend_changes[j],
+                    'volatility': float(volatility[j])
+                }
+        
+        return dict(zip(keywords, patterns))
+    
+    def _detect_seasonality_batched(self, counts: np.ndarray) -> List[Dict[str, Any]]:
+        """Detect seasonality for every row using FFT autocorrelation and periodograms."""
+        n_keywords, n_months = counts.shape
+        lags = sorted(p for p in self.seasonal_periods if 2 * p <= n_months)
+        if not lags:
+            return [{'detected': False, 'reason': 'insufficient_data'} for _ in range(n_keywords)]
+        
+        centered = counts - counts.mean(axis=1, keepdims=True)
+        
+        # Autocorrelation via Wiener-Khinchin; zero-padding avoids circular wrap-around
+        n_fft = 1 << int(np.ceil(np.log2(2 * n_months)))
+        spectrum = np.fft.rfft(centered, n=n_fft, axis=1)
+        autocov = np.fft.irfft(spectrum * np.conj(spectrum), n=n_fft, axis=1)[:, :n_months]
+        # Biased estimate (every lag divided by n, which cancels below): unlike the
+        # (n - k) estimate it keeps autocorrelations within [-1, 1]
+        variance = autocov[:, 0]
+        autocorr = np.divide(autocov, variance[:, None], out=np.zeros_like(autocov), where=variance[:, None] > 0)
+        # Only positive correlation indicates repetition at that lag; a 12-month cycle is
+        # strongly anti-correlated at lag 6, which must not be reported as 6-month seasonality
+        lag_strengths = np.clip(autocorr[:, lags], 0, None)
+        
+        best = np.argmax(lag_strengths, axis=1)
+        strength = lag_strengths[np.arange(n_keywords), best]
+        detected = strength > self.seasonality_threshold
+        
+        # Periodogram (excluding the zero frequency) for the dominant period
+        power = np.abs(np.fft.rfft(centered, axis=1)[:, 1:]) ** 2
+        frequencies = np.fft.rfftfreq(n_months)[1:]
+        total_power = power.sum(axis=1)
+        dominant = np.argmax(power, axis=1) if power.shape[1] else np.zeros(n_keywords, dtype=int)
+        
+        results = []
+        for i in range(n_keywords):
+            has_power = power.shape[1] > 0 and total_power[i] > 0
+            results.append({
+                'detected': bool(detected[i]),
+                'strength': float(strength[i]),
+                'period': lags[best[i]] if detected[i] else None,
+                'lag_strengths': {lag: float(lag_strengths[i, j]) for j, lag in enumerate(lags)},
+                'dominant_period': float(1 / frequencies[dominant[i]]) if has_power else None,
+                'spectral_concentration': float(power[i, dominant[i]] / total_power[i]) if has_power else 0.0
+            })
+        return results
+    
+    def _detect_cycles_batched(self, counts: np.ndarray) -> List[Dict[str, Any]]:
+        """Count peaks and troughs for every row without per-series find_peaks calls."""
+        n_keywords, n_months = counts.shape
+        if n_months < 6:
+            return [{'detected': False, 'cyclical': False, 'reason': 'insufficient_data'} for _ in range(n_keywords)]
+        
+        # Direction of each step, with flat steps inheriting the previous direction so
+        # plateaus count as a single peak/trough (as scipy.signal.find_peaks does)
+        direction = np.sign(np.diff(counts, axis=1))
+        last_nonzero = np.where(direction != 0, np.arange(direction.shape[1]), 0)
+        np.maximum.accumulate(last_nonzero, axis=1, out=last_nonzero)
+        filled = np.take_along_axis(direction, last_nonzero, axis=1)
+        
+        peaks = (filled[:, :-1] == 1) & (direction[:, 1:] == -1)
+        troughs = (filled[:, :-1] == -1) & (direction[:, 1:] == 1)
+        n_peaks = peaks.sum(axis=1)
+        n_troughs = troughs.sum(axis=1)
+        
+        # Mean spacing between consecutive peaks = (last - first) / (n_peaks - 1)
+        width = peaks.shape[1]
+        first_peak = np.argmax(peaks, axis=1)
+        last_peak = width - 1 - np.argmax(peaks[:, ::-1], axis=1)
+        cycle_length = np.divide(last_peak - first_peak, n_peaks - 1,
+                                 out=np.full(n_keywords, np.nan), where=n_peaks > 1)
+        
+        return [
+            {
+                'peaks_detected': int(n_peaks[i]),
+                'troughs_detected': int(n_troughs[i]),
+                'average_cycle_length': float(cycle_length[i]) if n_peaks[i] > 1 else None,
+                'cyclical': bool(n_peaks[i] > 1 and n_troughs[i] > 1)
+            }
+            for i in range(n_keywords)
+        ]
+    
+    def _detect_trend_changes_batched(self, counts: np.ndarray, periods: pd.PeriodIndex,
+                                      columns: Optional[np.ndarray] = None) -> List[List[Dict]]:
+        """
+        Detect trend change points for every row using vectorized rolling slopes.
+        
+        `columns` maps each cell of `counts` to its position in `periods` when rows
+        are compacted (defaults to the column itself); indices are relative to the row.
+        """
+        n_keywords, n_months = counts.shape
+        if columns is None:
+            columns = np.broadcast_to(np.arange(n_months), counts.shape)
+        if n_months < 6:
+            return [[] for _ in range(n_keywords)]
+        
+        window = min(6, n_months // 3)
+        
+        # Least-squares slope of every length-`window` segment as a dot product
+        x = np.arange(window) - (window - 1) / 2
+        weights = x / np.sum(x ** 2)
+        slopes = np.lib.stride_tricks.sliding_window_view(counts, window, axis=1) @ weights
+        
+        # Slope before index i uses the window starting at i - window, after uses i
+        split_points = np.arange(window, n_months - window)
+        if len(split_points) == 0:
+            return [[] for _ in range(n_keywords)]
+        slope_change = slopes[:, split_points] - slopes[:, split_points - window]
+        significance = np.abs(slope_change)
+        threshold = slope_change.std(axis=1, keepdims=True) * 2
+        significant = significance > threshold
+        
+        results = [[] for _ in range(n_keywords)]
+        for row, col in zip(*np.nonzero(significant)):
+            if len(results[row]) < 5:  # Keep the first 5 changes
+                results[row].append({
+                    'index': int(split_points[col]),
+                    'date': periods[columns[row, split_points[col]]],
+                    'slope_change': float(slope_change[row, col]),
+                    'significance': float(significance[row, col])
+                })
+        return results
+    
     def _summarize_patterns(self, patterns: Dict) -> Dict[str, Any]:
         """Summarize detected patterns across all keywords."""
         if not patterns:
@@ -634,8 +1094,13 @@ class TemporalAnalyzer:
         df['date'] = pd.to_datetime(df['date'])
         df = df.sort_values('date')
         
-        # Calculate cumulative usage
         monthly_counts = df.groupby(df['date'].dt.to_period('M')).size()
+        
+        return self._lifecycle_from_monthly_counts(keyword, monthly_counts)
+    
+    def _lifecycle_from_monthly_counts(self, keyword: str, monthly_counts: pd.Series) -> Dict[str, Any]:
+        """Calculate lifecycle metrics from monthly counts (months with occurrences only)."""
+        # Calculate cumulative usage
         cumulative_usage = monthly_counts.cumsum()
         
         # Identify lifecycle phases
@@ -649,7 +1114,7 @@ class TemporalAnalyzer:
         return {
             'keyword': keyword,
             'lifespan_months': lifespan_months,
-            'total_usage': len(data),
+            'total_usage': int(monthly_counts.sum()),
             'peak_month': str(peak_usage_month),
             'peak_position': peak_position,  # 0 = early, 1 = late
             'phases': phases,
@@ -746,134 +1211,98 @@ class TemporalAnalyzer:
         
         return categories
     
-    def _filter_publications_by_period(self, publications: List[Dict], period_config: Dict) -> List[Dict]:
-        """Filter publications by time period."""
-        filtered_pubs = []
-        start_year = period_config['start']
-        end_year = period_config['end']
-        
-        for pub in publications:
-            pub_date = self._extract_publication_date(pub)
-            if pub_date and start_year <= pub_date.year <= end_year:
-                filtered_pubs.append(pub)
-        
-        return filtered_pubs
-    
-    def _extract_keywords_from_publications(self, publications: List[Dict], keywords: Dict) -> Dict[str, int]:
-        """Extract keyword frequencies from publications."""
-        keyword_counts = Counter()
-        
-        for pub in publications:
-            pub_keywords = self._extract_publication_keywords(pub, keywords)
-            keyword_counts.update(pub_keywords)
-        
-        return dict(keyword_counts)
-    
-    def _compare_keyword_sets(self, keywords1: Dict[str, int], keywords2: Dict[str, int], 
-                             period1: str, period2: str) -> Dict[str, Any]:
-        """Compare two sets of keywords from different periods."""
-        all_keywords = set(keywords1.keys()) | set(keywords2.keys())
-        
-        # Calculate changes for each keyword
-        keyword_changes = {}
-        for keyword in all_keywords:
-            count1 = keywords1.get(keyword, 0)
-            count2 = keywords2.get(keyword, 0)
-            
-            if count1 > 0 and count2 > 0:
-                change_ratio = count2 / count1
-                change_type = 'increased' if change_ratio > 1.2 else 'decreased' if change_ratio < 0.8 else 'stable'
-            elif count1 > 0 and count2 == 0:
-                change_ratio = 0
-                change_type = 'disappeared'
-            elif count1 == 0 and count2 > 0:
-                change_ratio = float('inf')
-                change_type = 'emerged'
-            else:
-                change_ratio = 1
-                change_type = 'stable'
-            
-            keyword_changes[keyword] = {
+    def _compare_keyword_sets(self, keywords: np.ndarray, counts1: np.ndarray, counts2: np.ndarray,
+                              period1: str, period2: str, top_n: int = 10) -> Dict[str, Any]:
+        """Compare keyword count vectors from two periods (aligned with `keywords`)."""
+        present = (counts1 > 0) | (counts2 > 0)
+        keywords, counts1, counts2 = keywords[present], counts1[present], counts2[present]
+        
+        in_both = (counts1 > 0) & (counts2 > 0)
+        disappeared = (counts1 > 0) & (counts2 == 0)
+        emerged = (counts1 == 0) & (counts2 > 0)
+        
+        # Emerged keywords get a ratio of 999 instead of infinity
+        change_ratio = np.ones(len(keywords))
+        np.divide(counts2, counts1, out=change_ratio, where=in_both)
+        change_ratio[disappeared] = 0
+        change_ratio[emerged] = 999
+        
+        change_type = np.full(len(keywords), 'stable', dtype=object)
+        increased = in_both & (change_ratio > 1.2)
+        decreased = in_both & (change_ratio < 0.8)
+        change_type[increased] = 'increased'
+        change_type[decreased] = 'decreased'
+        change_type[disappeared] = 'disappeared'
+        change_type[emerged] = 'emerged'
+        
+        def top_keywords(mask: np.ndarray, scores: np.ndarray) -> List[str]:
+            index = np.flatnonzero(mask)
+            return keywords[index[np.argsort(-scores[index], kind='stable')[:top_n]]].tolist()
+        
+        keyword_changes = {
+            keyword: {
                 f'{period1}_count': count1,
                 f'{period2}_count': count2,
-                'change_ratio': change_ratio if change_ratio != float('inf') else 999,
-                'change_type': change_type,
+                'change_ratio': ratio,
+                'change_type': kind,
                 'absolute_change': count2 - count1
             }
-        
-        # Identify top changes
-        emerging = [k for k, v in keyword_changes.items() if v['change_type'] == 'emerged']
-        disappearing = [k for k, v in keyword_changes.items() if v['change_type'] == 'disappeared']
-        increasing = sorted([k for k, v in keyword_changes.items() if v['change_type'] == 'increased'], 
-                           key=lambda k: keyword_changes[k]['change_ratio'], reverse=True)[:10]
-        decreasing = sorted([k for k, v in keyword_changes.items() if v['change_type'] == 'decreased'], 
-                           key=lambda k: keyword_changes[k]['change_ratio'])[:10]
+            for keyword, count1, count2, ratio, kind in zip(
+                keywords.tolist(), counts1.tolist(), counts2.tolist(), change_ratio.tolist(), change_type.tolist()
+            )
+        }
         
         return {
             'comparison_periods': f"{period1} vs {period2}",
-            'total_keywords_period1': len(keywords1),
-            'total_keywords_period2': len(keywords2),
-            'common_keywords': len(set(keywords1.keys()) & set(keywords2.keys())),
-            'emerging_keywords': emerging[:10],
-            'disappearing_keywords': disappearing[:10],
-            'most_increasing': increasing,
-            'most_decreasing': decreasing,
+            'total_keywords_period1': int((counts1 > 0).sum()),
+            'total_keywords_period2': int((counts2 > 0).sum()),
+            'common_keywords': int(in_both.sum()),
+            'emerging_keywords': top_keywords(emerged, counts2),
+            'disappearing_keywords': top_keywords(disappeared, counts1),
+            'most_increasing': top_keywords(increased, change_ratio),
+            'most_decreasing': top_keywords(decreased, -change_ratio),
             'keyword_changes': keyword_changes
         }
     
-    def _perform_statistical_tests(self, period_data: Dict[str, Dict[str, int]]) -> Dict[str, Any]:
-        """Perform statistical tests on period data."""
+    def _perform_statistical_tests(self, period_names: List[str], counts: np.ndarray) -> Dict[str, Any]:
+        """Perform statistical tests on a keyword x period count matrix."""
         tests = {}
         
-        # Convert to comparable format
-        period_names = list(period_data.keys())
         if len(period_names) < 2:
             return {'error': 'Need at least 2 periods for statistical testing'}
         
-        # Get common keywords across periods
-        common_keywords = set.intersection(*[set(data.keys()) for data in period_data.values()])
+        # Keywords present in every period
+        common = counts[(counts > 0).all(axis=1)]
         
-        if len(common_keywords) < 5:
+        if len(common) < 5:
             return {'error': 'Insufficient common keywords for statistical testing'}
         
-        # Prepare data for testing
-        period_vectors = {}
-        for period_name, keywords in period_data.items():
-            vector = [keywords.get(kw, 0) for kw in common_keywords]
-            period_vectors[period_name] = vector
-        
-        # Perform pairwise tests
-        for i, period1 in enumerate(period_names):
-            for period2 in period_names[i+1:]:
-                test_key = f"{period1}_vs_{period2}"
-                
-                # Mann-Whitney U test for non-parametric comparison
-                try:
-                    statistic, p_value = mannwhitneyu(
-                        period_vectors[period1], 
-                        period_vectors[period2],
-                        alternative='two-sided'
-                    )
-                    
-                    tests[test_key] = {
-                        'test_type': 'Mann-Whitney U',
-                        'statistic': float(statistic),
-                        'p_value': float(p_value),
-                        'significant': p_value < 0.05,
-                        'sample_sizes': [len(period_vectors[period1]), len(period_vectors[period2])]
-                    }
-                except Exception as e:
-                    tests[test_key] = {'error': str(e)}
+        # Mann-Whitney U tests for all period pairs at once (one row per pair)
+        first, second = np.triu_indices(len(period_names), k=1)
+        try:
+            statistics, p_values = mannwhitneyu(common[:, first].T, common[:, second].T,
+                                                alternative='two-sided', axis=1)
+            for i, j, statistic, p_value in zip(first, second, statistics, p_values):
+                tests[f"{period_names[i]}_vs_{period_names[j]}"] = {
+                    'test_type': 'Mann-Whitney U',
+                    'statistic': float(statistic),
+                    'p_value': float(p_value),
+                    'significant': bool(p_value < 0.05),
+                    'sample_sizes': [len(common), len(common)]
+                }
+        except Exception as e:
+            for i, j in zip(first, second):
+                tests[f"{period_names[i]}_vs_{period_names[j]}"] = {'error': str(e)}
         
         # Overall test (Kruskal-Wallis for multiple groups)
         if len(period_names) > 2:
             try:
-                statistic, p_value = kruskal(*period_vectors.values())
+                statistic, p_value = kruskal(*common.T)
                 tests['overall_comparison'] = {
                     'test_type': 'Kruskal-Wallis',
                     'statistic': float(statistic),
                     'p_value': float(p_value),
-                    'significant': p_value < 0.05,
+                    'significant': bool(p_value < 0.05),
                     'groups': len(period_names)
                 }
             except Exception as e:
@@ -1088,3 +1517,22 @@ class TemporalAnalyzer:
                     })
                 
                 pd.DataFrame(lifecycle_data).to_excel(writer, sheet_name='Lifecycle_Analysis', index=False)
+
+
+def _analyze_keyword_chunk(config: Dict[str, Any], chunk: List[Tuple[str, List[Dict]]],
+                           detect_patterns: bool = False) -> Tuple[Dict, Dict, Dict]:
+    """
+    Analyze trends and lifecycles (and optionally patterns) for a chunk of keywords.
+    
+    Module-level so it can be pickled for ProcessPoolExecutor workers.
+    """
+    analyzer = TemporalAnalyzer(config)
+    trends, lifecycles, patterns = {}, {}, {}
+    
+    for keyword, data in chunk:
+        trends[keyword] = analyzer._analyze_single_keyword_trend(keyword, data)
+        lifecycles[keyword] = analyzer._analyze_keyword_lifecycle(keyword, data)
+        if detect_patterns:
+            patterns[keyword] = analyzer._detect_keyword_patterns(keyword, data)
+    
+    return trends, lifecycles, patterns
@@ -0,0 +1,141 @@
+"""
+Text Preprocessing for Keyword Analysis
+
+Shared text cleaning used by keyword extraction and embedding generation:
+
+- Precompiled patterns, applied through single-text and batch functions
+  (lists, Series; missing values become empty strings)
+- Memoized keyword cleaning: every distinct keyword string is cleaned once per
+  process, and batches clean only their distinct values
+- Embedding preprocessing with tokenizer-accurate truncation to the model's
+  maximum sequence length (character heuristic without a tokenizer)
+"""
+
+import logging
+import re
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Characters per token assumed when no tokenizer is available
+CHARS_PER_TOKEN = 4
+
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+_SPECIAL_CHARS_PATTERN = re.compile(r'[^\w\s\-]')
+_SHORT_WORD_PATTERN = re.compile(r'(?<!\S)\S{1,2}(?!\S)')
+_EDGE_NON_WORD_PATTERN = re.compile(r'^[^\w]+|[^\w]+$')
+
+
+def is_missing(text: Any) -> bool:
+    """True for None, NaN/NA and empty strings."""
+    if isinstance(text, str):
+        return not text
+    try:
+        return bool(pd.isna(text))
+    except (TypeError, ValueError):
+        return False
+
+
+def normalize_whitespace(text: str) -> str:
+    """Collapse whitespace runs into single spaces and strip."""
+    return _WHITESPACE_PATTERN.sub(' ', text).strip()
+
+
+def preprocess_for_keywords(text: Any) -> str:
+    """
+    Normalize a document for keyword extraction.
+
+    Lowercases, replaces special characters (except hyphens) with spaces and
+    drops words shorter than three characters.
+    """
+    if is_missing(text):
+        return ""
+    text = _SPECIAL_CHARS_PATTERN.sub(' ', str(text).lower())
+    return normalize_whitespace(_SHORT_WORD_PATTERN.sub(' ', text))
+
+
+def preprocess_for_keywords_batch(texts: Iterable[Any]) -> List[str]:
+    """preprocess_for_keywords over a list or Series of documents."""
+    return [preprocess_for_keywords(text) for text in texts]
+
+
+@lru_cache(maxsize=262144)
+def _clean_keyword_string(keyword: str) -> str:
+    keyword = _EDGE_NON_WORD_PATTERN.sub('', keyword.strip()).lower()
+    return normalize_whitespace(keyword)
+
+
+def clean_keyword(keyword: Any) -> str:
+    """
+    Clean and normalize a keyword: strip, remove leading/trailing non-word
+    characters, lowercase and collapse whitespace. Memoized per distinct string.
+    """
+    if is_missing(keyword):
+        return ""
+    return _clean_keyword_string(str(keyword))
+
+
+def clean_keywords(keywords: pd.Series) -> pd.Series:
+    """clean_keyword over a Series, cleaning each distinct value once (index is kept)."""
+    codes, uniques = pd.factorize(keywords)
+    cleaned = np.array([clean_keyword(keyword) for keyword in uniques] + [''], dtype=object)
+    return pd.Series(cleaned[codes], index=keywords.index, dtype=object)
+
+
+def truncate_to_tokens(texts: List[str], max_tokens: int, tokenizer: Optional[Any] = None) -> List[str]:
+    """
+    Truncate texts to at most `max_tokens` tokens (including special tokens).
+
+    With a (fast) tokenizer, texts are cut at the character offset of their last
+    kept token, so the truncated text encodes to the same tokens the model
+    would keep. Without a tokenizer, CHARS_PER_TOKEN characters per token are
+    assumed.
+    """
+    if tokenizer is not None:
+        try:
+            # Texts of up to max_tokens // 2 characters fit in practice and are not tokenized
+            candidates = [i for i, text in enumerate(texts) if len(text) > max_tokens // 2]
+            if not candidates:
+                return list(texts)
+            encoded = tokenizer(
+                [texts[i] for i in candidates],
+                add_special_tokens=True,
+                truncation=True,
+                max_length=max_tokens,
+                return_offsets_mapping=True,
+                return_attention_mask=False,
+                return_token_type_ids=False
+            )
+            truncated = list(texts)
+            for i, ids, offsets in zip(candidates, encoded['input_ids'], encoded['offset_mapping']):
+                if len(ids) >= max_tokens:
+                    end = max((offset[1] for offset in offsets), default=0)
+                    truncated[i] = texts[i][:end].rstrip()
+            return truncated
+        except Exception as e:
+            logger.debug(f"Tokenizer truncation failed, using character heuristic: {e}")
+
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    return [text[:max_chars] if len(text) > max_chars else text for text in texts]
+
+
+def preprocess_for_embedding(text: Any, max_tokens: Optional[int] = 512, tokenizer: Optional[Any] = None) -> str:
+    """Normalize whitespace and truncate a document for embedding generation."""
+    return preprocess_for_embedding_batch([text], max_tokens, tokenizer)[0]
+
+
+def preprocess_for_embedding_batch(texts: Iterable[Any], max_tokens: Optional[int] = 512,
+                                   tokenizer: Optional[Any] = None) -> List[str]:
+    """
+    Prepare documents for embedding: missing values become empty strings,
+    whitespace is normalized and texts are truncated to `max_tokens` tokens
+    (not truncated if `max_tokens` is None).
+    """
+    cleaned = ["" if is_missing(text) else normalize_whitespace(str(text)) for text in texts]
+    if max_tokens is None:
+        return cleaned
+    return truncate_to_tokens(cleaned, max_tokens, tokenizer)
@@ -0,0 +1,375 @@
+"""
+Vector Index for Semantic Search
+
+Nearest-neighbour search over publication embeddings with year/source filters.
+
+Backends:
+- 'hnswlib': HNSW graph index (approximate, millisecond queries at 1M vectors)
+- 'faiss': faiss IndexHNSWFlat (approximate)
+- 'numpy': exact brute-force search over memory-mapped vector shards
+
+The index is persisted to a directory and can be extended incrementally; vectors
+are kept in append-only .npy shards so the ANN structure can be rebuilt and
+selective filters can be answered exactly.
+"""
+
+import importlib.util
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+HNSWLIB_AVAILABLE = importlib.util.find_spec('hnswlib') is not None
+FAISS_AVAILABLE = importlib.util.find_spec('faiss') is not None
+
+BACKENDS = ('auto', 'hnswlib', 'faiss', 'numpy')
+
+MANIFEST_FILE = 'index.json'
+ANN_FILE = 'ann.bin'
+MISSING_YEAR = -1
+
+
+def _atomic_save(path: Path, array: np.ndarray):
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1)
+
+
+def _resolve_backend(backend: str) -> str:
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown vector index backend: {backend}. Expected one of {BACKENDS}")
+    if backend == 'auto':
+        return 'hnswlib' if HNSWLIB_AVAILABLE else 'faiss' if FAISS_AVAILABLE else 'numpy'
+    if backend == 'hnswlib' and not HNSWLIB_AVAILABLE:
+        raise ImportError("hnswlib is required for the 'hnswlib' vector index backend")
+    if backend == 'faiss' and not FAISS_AVAILABLE:
+        raise ImportError("faiss is required for the 'faiss' vector index backend")
+    return backend
+
+
+class VectorIndex:
+    """
+    Persistent cosine-similarity index over embeddings with metadata filters.
+
+    Layout of `index_dir`:
+    - index.json: backend, dimension, parameters, shard list and source vocabulary
+    - vectors_NNNNN.npy: normalized float32 vectors, append-only
+    - ids.npy, years.npy, sources.npy: per-row metadata
+    - ann.bin: persisted HNSW graph (hnswlib/faiss backends)
+    """
+
+    def __init__(self, index_dir: Union[str, Path], backend: str = 'auto', M: int = 32,
+                 ef_construction: int = 200, ef_search: int = 64, exact_search_threshold: int = 20000):
+        """
+        Open or create a vector index.
+
+        Args:
+            index_dir: Directory for the persisted index
+            backend: 'auto', 'hnswlib', 'faiss' or 'numpy' (ignored for existing indexes)
+            M: HNSW graph degree
+            ef_construction: HNSW construction search depth
+            ef_search: HNSW query search depth
+            exact_search_threshold: Filters matching at most this many rows are answered
+                by exact search over the matching rows instead of the ANN graph
+        """
+        self.index_dir = Path(index_dir)
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.exact_search_threshold = exact_search_threshold
+
+        manifest_path = self.index_dir / MANIFEST_FILE
+        if manifest_path.exists():
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                self.manifest = json.load(f)
+        else:
+            self.manifest = {
+                'backend': _resolve_backend(backend),
+                'dimension': None,
+                'M': M,
+                'ef_construction': ef_construction,
+                'shards': [],
+                'sources': []
+            }
+        self.manifest['ef_search'] = ef_search
+        self.backend = _resolve_backend(self.manifest['backend'])
+
+        self._load_metadata()
+        self._shards: Dict[str, np.ndarray] = {}
+        self._ann = None
+
+    def _load_metadata(self):
+        if (self.index_dir / 'ids.npy').exists():
+            self.ids = np.load(self.index_dir / 'ids.npy')
+            self.years = np.load(self.index_dir / 'years.npy')
+            self.sources = np.load(self.index_dir / 'sources.npy')
+        else:
+            self.ids = np.empty(0, dtype=str)
+            self.years = np.empty(0, dtype=np.int32)
+            self.sources = np.empty(0, dtype=np.int32)
+        self._id_rows = {row_id: row for row, row_id in enumerate(self.ids.tolist())}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, row_id: Any) -> bool:
+        return str(row_id) in self._id_rows
+
+    @property
+    def dimension(self) -> Optional[int]:
+        return self.manifest['dimension']
+
+    def _save(self):
+        _atomic_save(self.index_dir / 'ids.npy', self.ids)
+        _atomic_save(self.index_dir / 'years.npy', self.years)
+        _atomic_save(self.index_dir / 'sources.npy', self.sources)
+
+        if self._ann is not None:
+            tmp_path = self.index_dir / (ANN_FILE + '.tmp')
+            if self.backend == 'hnswlib':
+                self._ann.save_index(str(tmp_path))
+            else:
+                import faiss
+                faiss.write_index(self._ann, str(tmp_path))
+            os.replace(tmp_path, self.index_dir / ANN_FILE)
+
+        manifest_path = self.index_dir / MANIFEST_FILE
+        tmp_path = manifest_path.with_name(MANIFEST_FILE + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_path, manifest_path)
+
+    def _shard(self, name: str) -> np.ndarray:
+        if name not in self._shards:
+            self._shards[name] = np.load(self.index_dir / name, mmap_mode='r')
+        return self._shards[name]
+
+    def _iter_shards(self):
+        """Yield (first_row, vectors) for every shard."""
+        start = 0
+        for shard in self.manifest['shards']:
+            yield start, self._shard(shard['file'])
+            start += shard['rows']
+
+    def get_vectors(self, rows: np.ndarray) -> np.ndarray:
+        """Gather stored (normalized) vectors by row number."""
+        output = np.zeros((len(rows), self.dimension or 0), dtype=np.float32)
+        for start, vectors in self._iter_shards():
+            selected = np.flatnonzero((rows >= start) & (rows < start + len(vectors)))
+            if len(selected):
+                output[selected] = vectors[rows[selected] - start]
+        return output
+
+    def _ann_index(self):
+        """Load (or create) the ANN structure for approximate backends."""
+        if self.backend == 'numpy' or self._ann is not None:
+            return self._ann
+
+        ann_path = self.index_dir / ANN_FILE
+        if self.backend == 'hnswlib':
+            import hnswlib
+            self._ann = hnswlib.Index(space='ip', dim=self.dimension)
+            if ann_path.exists():
+                self._ann.load_index(str(ann_path), max_elements=max(len(self), 1))
+            else:
+                self._ann.init_index(max_elements=max(len(self), 1024), M=self.manifest['M'],
+                                     ef_construction=self.manifest['ef_construction'])
+        else:
+            import faiss
+            if ann_path.exists():
+                self._ann = faiss.read_index(str(ann_path))
+            else:
+                self._ann = faiss.IndexHNSWFlat(self.dimension, self.manifest['M'], faiss.METRIC_INNER_PRODUCT)
+                self._ann.hnsw.efConstruction = self.manifest['ef_construction']
+        return self._ann
+
+    def add(self, vectors: np.ndarray, ids: Sequence[Any], years: Optional[Sequence[Any]] = None,
+            sources: Optional[Sequence[Any]] = None) -> int:
+        """
+        Add vectors with their IDs and optional year/source metadata.
+
+        IDs already in the index are skipped, so the same publications can be
+        offered again when new ones arrive. Zero vectors (e.g. empty abstracts)
+        are skipped as well.
+
+        Returns:
+            Number of vectors added
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        ids = [str(row_id) for row_id in ids]
+        if len(ids) != len(vectors):
+            raise ValueError(f"Got {len(ids)} IDs for {len(vectors)} vectors")
+        if self.dimension is None and len(vectors):
+            self.manifest['dimension'] = int(vectors.shape[1])
+        elif len(vectors) and vectors.shape[1] != self.dimension:
+            raise ValueError(f"Vector dimension {vectors.shape[1]} does not match index ({self.dimension})")
+
+        seen = set()
+        keep = []
+        for i, row_id in enumerate(ids):
+            if row_id not in self._id_rows and row_id not in seen and vectors[i].any():
+                seen.add(row_id)
+                keep.append(i)
+        if not keep:
+            return 0
+
+        keep = np.asarray(keep)
+        new_vectors = _normalize(vectors[keep])
+        first_row = len(self)
+        new_rows = np.arange(first_row, first_row + len(keep))
+
+        year_values = np.full(len(keep), MISSING_YEAR, dtype=np.int32)
+        if years is not None:
+            for j, i in enumerate(keep):
+                if not pd.isna(years[i]):
+                    year_values[j] = int(years[i])
+
+        source_codes = np.full(len(keep), -1, dtype=np.int32)
+        if sources is not None:
+            source_list = self.manifest['sources']
+            for j, i in enumerate(keep):
+                source = sources[i]
+                if isinstance(source, str) and source:
+                    if source not in source_list:
+                        source_list.append(source)
+                    source_codes[j] = source_list.index(source)
+
+        shard_file = f"vectors_{len(self.manifest['shards']):05d}.npy"
+        _atomic_save(self.index_dir / shard_file, new_vectors)
+        self.manifest['shards'].append({'file': shard_file, 'rows': len(keep)})
+
+        ann = self._ann_index()
+        if self.backend == 'hnswlib':
+            if ann.get_max_elements() < first_row + len(keep):
+                ann.resize_index(max(2 * ann.get_max_elements(), first_row + len(keep)))
+            ann.add_items(new_vectors, new_rows)
+        elif self.backend == 'faiss':
+            ann.add(new_vectors)
+
+        self.ids = np.concatenate([self.ids, np.array([ids[i] for i in keep])])
+        self.years = np.concatenate([self.years, year_values])
+        self.sources = np.concatenate([self.sources, source_codes])
+        self._id_rows.update({ids[i]: first_row + j for j, i in enumerate(keep)})
+
+        self._save()
+        logger.info(f"Added {len(keep)} vectors to index ({len(self)} total, backend={self.backend})")
+        return len(keep)
+
+    def _filter_mask(self, filters: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """
+        Boolean row mask for filters, or None when no filter applies.
+
+        Supported filters: 'year' (int or (start, end) inclusive), 'year_min',
+        'year_max' and 'source' (string or list of strings).
+        """
+        if not filters:
+            return None
+
+        mask = np.ones(len(self), dtype=bool)
+        year = filters.get('year')
+        if isinstance(year, (tuple, list)):
+            year_min, year_max = year
+        elif year is not None:
+            year_min = year_max = year
+        else:
+            year_min, year_max = filters.get('year_min'), filters.get('year_max')
+        if year_min is not None:
+            mask &= self.years >= int(year_min)
+        if year_max is not None:
+            mask &= (self.years <= int(year_max)) & (self.years != MISSING_YEAR)
+
+        source = filters.get('source')
+        if source is not None:
+            wanted = [source] if isinstance(source, str) else list(source)
+            codes = [self.manifest['sources'].index(s) for s in wanted if s in self.manifest['sources']]
+            mask &= np.isin(self.sources, codes)
+        return mask
+
+    def _exact_search(self, query: np.ndarray, k: int, rows: Optional[np.ndarray] = None):
+        """Exact top-k by inner product over all rows or a subset of rows."""
+        if rows is not None:
+            scores = self.get_vectors(rows) @ query
+            candidates = rows
+        else:
+            scores = np.concatenate([vectors @ query for _, vectors in self._iter_shards()]) \
+                if self.manifest['shards'] else np.empty(0, dtype=np.float32)
+            candidates = np.arange(len(scores))
+
+        k = min(k, len(scores))
+        if k == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return candidates[top], scores[top]
+
+    def _ann_search(self, query: np.ndarray, k: int):
+        ann = self._ann_index()
+        k = min(k, len(self))
+        if self.backend == 'hnswlib':
+            ann.set_ef(max(self.manifest['ef_search'], k))
+            labels, distances = ann.knn_query(query[None, :], k=k)
+            return labels[0].astype(np.int64), 1 - distances[0]  # 'ip' distance = 1 - inner product
+        ann.hnsw.efSearch = max(self.manifest['ef_search'], k)
+        scores, labels = ann.search(query[None, :], k)
+        valid = labels[0] >= 0
+        return labels[0][valid].astype(np.int64), scores[0][valid]
+
+    def search(self, query: np.ndarray, k: int = 10,
+               filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Find the k most similar indexed vectors.
+
+        Args:
+            query: Query embedding
+            k: Number of results
+            filters: Optional {'year': 2023 | (2020, 2023), 'year_min', 'year_max',
+                'source': 'openalex' | [...]} filters
+
+        Returns:
+            List of {'id', 'score', 'year', 'source', 'row'} dictionaries, best first
+        """
+        if len(self) == 0:
+            return []
+        query = _normalize(np.asarray(query, dtype=np.float32).reshape(1, -1))[0]
+
+        mask = self._filter_mask(filters)
+        if mask is not None and not mask.any():
+            return []
+
+        if self.backend == 'numpy' or (mask is not None and mask.sum() <= self.exact_search_threshold):
+            rows, scores = self._exact_search(query, k, np.flatnonzero(mask) if mask is not None else None)
+        elif mask is None:
+            rows, scores = self._ann_search(query, k)
+        else:
+            # Over-fetch from the graph until enough rows pass the filter
+            fetch = k * 4
+            while True:
+                rows, scores = self._ann_search(query, fetch)
+                passing = mask[rows]
+                if passing.sum() >= k or fetch >= len(self):
+                    rows, scores = rows[passing][:k], scores[passing][:k]
+                    break
+                fetch *= 4
+
+        sources = self.manifest['sources']
+        return [
+            {
+                'id': str(self.ids[row]),
+                'score': float(score),
+                'year': int(self.years[row]) if self.years[row] != MISSING_YEAR else None,
+                'source': sources[self.sources[row]] if self.sources[row] >= 0 else None,
+                'row': int(row)
+            }
+            for row, score in zip(rows, scores)
+        ]
@@ -6,11 +6,14 @@ Tests all components with extensive scenarios, edge cases, and error handling
 
 import sys
 import os
+import re
+import subprocess
 import tempfile
 import shutil
 import pytest
 import pandas as pd
 import numpy as np
+from sklearn.metrics import silhouette_score
 from datetime import datetime, timedelta
 from pathlib import Path
 import json
@@ -21,7 +24,16 @@ warnings.filterwarnings('ignore')
 # Add project root to path
 sys.path.append(os.getcwd())
 
+from slr_core.citation_graph import CitationGraph, snowball_expand
 from slr_core.keyword_analysis import KeywordExtractor, SemanticAnalyzer, TemporalAnalyzer, Visualizer
+from slr_core.keyword_analysis.cluster_metrics import compute_cluster_metrics
+from slr_core.keyword_analysis.date_normalization import normalize_dates, format_period_labels
+from slr_core.keyword_analysis.embedding_backends import check_backend_parity, load_parity_report, save_parity_report
+from slr_core.keyword_analysis.embedding_engine import EmbeddingEngine
+from slr_core.keyword_analysis.embedding_store import EmbeddingStore, load_embeddings, save_embeddings
+from slr_core.keyword_analysis.keyword_canonicalization import apply_synonym_map_to_frame, apply_synonym_map_to_results
+from slr_core.keyword_analysis.text_preprocessing import clean_keywords, preprocess_for_embedding_batch, preprocess_for_keywords_batch
+from slr_core.keyword_analysis.vector_index import VectorIndex
 from slr_core.config_manager import ConfigManager
 
 class TestKeywordAnalysisIntegration:
@@ -495,6 +507,984 @@ class TestKeywordAnalysisIntegration:
         except Exception as e:
             print(f"⚠ Corrupted data error: {e}")
 
+    def test_11_batched_pattern_detection(self):
+        """Test batched FFT pattern detection against a known seasonal signal"""
+        print('\n=== Test 11: Batched Pattern Detection ===')
+        
+        temporal = TemporalAnalyzer(self.config.config)
+        
+        # 'seasonal' peaks every January for four years, 'flat' appears every month
+        publications_list = []
+        for year in range(2020, 2024):
+            for month in range(1, 13):
+                n_seasonal = 6 if month == 1 else 1
+                for i in range(n_seasonal):
+                    publications_list.append({
+                        'title': f'Seasonal {year}-{month}-{i}',
+                        'keywords': ['seasonal'],
+                        'publication_date': f'{year}-{month:02d}-15'
+                    })
+                publications_list.append({
+                    'title': f'Flat {year}-{month}',
+                    'keywords': ['flat'],
+                    'publication_date': f'{year}-{month:02d}-15'
+                })
+        
+        # 'burst' is only active from 2021-03 to 2022-08: rising, then falling
+        for step, period in enumerate(pd.period_range('2021-03', '2022-08', freq='M')):
+            for i in range(1 + min(step, 17 - step) + step % 2):
+                publications_list.append({
+                    'title': f'Burst {period}-{i}',
+                    'keywords': ['burst'],
+                    'publication_date': f'{period}-10'
+                })
+        
+        patterns = temporal.detect_temporal_patterns(publications_list, {}, mode='batched')
+        seasonal = patterns['keyword_patterns']['seasonal']
+        flat = patterns['keyword_patterns']['flat']
+        
+        assert seasonal['seasonality']['detected'], "Yearly peak should be detected"
+        assert seasonal['seasonality']['period'] == 12, "Detected period should be 12 months"
+        assert set(seasonal['seasonality']['lag_strengths']) == {3, 6, 12}, "All seasonal periods should be checked"
+        assert seasonal['cyclical_patterns']['peaks_detected'] == 3, "Interior January peaks should be counted"
+        assert not flat['seasonality']['detected'], "Constant series should not be seasonal"
+        assert flat['volatility'] == 0, "Constant series should have zero volatility"
+        
+        # Both modes share the result structure
+        legacy = temporal.detect_temporal_patterns(publications_list, {}, mode='per_keyword')
+        assert set(legacy['keyword_patterns']['seasonal']) == set(seasonal)
+        
+        # A keyword active in a sub-range is analyzed over its own months only
+        burst = patterns['keyword_patterns']['burst']
+        legacy_burst = legacy['keyword_patterns']['burst']
+        assert np.isclose(burst['volatility'], legacy_burst['volatility']), "Inactive months should not add volatility"
+        assert [(c['index'], c['date']) for c in burst['trend_changes']] == \
+            [(c['index'], c['date']) for c in legacy_burst['trend_changes']]
+        assert np.allclose([c['slope_change'] for c in burst['trend_changes']],
+                           [c['slope_change'] for c in legacy_burst['trend_changes']])
+        assert burst['trend_changes'][0]['date'] >= pd.Period('2021-03', freq='M')
+
+        # A keyword seen only in January: months without occurrences are skipped, as in per_keyword mode
+        for year in range(2018, 2024):
+            for i in range(year - 2017):
+                publications_list.append({
+                    'title': f'January {year}-{i}',
+                    'keywords': ['january'],
+                    'publication_date': f'{year}-01-20'
+                })
+        patterns = temporal.detect_temporal_patterns(publications_list, {}, mode='batched')
+        legacy = temporal.detect_temporal_patterns(publications_list, {}, mode='per_keyword')
+        january = patterns['keyword_patterns']['january']
+        legacy_january = legacy['keyword_patterns']['january']
+        assert np.isclose(january['volatility'], legacy_january['volatility'])
+        assert not january['seasonality']['detected'] and not legacy_january['seasonality']['detected']
+
+        # Autocorrelation strengths stay within [0, 1] even for a sparse yearly spike
+        spikes = np.zeros((1, 72))
+        spikes[0, ::12] = 1
+        spike_seasonality = temporal._detect_seasonality_batched(spikes)[0]
+        assert spike_seasonality['period'] == 12
+        assert 0 < spike_seasonality['strength'] <= 1
+
+        print(f"✓ Seasonal strength: {seasonal['seasonality']['strength']:.3f}")
+
+    def test_12_parallel_run_all(self):
+        """Test concurrent run_all against the individual temporal analyses"""
+        print('\n=== Test 12: Parallel run_all ===')
+        
+        config = {'temporal_analysis': {'min_occurrences': 1}}
+        temporal = TemporalAnalyzer(config)
+        publications_list = pd.DataFrame(self.large_test_data).to_dict('records')
+        
+        results = temporal.run_all(publications_list, {}, max_workers=2, chunk_size=5)
+        
+        for key in ['temporal_analysis', 'temporal_patterns', 'lifecycle_analysis',
+                    'publication_trends', 'comparative_analysis']:
+            assert key in results, f"run_all should return '{key}'"
+        
+        sequential = TemporalAnalyzer(config).analyze_keyword_trends(publications_list, {})
+        assert set(results['temporal_analysis']['individual_trends']) == set(sequential['individual_trends'])
+        for stat in ['total_keywords', 'positive_trends', 'negative_trends']:
+            assert results['temporal_analysis']['summary_statistics'][stat] == sequential['summary_statistics'][stat]
+        assert set(results['lifecycle_analysis']['individual_lifecycles']) == set(sequential['individual_trends'])
+        
+        print(f"✓ run_all analyzed {len(sequential['individual_trends'])} keywords")
+
+    def test_13_date_normalization(self):
+        """Test shared date normalization into integer year/month/quarter columns"""
+        print('\n=== Test 13: Date Normalization ===')
+        
+        raw_dates = pd.Series(['2023-06-15', '2023-06-15', '2021', 2020, None, 'invalid_date',
+                               datetime(2022, 11, 3), '15 Jan 2019'])
+        dates = normalize_dates(raw_dates)
+        
+        assert list(dates.columns) == ['year', 'month', 'quarter']
+        assert dates['year'].tolist()[:4] == [2023, 2023, 2021, 2020]
+        assert dates['month'].tolist()[0] == 6 and dates['quarter'].tolist()[0] == 2
+        assert dates['year'].isna().tolist()[4:6] == [True, True], "Missing/invalid dates should be NA"
+        assert dates.loc[6, 'quarter'] == 4
+        assert dates.loc[7, 'month'] == 1
+        
+        labels = format_period_labels(dates, 'quarter')
+        assert labels[0] == '2023Q2' and labels[2] == '2021Q1', "Unknown month should default to Q1"
+        
+        temporal = TemporalAnalyzer(self.config.config)
+        assert temporal._extract_publication_date({'year': 2021, 'month': 5, 'quarter': 2}) == datetime(2021, 5, 1)
+        assert temporal._extract_publication_date({'publication_date': 'invalid_date'}) is None
+        
+        print("✓ Dates normalized")
+
+    def test_14_streaming_aggregation(self):
+        """Test out-of-core temporal analysis from year-partitioned files"""
+        print('\n=== Test 14: Streaming Aggregation ===')
+        
+        config = {'temporal_analysis': {'min_occurrences': 1}}
+        publications_list = pd.DataFrame(self.large_test_data).to_dict('records')
+        
+        partition_dir = Path(self.temp_dir) / 'partitions'
+        partition_dir.mkdir(exist_ok=True)
+        df = pd.DataFrame(publications_list)
+        for year, year_df in df.groupby(pd.to_datetime(df['publication_date']).dt.year):
+            year_df.to_json(partition_dir / f'{year}.jsonl', orient='records', lines=True, date_format='iso')
+        
+        temporal = TemporalAnalyzer(config)
+        aggregator = temporal.aggregate_partitions(partition_dir, {}, chunk_size=7)
+        assert aggregator.total_publications == len(publications_list)
+        
+        results = temporal.analyze_aggregates(aggregator)
+        in_memory = TemporalAnalyzer(config).run_all(publications_list, {}, max_workers=1)
+        
+        streamed_trends = results['temporal_analysis']['individual_trends']
+        memory_trends = in_memory['temporal_analysis']['individual_trends']
+        assert set(streamed_trends) == set(memory_trends)
+        for keyword, trend in memory_trends.items():
+            assert np.isclose(streamed_trends[keyword]['trend_slope'], trend['trend_slope'], equal_nan=True)
+            assert streamed_trends[keyword]['total_occurrences'] == trend['total_occurrences']
+        assert results['comparative_analysis']['period_data'] == in_memory['comparative_analysis']['period_data']
+        assert (results['publication_trends']['volume_trends']['yearly_counts'] ==
+                in_memory['publication_trends']['volume_trends']['yearly_counts'])
+        
+        # Saved aggregates load without pickle and resume with the same counts
+        saved = aggregator.save(Path(self.temp_dir) / 'aggregates.npz')
+        with np.load(saved) as data:
+            assert data['vocabulary'].dtype.kind == 'U'
+        reloaded = type(aggregator).load(saved)
+        assert reloaded.keyword_list == aggregator.keyword_list
+        assert np.array_equal(reloaded.counts, aggregator.counts)
+        
+        print(f"✓ Streamed {aggregator.total_publications} publications into {len(aggregator.vocabulary)} keywords")
+
+    def test_15_sliding_period_comparison(self):
+        """Test matrix-based comparison over sliding time periods"""
+        print('\n=== Test 15: Sliding Period Comparison ===')
+        
+        publications_list = pd.DataFrame(self.large_test_data).to_dict('records')
+        temporal = TemporalAnalyzer({'temporal_analysis': {'period_window': 2, 'period_step': 1}})
+        results = temporal.compare_time_periods(publications_list, {})
+        
+        period_names = list(results['period_data'])
+        assert len(period_names) > 1, "Sliding windows should cover the observed years"
+        assert period_names[0].count('-') == 1
+        n_pairs = len(period_names) * (len(period_names) - 1) // 2
+        assert len(results['pairwise_comparisons']) == n_pairs
+        
+        # Windows that do not line up with the span still cover the trailing years
+        misaligned = TemporalAnalyzer({'temporal_analysis': {'period_window': 3, 'period_step': 3}})
+        periods = misaligned._resolve_time_periods(pd.Index(range(2010, 2021)))
+        assert list(periods) == ['2010-2012', '2013-2015', '2016-2018', '2018-2020']
+        
+        # Explicit periods take precedence and counts add up across adjacent periods
+        explicit = temporal.compare_time_periods(publications_list, {}, time_periods={
+            'first': {'start': 2020, 'end': 2021},
+            'second': {'start': 2022, 'end': 2024},
+            'all': {'start': 2020, 'end': 2024}
+        })
+        period_data = explicit['period_data']
+        for keyword, count in period_data['all'].items():
+            assert count == period_data['first'].get(keyword, 0) + period_data['second'].get(keyword, 0)
+        
+        changes = explicit['pairwise_comparisons']['first_vs_second']['keyword_changes']
+        for keyword in explicit['pairwise_comparisons']['first_vs_second']['emerging_keywords']:
+            assert changes[keyword]['change_type'] == 'emerged' and changes[keyword]['change_ratio'] == 999
+        
+        print(f"✓ Compared {len(period_names)} sliding periods")
+
+    def test_16_embedding_store(self):
+        """Test content-addressed per-text embedding store"""
+        print('\n=== Test 16: Embedding Store ===')
+        
+        encoded = []
+        
+        def encode(texts):
+            encoded.extend(texts)
+            return np.array([[len(text), text.count(' '), 1.0] for text in texts])
+        
+        store_dir = Path(self.temp_dir) / 'embedding_store'
+        store = EmbeddingStore(store_dir, 'test-model', 512)
+        
+        embeddings = store.embed(['alpha beta', '', 'gamma', 'alpha beta'], encode)
+        assert embeddings.shape == (4, 3), "Result should be row-aligned with the input"
+        assert not embeddings[1].any(), "Empty texts should get zero vectors"
+        assert np.array_equal(embeddings[0], embeddings[3])
+        assert encoded == ['alpha beta', 'gamma'], "Duplicates and empty texts should not be encoded"
+        
+        # A new store instance only encodes texts it has not seen
+        reopened = EmbeddingStore(store_dir, 'test-model', 512)
+        embeddings = reopened.embed(['gamma', 'delta epsilon', 'alpha beta'], encode)
+        assert encoded[2:] == ['delta epsilon']
+        assert embeddings[1].tolist() == [13.0, 1.0, 1.0]
+        assert len(reopened) == 3
+        
+        # Index entries past the manifest's shards (an interrupted append) are dropped and re-encoded
+        manifest = (store_dir / 'manifest.json').read_text()
+        reopened.embed(['zeta'], encode)
+        (store_dir / 'manifest.json').write_text(manifest)
+        recovered = EmbeddingStore(store_dir, 'test-model', 512)
+        assert recovered.lookup(recovered.keys(['zeta']))[0] == -1
+        assert recovered.embed(['zeta'], encode)[0].tolist() == [4.0, 0.0, 1.0]
+        assert encoded[-2:] == ['zeta', 'zeta'] and len(recovered) == 4
+        
+        # Keys depend on the model configuration
+        assert not np.array_equal(reopened.keys(['gamma']), EmbeddingStore(store_dir / 'other', 'test-model', 256).keys(['gamma']))
+        
+        print(f"✓ Stored {len(reopened)} embeddings, encoded {len(encoded)} texts")
+
+    def test_17_embedding_snapshots(self):
+        """Test memory-mapped embedding snapshots with JSON sidecar"""
+        print('\n=== Test 17: Embedding Snapshots ===')
+        
+        rng = np.random.default_rng(0)
+        embeddings = rng.normal(size=(50, 16)).astype(np.float32)
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+        row_ids = [f'W{i}' for i in range(50)]
+        
+        for dtype, tolerance in [('float32', 0), ('float16', 1e-3), ('int8', 1e-2)]:
+            path = save_embeddings(Path(self.temp_dir) / f'snapshot_{dtype}', embeddings,
+                                   model_name='test-model', row_ids=row_ids, dtype=dtype)
+            loaded, metadata = load_embeddings(path)
+            
+            assert loaded.shape == embeddings.shape
+            assert np.abs(np.asarray(loaded, dtype=np.float32) - embeddings).max() <= tolerance
+            assert metadata['dtype'] == dtype and metadata['dimension'] == 16
+            assert metadata['row_ids'] == row_ids
+            if dtype != 'int8':
+                assert isinstance(loaded, np.memmap), "Float snapshots should load as memory maps"
+        
+        print("✓ Snapshots round-trip for float32, float16 and int8")
+
+    def test_18_embedding_batch_planning(self):
+        """Test length bucketing and token-budget batch sizes of the embedding engine"""
+        print('\n=== Test 18: Embedding Batch Planning ===')
+        
+        engine = EmbeddingEngine(None, {'max_length': 512, 'batch_size': 64, 'token_budget': 4096})
+        texts = ['word ' * n for n in [2, 400, 30, 5, 2000, 60, 1]]
+        
+        lengths = engine.token_lengths(texts)
+        assert lengths.max() <= 512, "Lengths should be truncated to max_length"
+        
+        buckets = engine.plan_buckets(lengths)
+        indices = np.concatenate([bucket['indices'] for bucket in buckets])
+        assert sorted(indices.tolist()) == list(range(len(texts))), "Every text should be in exactly one bucket"
+        
+        bucket_lengths = [bucket['max_length'] for bucket in buckets]
+        assert bucket_lengths == sorted(bucket_lengths, reverse=True), "Longest bucket should come first"
+        for bucket in buckets:
+            assert lengths[bucket['indices']].max() <= bucket['max_length']
+            assert bucket['batch_size'] == min(64, 4096 // bucket['max_length'])
+
+        # The multi-process pool is started once per engine and reused until close()
+        class PoolModel:
+            def __init__(self):
+                self.calls = {'start': 0, 'encode': 0, 'stop': 0}
+
+            def start_multi_process_pool(self, target_devices):
+                self.calls['start'] += 1
+                return {'devices': target_devices}
+
+            def encode_multi_process(self, texts, pool, batch_size, normalize_embeddings):
+                self.calls['encode'] += 1
+                return np.ones((len(texts), 4), dtype=np.float32)
+
+            def stop_multi_process_pool(self, pool):
+                self.calls['stop'] += 1
+
+        model = PoolModel()
+        with EmbeddingEngine(model, {'num_processes': 2, 'multiprocess_min_texts': 1}) as pooled:
+            first = pooled.encode(texts)
+            second = pooled.encode(texts[:3])
+            assert first.shape == (len(texts), 4) and second.shape == (3, 4)
+            assert model.calls['start'] == 1, "Pool should be started once and reused across calls"
+            assert model.calls['stop'] == 0, "Pool should stay open between calls"
+        assert model.calls['stop'] == 1, "Closing the engine should stop the pool"
+
+        print(f"✓ Planned {len(buckets)} length buckets; pool reused across {model.calls['encode']} encodes")
+
+    def test_19_lazy_heavy_imports(self):
+        """Test that importing the module does not load embedding or UMAP libraries"""
+        print('\n=== Test 19: Lazy Heavy Imports ===')
+        
+        code = ("import sys, slr_core.keyword_analysis; "
+                "print(sorted(m for m in ('sentence_transformers', 'umap', 'torch') if m in sys.modules))")
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                cwd=str(Path(__file__).parent))
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip().splitlines()[-1] == '[]', f"Heavy modules imported eagerly: {result.stdout}"
+        
+        print("✓ sentence_transformers, umap and torch are imported lazily")
+
+    def test_20_vector_index_search(self):
+        """Test persisted, incrementally updated vector index with filters"""
+        print('\n=== Test 20: Vector Index Search ===')
+        
+        rng = np.random.default_rng(42)
+        vectors = rng.normal(size=(300, 32)).astype(np.float32)
+        ids = [f'W{i}' for i in range(300)]
+        years = [2018 + i % 6 for i in range(300)]
+        sources = ['openalex' if i % 2 else 'core' for i in range(300)]
+        
+        index_dir = Path(self.temp_dir) / 'vector_index'
+        index = VectorIndex(index_dir, backend='numpy')
+        assert index.add(vectors[:200], ids[:200], years[:200], sources[:200]) == 200
+        
+        # Reopen and add overlapping batch: only new IDs are added
+        index = VectorIndex(index_dir)
+        assert index.add(vectors[150:], ids[150:], years[150:], sources[150:]) == 100
+        assert len(index) == 300
+        
+        results = index.search(vectors[250], k=5)
+        assert results[0]['id'] == 'W250' and np.isclose(results[0]['score'], 1.0)
+        assert [r['score'] for r in results] == sorted([r['score'] for r in results], reverse=True)
+        
+        filtered = index.search(vectors[250], k=10, filters={'year': (2020, 2021), 'source': 'core'})
+        assert len(filtered) == 10
+        assert all(2020 <= r['year'] <= 2021 and r['source'] == 'core' for r in filtered)
+        
+        print(f"✓ Indexed {len(index)} vectors with {index.backend} backend")
+
+    def test_21_scalable_clustering(self):
+        """Test MiniBatchKMeans, kNN-graph DBSCAN/HDBSCAN and PCA pre-reduction on memory-mapped embeddings"""
+        print('\n=== Test 21: Scalable Clustering ===')
+        
+        rng = np.random.default_rng(7)
+        centers = rng.normal(size=(4, 48)) * 2
+        embeddings = np.vstack([center + rng.normal(size=(250, 48)) * 0.4 for center in centers]).astype(np.float32)
+        truth = np.repeat(np.arange(4), 250)
+        
+        path = Path(self.temp_dir) / 'clustering_embeddings.npy'
+        np.save(path, embeddings)
+        embeddings = np.load(path, mmap_mode='r')
+        
+        analyzer = SemanticAnalyzer(self.config)
+        
+        def matches_truth(labels):
+            labels = np.asarray(labels)
+            clustered = labels >= 0
+            # Every predicted cluster lies within one true cluster
+            return all(len(set(truth[clustered][labels[clustered] == label])) == 1
+                       for label in set(labels[clustered]))
+        
+        minibatch = analyzer.perform_clustering(embeddings, method='minibatch_kmeans',
+                                                n_clusters=4, batch_size=128)
+        assert minibatch['n_clusters'] == 4 and matches_truth(minibatch['labels'])
+        
+        for method in ('knn_dbscan', 'hdbscan'):
+            result = analyzer.perform_clustering(embeddings, method=method, n_neighbors=10,
+                                                 graph_backend='numpy', pca_components=16)
+            assert 'error' not in result['metadata'], result['metadata']
+            assert result['n_clusters'] == 4 and matches_truth(result['labels']), method
+            assert result['metadata']['pca']['n_components'] == 16
+        
+        analyzer.clustering_config = {**analyzer.clustering_config, 'methods': ['minibatch_kmeans', 'hdbscan']}
+        configured = analyzer.perform_clustering(embeddings, method=None, n_clusters=4)
+        assert set(configured) == {'minibatch_kmeans', 'hdbscan', 'method'}
+        
+        print("✓ Scalable clustering modes recover the planted clusters")
+
+    def test_22_sampled_cluster_metrics(self):
+        """Test exact, stratified-sample and centroid-based cluster quality metrics"""
+        print('\n=== Test 22: Sampled Cluster Metrics ===')
+        
+        rng = np.random.default_rng(11)
+        centers = rng.normal(size=(3, 16)) * 3
+        embeddings = np.vstack([center + rng.normal(size=(size, 16)) for center, size in zip(centers, (600, 300, 60))])
+        
+        analyzer = SemanticAnalyzer(self.config)
+        exact = analyzer.perform_clustering(embeddings, method='kmeans', n_clusters=3, metrics_mode='full')
+        assert exact['metrics']['silhouette_approximation'] == 'exact'
+        assert exact['davies_bouldin_score'] > 0
+        
+        sampled = analyzer.perform_clustering(embeddings, method='kmeans', n_clusters=3,
+                                              metrics_mode='sampled', metrics_sample_size=200)
+        info = sampled['metrics']
+        assert info['silhouette_approximation'] == 'stratified_sample'
+        assert info['sample_size'] < len(embeddings)
+        low, high = info['silhouette_ci']
+        assert low <= sampled['silhouette_score'] <= high
+        assert abs(sampled['silhouette_score'] - exact['silhouette_score']) < 0.05
+        
+        simplified = analyzer.perform_clustering(embeddings, method='kmeans', n_clusters=3, metrics_mode='simplified')
+        assert simplified['metrics']['silhouette_approximation'] == 'centroid_simplified'
+        assert 0 < simplified['silhouette_score'] <= 1
+        
+        skipped = analyzer.perform_clustering(embeddings, method='kmeans', n_clusters=3, metrics_mode='none')
+        assert skipped['metrics'] == {'mode': 'none'} and 'silhouette_score' not in skipped
+        
+        # With noise, approximate modes read only sampled rows instead of gathering all clustered rows
+        class GatherTracker(np.ndarray):
+            gathered = []
+            
+            def __getitem__(self, index):
+                if isinstance(index, np.ndarray):
+                    GatherTracker.gathered.append(len(index))
+                return super().__getitem__(index)
+        
+        noisy_labels = np.asarray(exact['labels']).copy()
+        noisy_labels[::10] = -1
+        tracked = np.asarray(embeddings).view(GatherTracker)
+        noisy = compute_cluster_metrics(tracked, noisy_labels, mode='sampled', sample_size=20)
+        assert noisy['metrics']['excluded_noise_points'] == int(np.sum(noisy_labels < 0))
+        assert max(GatherTracker.gathered) <= 200 < int(np.sum(noisy_labels >= 0))
+        
+        # Noise is excluded in every mode, so 'full' scores only the clustered points
+        clustered = noisy_labels >= 0
+        full = compute_cluster_metrics(embeddings, noisy_labels, mode='full')
+        assert full['metrics']['excluded_noise_points'] == int(np.sum(~clustered))
+        assert np.isclose(full['silhouette_score'], silhouette_score(embeddings[clustered], noisy_labels[clustered]))
+        auto = compute_cluster_metrics(embeddings, noisy_labels, mode='auto', sample_size=int(clustered.sum()))
+        assert auto['metrics']['mode'] == 'full', "'auto' should count non-noise points only"
+        
+        # Every computed result records its approximation
+        single = compute_cluster_metrics(embeddings, np.where(clustered, 0, -1), mode='sampled')
+        assert single['metrics']['silhouette_approximation'] == 'not_computed'
+        assert compute_cluster_metrics(embeddings, np.zeros(len(embeddings)), mode='full')['metrics'][
+            'silhouette_approximation'] == 'not_computed'
+        
+        print(f"✓ Exact silhouette {exact['silhouette_score']:.3f}, "
+              f"sampled {sampled['silhouette_score']:.3f} [{low:.3f}, {high:.3f}]")
+
+    def test_23_select_k_sweep(self):
+        """Test parallel, warm-started k selection sweep"""
+        print('\n=== Test 23: k Selection Sweep ===')
+        
+        rng = np.random.default_rng(5)
+        centers = rng.normal(size=(4, 24)) * 3
+        embeddings = np.vstack([center + rng.normal(size=(150, 24)) * 0.5 for center in centers]).astype(np.float32)
+        path = Path(self.temp_dir) / 'select_k_embeddings.npy'
+        np.save(path, embeddings)
+        embeddings = np.load(path, mmap_mode='r')
+        
+        analyzer = SemanticAnalyzer(self.config)
+        selection = analyzer.select_k(embeddings, k_values=range(2, 8), max_workers=2)
+        
+        table = selection['table']
+        assert table['k'].tolist() == list(range(2, 8))
+        assert table['warm_start'].sum() >= 4, "Fits after the first k of each segment should warm-start"
+        assert selection['best_k'] == 4 and selection['elbow_k'] == 4
+        
+        result = selection['result']
+        assert result['method'] == 'minibatch_kmeans' and result['n_clusters'] == 4
+        assert sorted(np.bincount(result['labels']).tolist()) == [150, 150, 150, 150]
+        
+        print(f"✓ Selected k={selection['best_k']} from {len(table)} candidates")
+
+    def test_24_vectorized_cluster_statistics(self):
+        """Test all-cluster statistics against a per-cluster reference computation"""
+        print('\n=== Test 24: Vectorized Cluster Statistics ===')
+        
+        rng = np.random.default_rng(3)
+        embeddings = rng.normal(size=(500, 12)).astype(np.float32)
+        labels = rng.integers(-1, 6, size=500)
+        labels[labels == 4] = 5  # Gap in the label range
+        
+        analyzer = SemanticAnalyzer(self.config)
+        stats = analyzer._calculate_cluster_statistics(embeddings, labels)
+        
+        assert stats['cluster_ids'].tolist() == [0, 1, 2, 3, 5]
+        assert isinstance(stats['centroids'], np.ndarray) and stats['centroids'].shape == (5, 12)
+        
+        for i, cluster_id in enumerate(stats['cluster_ids']):
+            members = embeddings[labels == cluster_id]
+            centroid = members.mean(axis=0)
+            distances = np.linalg.norm(members - centroid, axis=1)
+            assert stats['sizes'][i] == len(members)
+            assert np.allclose(stats['centroids'][i], centroid, atol=1e-5)
+            assert np.isclose(stats['mean_distance_to_centroid'][i], distances.mean(), rtol=1e-4)
+            assert np.isclose(stats['std_distance_to_centroid'][i], distances.std(), rtol=1e-3)
+            assert np.isclose(stats['max_distance_to_centroid'][i], distances.max(), rtol=1e-4)
+            assert np.isclose(stats['min_distance_to_centroid'][i], distances.min(), rtol=1e-4)
+        
+        print(f"✓ Statistics for {len(stats['cluster_ids'])} clusters match the reference")
+
+    def test_25_persisted_reducers(self):
+        """Test fit-once / transform-many dimensionality reduction with saved reducers"""
+        print('\n=== Test 25: Persisted Reducers ===')
+        
+        rng = np.random.default_rng(21)
+        embeddings = rng.normal(size=(400, 32)).astype(np.float32)
+        new_embeddings = rng.normal(size=(20, 32)).astype(np.float32)
+        
+        cache_dir = Path(self.temp_dir) / 'reducer_cache'
+        analyzer = SemanticAnalyzer(self.config)
+        analyzer.cache_dir = cache_dir
+        
+        layout = analyzer.reduce_dimensions(embeddings, method='pca', reducer_key='corpus', fit_sample_size=100)
+        assert layout.shape == (400, 2)
+        assert analyzer.load_reducer('corpus', 'pca', 2, n_features=32) is not None
+        
+        # A fresh analyzer projects new points into the saved layout instead of refitting
+        analyzer = SemanticAnalyzer(self.config)
+        analyzer.cache_dir = cache_dir
+        projected = analyzer.reduce_dimensions(np.vstack([embeddings[:5], new_embeddings]),
+                                               method='pca', reducer_key='corpus')
+        assert np.allclose(projected[:5], layout[:5], atol=1e-4)
+        
+        refitted = analyzer.reduce_dimensions(embeddings, method='pca', reducer_key='corpus', refit=True)
+        assert refitted.shape == (400, 2)
+        assert analyzer.load_reducer('corpus', 'pca', 2, n_features=64) is None, "Dimension mismatch should not load"
+        
+        # A reducer fitted on another embedding model of the same dimension is refitted, not reused
+        other_model = SemanticAnalyzer(self.config)
+        other_model.cache_dir, other_model.model_name = cache_dir, 'other/model-32d'
+        assert other_model.load_reducer('corpus', 'pca', 2, n_features=32) is None
+        other_model.reduce_dimensions(new_embeddings, method='pca', reducer_key='corpus')
+        assert other_model.load_reducer('corpus', 'pca', 2, n_features=32) is not None
+        assert analyzer.load_reducer('corpus', 'pca', 2, n_features=32) is None
+        
+        print("✓ Saved PCA reducer projects new embeddings into the existing layout")
+
+    def test_26_cluster_topic_labelling(self):
+        """Test c-TF-IDF cluster topics, representative publications and compact output"""
+        print('\n=== Test 26: Cluster Topic Labelling ===')
+        
+        df = pd.DataFrame(self.large_test_data)
+        labels = np.zeros(len(df), dtype=int)
+        blockchain = df['abstract'].str.contains('blockchain', case=False).to_numpy()
+        forecasting = df['abstract'].str.contains('forecasting', case=False).to_numpy()
+        labels[blockchain] = 1
+        labels[forecasting] = 2
+        labels[0] = -1  # Noise
+        
+        analyzer = SemanticAnalyzer(self.config)
+        topics = analyzer.analyze_cluster_topics(df, labels.tolist())
+        
+        assert sorted(topics) == [0, 1, 2], "Noise should not get a topic"
+        assert 'blockchain' in list(topics[1]['top_terms'])[:3]
+        assert 'forecasting' in list(topics[2]['top_terms'])[:3]
+        assert topics[1]['size'] == blockchain.sum()
+        assert len(topics[1]['publications']) == topics[1]['size']
+        assert 1 <= len(topics[2]['representative_publications']) <= 3
+        assert sum(topics[0]['source_distribution'].values()) == topics[0]['size']
+        
+        # Representative publications by embedding centroid, without full listings
+        embeddings = np.eye(len(df))[:, :8].astype(np.float32) + 0.1
+        compact = analyzer.analyze_cluster_topics(df, labels.tolist(), embeddings=embeddings,
+                                                  include_publications=False)
+        assert all('publications' not in info for info in compact.values())
+        assert compact[1]['top_terms'] == topics[1]['top_terms']
+        
+        print(f"✓ Cluster 1 topic: {', '.join(list(topics[1]['top_terms'])[:3])}")
+
+    def test_27_incremental_cluster_assignment(self):
+        """Test assigning new publications to a saved cluster model with drift-triggered reclustering"""
+        print('\n=== Test 27: Incremental Cluster Assignment ===')
+        
+        rng = np.random.default_rng(27)
+        centers = rng.normal(scale=10, size=(3, 16))
+        corpus = np.vstack([c + rng.normal(size=(100, 16)) for c in centers]).astype(np.float32)
+        corpus_ids = [f'pub{i}' for i in range(len(corpus))]
+        
+        analyzer = SemanticAnalyzer(self.config)
+        analyzer.cache_dir = Path(self.temp_dir) / 'cluster_model_cache'
+        analyzer.incremental_config = {'model_dir': None, 'n_neighbors': 5}
+        
+        clustering = analyzer.perform_clustering(corpus, method='kmeans', n_clusters=3)
+        assert analyzer.save_cluster_model(corpus, clustering, model_key='corpus', row_ids=corpus_ids) is not None
+        
+        # New publications near existing centroids join their clusters without drift
+        new = (centers[[0, 2]] + rng.normal(scale=0.5, size=(2, 16))).astype(np.float32)
+        result = analyzer.update_clusters(new, model_key='corpus')
+        assignment = result['assignment']
+        labels = np.asarray(clustering['labels'])
+        assert list(assignment['labels']) == [labels[0], labels[200]]
+        assert not assignment['outliers'].any()
+        assert not result['reclustered']
+        
+        # Unknown models are reported, not created
+        assert 'error' in analyzer.assign_to_clusters(new, model_key='missing')
+        
+        # A new topic far from all clusters is flagged and triggers a warm-started recluster
+        novel = (rng.normal(scale=10, size=16) + rng.normal(size=(40, 16))).astype(np.float32) + 40
+        full_corpus = np.vstack([corpus, new, novel])
+        result = analyzer.update_clusters(novel, model_key='corpus', corpus_embeddings=full_corpus)
+        assert result['assignment']['outliers'].all()
+        assert 'outlier_rate' in result['assignment']['drift']['thresholds_crossed']
+        assert result['reclustered']
+        assert len(result['clustering']['labels']) == len(full_corpus)
+        
+        # The saved model is replaced, so drift starts over
+        reset = analyzer.assign_to_clusters(corpus[:3], model_key='corpus')
+        assert reset['drift']['n_assigned'] == 3
+        
+        # Replacing a model without IDs drops the old IDs, so stale neighbour labels are not used
+        four = analyzer.perform_clustering(corpus, method='kmeans', n_clusters=4)
+        analyzer.save_cluster_model(corpus, four, model_key='replaced', row_ids=corpus_ids)
+        two = analyzer.perform_clustering(corpus, method='kmeans', n_clusters=2)
+        replaced = analyzer.save_cluster_model(corpus, two, model_key='replaced')
+        assert not replaced.id_labels
+        stale = replaced.assign(corpus[:2], neighbor_ids=[corpus_ids[:5], corpus_ids[200:205]])
+        assert list(stale['assigned_by']) == ['centroid', 'centroid']
+        
+        # All-noise results are not saved, and the previous model stays usable
+        noise = {'labels': [-1] * len(corpus), 'method': 'dbscan'}
+        assert analyzer.save_cluster_model(corpus, noise, model_key='replaced') is None
+        assert 'error' not in analyzer.assign_to_clusters(corpus[:2], model_key='replaced')
+        
+        print(f"✓ Assigned {len(new)} publications incrementally, reclustered after "
+              f"{len(novel)} outliers")
+
+    def test_28_keyword_canonicalization(self):
+        """Test lexical and embedding-based merging of near-synonym keywords"""
+        print('\n=== Test 28: Keyword Canonicalization ===')
+        
+        keywords_df = pd.DataFrame({
+            'publication_id': [0, 0, 1, 2, 3, 4, 5],
+            'keyword': ['supply chain', 'supply chains', 'supply-chain', 'supply chain',
+                        'scm', 'machine learning', 'blockchain'],
+            'year': [2020, 2020, 2021, 2021, 2022, 2022, 2023]
+        })
+        
+        # Stand-in embedding model: 'scm' is embedded close to 'supply chain'
+        topics = {'supply chain': 0, 'scm': 0, 'machine learning': 1, 'blockchain': 2}
+        def embed_fn(texts):
+            vectors = np.eye(3)[[topics[text] for text in texts]]
+            vectors[[text == 'scm' for text in texts], 1] = 0.2
+            return vectors.astype(np.float32)
+        
+        analyzer = SemanticAnalyzer(self.config)
+        result = analyzer.build_keyword_synonym_map(keywords_df['keyword'].tolist(), embed_fn=embed_fn,
+                                                    similarity_threshold=0.9, backend='numpy')
+        assert result['semantic']
+        assert result['synonym_map'] == {'supply chains': 'supply chain', 'supply-chain': 'supply chain',
+                                         'scm': 'supply chain'}
+        assert result['n_keywords'] == 6 and result['n_canonical'] == 3
+        
+        # Lexical merging only when no embeddings are available
+        lexical = analyzer.build_keyword_synonym_map(keywords_df['keyword'].tolist(), embed_fn=lambda texts: None)
+        assert not lexical['semantic']
+        assert 'scm' not in lexical['synonym_map'] and lexical['synonym_map']['supply-chain'] == 'supply chain'
+        
+        canonical_df = apply_synonym_map_to_frame(keywords_df, result['synonym_map'])
+        assert len(canonical_df) == 6, "Variants within one publication should collapse"
+        assert 'original_keyword' in canonical_df.columns
+        assert canonical_df['keyword'].value_counts()['supply chain'] == 4
+        
+        extraction = {'keywords': [{'keyword': 'supply chains', 'score': 0.4}, {'keyword': 'supply chain', 'score': 0.6}],
+                      'method': 'tfidf'}
+        merged = apply_synonym_map_to_results(extraction, result['synonym_map'])
+        assert merged['keywords'] == [{'keyword': 'supply chain', 'score': 0.6}]
+        
+        print(f"✓ {result['n_keywords']} keywords canonicalized into {result['n_canonical']}")
+
+    def test_29_vectorized_api_keywords(self):
+        """Test vectorized API keyword extraction across keyword field formats"""
+        print('\n=== Test 29: Vectorized API Keyword Extraction ===')
+        
+        df = pd.DataFrame({
+            'title': [f'Paper {i}' for i in range(6)],
+            'publication_date': ['2021-03-01', '2022', None, '2023-07-15', '2020', '2024-01-01'],
+            'keywords': [
+                ['Supply Chain', '  AI ', None],
+                "['Supply chain management', \"Children's Logistics\"]",  # CSV export of a list
+                'blockchain; smart contracts',
+                'nan',
+                np.nan,
+                'edge computing|iot'
+            ],
+            'fieldsOfStudy': [None, ['Computer Science', 'Business'], 'Economics, Law', None, 'Engineering', None]
+        }, index=[10, 11, 12, 13, 14, 15])
+        
+        extractor = KeywordExtractor(self.config)
+        result = extractor.extract_api_keywords(df)
+        
+        expected = [
+            (10, 'supply chain'),
+            (11, 'supply chain management'), (11, "children's logistics"),
+            (11, 'computer science'), (11, 'business'),
+            (12, 'blockchain'), (12, 'smart contracts'), (12, 'economics'), (12, 'law'),
+            (14, 'engineering'),
+            (15, 'edge computing'), (15, 'iot')
+        ]
+        assert list(zip(result['publication_id'], result['keyword'])) == expected
+        assert (result['extraction_method'] == 'api_provided').all()
+        assert result.loc[result['publication_id'] == 11, 'year'].eq(2022).all()
+        assert result.loc[result['publication_id'] == 12, 'year'].isna().all()
+        
+        # Distinct keyword strings are parsed once, so repeated rows scale linearly
+        large = pd.concat([df] * 2000, ignore_index=True)
+        assert len(extractor.extract_api_keywords(large)) == len(expected) * 2000
+        
+        print(f"✓ Extracted {len(result)} API keywords from {len(df)} publications")
+
+    def test_30_vectorized_keyword_statistics(self):
+        """Test aggregated keyword frequencies and the wide temporal distribution"""
+        print('\n=== Test 30: Vectorized Keyword Statistics ===')
+        
+        keywords_df = pd.DataFrame({
+            'keyword': ['ai', 'iot', 'ai', 'blockchain', 'ai', 'iot'],
+            'year': [2020, 2021, 2021, 2020, 2023, 2021],
+            'extraction_method': ['api_provided'] * 6
+        })
+        
+        extractor = KeywordExtractor(self.config)
+        frequencies = extractor.calculate_keyword_frequencies(keywords_df)
+        assert frequencies['keyword'].tolist() == ['ai', 'iot', 'blockchain']
+        assert frequencies['frequency'].tolist() == [3, 2, 1]
+        assert frequencies['year_span'].tolist() == [3, 1, 1]
+        assert frequencies.iloc[0][['first_year', 'last_year']].tolist() == [2020, 2023]
+        assert frequencies['rank'].tolist() == [1, 2, 3]
+        
+        temporal = extractor.analyze_temporal_distribution(keywords_df)
+        ai = temporal.iloc[0]
+        assert ai['keyword'] == 'ai' and ai['total_frequency'] == 3 and ai['active_periods'] == 3
+        assert (ai['first_appearance'], ai['last_appearance']) == (2020, 2023)
+        assert temporal.set_index('keyword').loc['iot', 'peak_period'] == 2021
+        
+        # Per-period counts are numeric columns, not embedded dictionaries
+        assert temporal[[2020, 2021, 2023]].to_numpy().sum() == len(keywords_df)
+        assert temporal[[2020, 2021, 2023]].dtypes.map(pd.api.types.is_integer_dtype).all()
+        
+        print(f"✓ {len(temporal)} keywords over {temporal.shape[1] - 7} periods")
+
+    def test_31_text_preprocessing(self):
+        """Test shared text preprocessing for keyword extraction and embeddings"""
+        print('\n=== Test 31: Text Preprocessing ===')
+        
+        texts = ['AI-driven Supply-Chain (SCM) risk: a review!', None, np.nan, '']
+        assert preprocess_for_keywords_batch(texts) == ['ai-driven supply-chain scm risk review', '', '', '']
+        
+        keywords = pd.Series(['  Supply Chain. ', '"IoT"', '  Supply Chain. ', None], index=[5, 6, 7, 8])
+        cleaned = clean_keywords(keywords)
+        assert cleaned.tolist() == ['supply chain', 'iot', 'supply chain', '']
+        assert cleaned.index.tolist() == [5, 6, 7, 8]
+        
+        # Whitespace-token stand-in for a fast tokenizer with special tokens and offsets
+        class WhitespaceTokenizer:
+            def __call__(self, texts, max_length, **kwargs):
+                offsets = [[(0, 0)] + [m.span() for m in re.finditer(r'\S+', text)][:max_length - 2] + [(0, 0)]
+                           for text in texts]
+                return {'input_ids': [list(range(len(o))) for o in offsets], 'offset_mapping': offsets}
+        
+        long_text = ' '.join(['logistics'] * 100)
+        truncated = preprocess_for_embedding_batch([long_text, '  short \n text '], max_tokens=32,
+                                                   tokenizer=WhitespaceTokenizer())
+        assert len(truncated[0].split()) == 30, "Special tokens count towards the limit"
+        assert truncated[1] == 'short text'
+        
+        # Without a tokenizer, four characters per token are assumed
+        assert len(preprocess_for_embedding_batch([long_text], max_tokens=32)[0]) == 128
+        assert preprocess_for_embedding_batch([long_text], max_tokens=None) == [long_text]
+
+        # Store keys come from the full normalized text, never from tokenizer-dependent truncation
+        analyzer = SemanticAnalyzer(self.config)
+        analyzer.cache_dir = Path(self.temp_dir) / 'preprocessing_cache'
+        analyzer._get_tokenizer = lambda: pytest.fail("Embedding generation should not load a tokenizer")
+        analyzer._encode_texts = lambda batch: np.ones((len(batch), 4), dtype=np.float32)
+        assert analyzer.generate_embeddings([long_text + '  ']).shape == (1, 4)
+        store = analyzer._get_embedding_store()
+        assert store.lookup(store.keys([long_text]))[0] >= 0
+
+        print("✓ Keyword and embedding preprocessing share compiled, cached cleaning")
+
+    def test_32_fast_extractor_startup(self):
+        """Test offline KeywordExtractor startup with lazily built extractors"""
+        print('\n=== Test 32: Fast Extractor Startup ===')
+        
+        start_time = datetime.now()
+        extractors = [KeywordExtractor(self.config) for _ in range(20)]
+        elapsed = (datetime.now() - start_time).total_seconds()
+        assert elapsed < 1.0, f"Creating 20 extractors took {elapsed:.2f}s"
+        
+        extractor = extractors[0]
+        assert not extractor._extractors, "Extractors should be built on first use"
+        assert 'the' in extractor.stop_words and 'paper' in extractor.stop_words
+        
+        # Stop word sets are shared per process but each extractor gets its own copy
+        extractor.stop_words.add('logistics')
+        assert 'logistics' not in extractors[1].stop_words
+        
+        result = extractor.extract_nlp_keywords(self.large_test_data['abstract'], method='tfidf', top_n=5)
+        assert len(result['keywords']) == 5
+        assert set(extractor._extractors) == {'tfidf'}
+        
+        print(f"✓ Created 20 extractors in {elapsed * 1000:.1f} ms")
+
+    def test_33_cooccurrence_network(self):
+        """Test sparse keyword co-occurrence networks, communities and period snapshots"""
+        print('\n=== Test 33: Keyword Co-occurrence Network ===')
+        
+        # Two keyword groups that co-occur within, but rarely across, publications
+        rows = []
+        for pub in range(40):
+            group = ['supply chain', 'logistics', 'inventory'] if pub % 2 else ['deep learning', 'neural network', 'transformer']
+            rows += [{'publication_id': pub, 'keyword': kw, 'year': 2020 + pub % 4} for kw in group]
+        rows.append({'publication_id': 0, 'keyword': 'logistics', 'year': 2020})  # one bridge
+        keywords_df = pd.DataFrame(rows)
+        
+        extractor = KeywordExtractor(self.config)
+        network = extractor.build_cooccurrence_network(keywords_df, top_k=5, min_occurrences=1)
+        nodes = network['nodes'].set_index('keyword')
+        
+        assert nodes.loc['logistics', 'occurrences'] == 21
+        assert nodes.loc['supply chain', 'community'] == nodes.loc['inventory', 'community']
+        assert nodes.loc['supply chain', 'community'] != nodes.loc['transformer', 'community']
+        assert network['modularity'] > 0.3
+        
+        edges = network['edges']
+        pair = edges[(edges['source'] == 'supply chain') & (edges['target'] == 'logistics')]
+        assert pair['cooccurrence'].iloc[0] == 20
+        assert (network['adjacency'] != network['adjacency'].T).nnz == 0, "Adjacency should be symmetric"
+        
+        jaccard = extractor.build_cooccurrence_network(keywords_df, normalization='jaccard', communities=False,
+                                                       min_occurrences=1)
+        assert jaccard['edges']['weight'].max() == 1.0
+        assert 'community' not in jaccard['nodes'].columns
+        
+        # Label propagation fallback without networkx
+        fallback = extractor.build_cooccurrence_network(keywords_df, community_method='label_propagation',
+                                                        min_occurrences=1)
+        assert fallback['nodes']['community'].nunique() == 2
+        
+        snapshots = extractor.cooccurrence_snapshots(keywords_df, min_occurrences=1)
+        assert list(snapshots) == [2020, 2021, 2022, 2023]
+        assert all(snapshot['adjacency'].shape == network['adjacency'].shape for snapshot in snapshots.values())
+        assert snapshots[2021]['nodes']['keyword'].tolist() == ['supply chain', 'logistics', 'inventory']
+        
+        print(f"✓ {len(nodes)} keywords, {len(edges)} edges, modularity {network['modularity']:.2f}")
+
+    def test_34_citation_graph(self):
+        """Test the sparse citation graph metrics and snowball expansion"""
+        print('\n=== Test 34: Citation Graph ===')
+        
+        # p1 and p2 are both cited by p3, p4 and p5; p3 and p4 share two references
+        links = {
+            'p1': {'references': [], 'citations': ['p3', 'p4', 'p5']},
+            'p2': {'references': [], 'citations': ['p3', 'p4', 'p5']},
+            'p3': {'references': ['p1', 'p2'], 'citations': ['p6']},
+            'p4': {'references': ['p1', 'p2'], 'citations': []},
+            'p5': {'references': ['p1', 'p2', 'p9'], 'citations': []},
+            'p6': {'references': ['p3'], 'citations': []},
+        }
+        requested = []
+        
+        def fetch_links(paper_ids):
+            requested.extend(paper_ids)
+            return [{'paper_id': paper_id, **links[paper_id]} for paper_id in paper_ids if paper_id in links]
+        
+        graph = CitationGraph.from_publications(fetch_links(list(links)))
+        assert graph.n_edges == 8, "Links seen from both ends should be stored once"
+        assert graph.in_degree()[graph.nodes(['p1'])[0]] == 3
+        
+        co_citation = graph.co_citation()
+        p1, p2, p3, p4 = graph.nodes(['p1', 'p2', 'p3', 'p4'])
+        assert co_citation[p1, p2] == 3 and co_citation[p1, p1] == 0
+        coupling = graph.bibliographic_coupling(min_count=2)
+        assert coupling[p3, p4] == 2
+        top = graph.top_pairs(co_citation, n_pairs=1)
+        assert set(top.iloc[0][['source', 'target']]) == {'p1', 'p2'} and top.iloc[0]['count'] == 3
+        
+        rank = graph.pagerank()
+        assert abs(rank.sum() - 1) < 1e-9
+        assert rank[p1] > rank[p4], "Highly cited papers should rank higher"
+        assert graph.metrics().iloc[0]['paper_id'] in ('p1', 'p2')
+        
+        # Two hops from p3: p1, p2 and p6 first, then p4, p5 (via p1/p2); p9 is beyond the last hop's fetch
+        requested.clear()
+        expansion = snowball_expand(fetch_links, ['p3'], hops=2)
+        assert expansion['hops'] == {'p3': 0, 'p1': 1, 'p2': 1, 'p6': 1, 'p4': 2, 'p5': 2}
+        assert len(requested) == len(set(requested)), "Papers should be fetched at most once"
+        assert expansion['graph'].n_nodes == 6
+        
+        backward = snowball_expand(fetch_links, ['p5'], hops=3, direction='references')
+        assert set(backward['hops']) == {'p5', 'p1', 'p2', 'p9'}
+        
+        capped = snowball_expand(fetch_links, ['p3'], hops=2, max_papers=3)
+        assert len(capped['hops']) == 3
+        
+        print(f"✓ {graph.n_nodes} papers, {graph.n_edges} citations, "
+              f"snowball reached {expansion['graph'].n_nodes} papers in 2 hops")
+
+    def test_35_backend_parity(self):
+        """Test backend parity checks, stored parity reports and per-backend embedding store keys"""
+        print('\n=== Test 35: Embedding Backend Parity ===')
+        
+        class StubModel:
+            """Stand-in for a SentenceTransformer: random-projection embeddings plus optional noise"""
+            def __init__(self, noise=0.0):
+                self.noise = noise
+            
+            def encode(self, texts, batch_size=8, convert_to_numpy=True, normalize_embeddings=True,
+                       show_progress_bar=False):
+                vectors = np.array([np.random.default_rng(sum(map(ord, text))).normal(size=32) for text in texts])
+                vectors += self.noise * np.random.default_rng(0).normal(size=vectors.shape)
+                return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        
+        reference, close, far = StubModel(), StubModel(noise=0.01), StubModel(noise=2.0)
+        
+        identical = check_backend_parity(reference, reference)
+        assert identical['min_cosine'] > 0.9999 and identical['nearest_neighbour_agreement'] == 1.0
+        assert identical['n_texts'] > 1 and identical['speedup'] is not None
+        
+        parity = check_backend_parity(reference, close, texts=['supply chain', 'logistics', 'inventory', 'routing'])
+        assert parity['n_texts'] == 4
+        assert 0.99 < parity['min_cosine'] <= parity['mean_cosine'] < 1
+        assert parity['nearest_neighbour_agreement'] == 1.0
+        assert check_backend_parity(reference, far)['min_cosine'] < 0.9
+        
+        # Reports are stored per backend key next to the export and read back unchanged
+        cache_folder = Path(self.temp_dir) / 'parity_models'
+        assert load_parity_report('test/model', 'onnx', cache_folder) is None
+        save_parity_report('test/model', 'onnx', cache_folder, identical)
+        save_parity_report('test/model', 'onnx-int8:avx2', cache_folder, parity)
+        assert load_parity_report('test/model', 'onnx', cache_folder) == identical
+        assert load_parity_report('test/model', 'onnx-int8:avx2', cache_folder) == parity
+        assert load_parity_report('test/model', 'onnx-int8:arm64', cache_folder) is None
+        
+        # The analyzer checks a backend once per export and reuses the stored report
+        analyzer = SemanticAnalyzer(self.config)
+        analyzer.cache_dir = Path(self.temp_dir) / 'parity_cache'
+        analyzer.model_name = 'test/model'
+        analyzer.backend, analyzer.quantization_config = 'onnx-int8', 'avx2'
+        checks = []
+        analyzer.check_backend_parity = lambda texts=None: checks.append(1) or check_backend_parity(reference, far)
+        analyzer._verify_backend_parity()
+        analyzer._verify_backend_parity()
+        assert len(checks) == 1, "A stored parity report should not be recomputed"
+        assert analyzer.backend_parity['min_cosine'] < analyzer.parity_threshold
+        
+        # PyTorch and int8 ONNX embeddings never share store entries
+        encoded = []
+        def encode(texts):
+            encoded.extend(texts)
+            return reference.encode(texts)
+        
+        analyzer.backend = 'torch'
+        torch_store = analyzer._get_embedding_store()
+        torch_store.embed(['supply chain', 'logistics'], encode)
+        analyzer.backend = 'onnx-int8'
+        int8_store = analyzer._get_embedding_store()
+        assert int8_store.store_dir != torch_store.store_dir
+        assert not np.array_equal(int8_store.keys(['supply chain']), torch_store.keys(['supply chain']))
+        int8_store.embed(['supply chain', 'logistics'], encode)
+        assert sorted(encoded) == sorted(['supply chain', 'logistics'] * 2), "Each backend should encode its own embeddings"
+
+        # int8 exports quantized for different CPU targets do not share entries either
+        analyzer.quantization_config = 'arm64'
+        arm_store = analyzer._get_embedding_store()
+        assert arm_store.store_dir != int8_store.store_dir
+        assert not np.array_equal(arm_store.keys(['supply chain']), int8_store.keys(['supply chain']))
+
+        print(f"✓ Parity min cosine {parity['min_cosine']:.4f}, reports stored per backend")
+
 
 def run_comprehensive_tests():
     """Run all comprehensive integration tests"""
@@ -521,6 +1511,31 @@ def run_comprehensive_tests():
         test_suite.test_08_end_to_end_workflow,
         test_suite.test_09_configuration_variations,
         test_suite.test_10_error_recovery,
+        test_suite.test_11_batched_pattern_detection,
+        test_suite.test_12_parallel_run_all,
+        test_suite.test_13_date_normalization,
+        test_suite.test_14_streaming_aggregation,
+        test_suite.test_15_sliding_period_comparison,
+        test_suite.test_16_embedding_store,
+        test_suite.test_17_embedding_snapshots,
+        test_suite.test_18_embedding_batch_planning,
+        test_suite.test_19_lazy_heavy_imports,
+        test_suite.test_20_vector_index_search,
+        test_suite.test_21_scalable_clustering,
+        test_suite.test_22_sampled_cluster_metrics,
+        test_suite.test_23_select_k_sweep,
+        test_suite.test_24_vectorized_cluster_statistics,
+        test_suite.test_25_persisted_reducers,
+        test_suite.test_26_cluster_topic_labelling,
+        test_suite.test_27_incremental_cluster_assignment,
+        test_suite.test_28_keyword_canonicalization,
+        test_suite.test_29_vectorized_api_keywords,
+        test_suite.test_30_vectorized_keyword_statistics,
+        test_suite.test_31_text_preprocessing,
+        test_suite.test_32_fast_extractor_startup,
+        test_suite.test_33_cooccurrence_network,
+        test_suite.test_34_citation_graph,
+        test_suite.test_35_backend_parity,
     ]
     
     # Run tests